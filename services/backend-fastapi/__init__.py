@@ -1,8 +1,7 @@
 """
 PDF Destroyer Max Backend FastAPI Service
 """
-from .api import routes
-from .config import settings
-from .utils import logging
+# Modules import each other as top-level packages (api, config, core) from the
+# service directory, as in the container, so nothing is imported here
 
 __version__ = "1.0.0"
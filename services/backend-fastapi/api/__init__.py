@@ -1,4 +1,5 @@
+"""
+API module
+"""
 from . import routes
-from . import summarization_service
-from . import ocr_service
-from . import pdf_pipeline
\ No newline at end of file
+from . import clients
@@ -1,16 +1,37 @@
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 import httpx
 import asyncio
 from pydantic import BaseModel, Field, validator
 from fastapi import HTTPException, BackgroundTasks
 import logging
-from utils.helpers import async_retry  # Changed to absolute import
+from tenacity import RetryCallState, retry, retry_if_exception, wait_exponential
 import os
+import json
 from datetime import datetime
 from config.settings import Settings
+from core.extractive import ExtractionResult, select_salient
+from core.map_reduce import hierarchical_map_reduce
 
 logger = logging.getLogger(__name__)
 
+# "abstractive" sends every chunk to the model; "hybrid" first keeps only the
+# most salient sentences of long texts
+SUMMARIZATION_MODES = ("abstractive", "hybrid")
+
+def _transient(error: BaseException) -> bool:
+    """Upstream failures are retried; requests the transformer service rejected are not"""
+    return isinstance(error, HTTPException) and error.status_code >= 500
+
+def _retries_exhausted(state: RetryCallState) -> bool:
+    # args[0] is the service; max_retries counts retries after the first attempt
+    return state.attempt_number > state.args[0].max_retries
+
+def _upstream_detail(response: httpx.Response) -> Any:
+    try:
+        return response.json().get("detail", response.text)
+    except ValueError:
+        return response.text
+
 class SummarizationRequest(BaseModel):
     """Request model for summarization"""
     text: str = Field(..., description="Text to summarize")
@@ -20,6 +41,11 @@ class SummarizationRequest(BaseModel):
     model_name: Optional[str] = Field("facebook/bart-large-cnn", description="Model to use for summarization")
     num_beams: Optional[int] = Field(4, ge=1, le=8, description="Number of beams for beam search")
     length_penalty: Optional[float] = Field(2.0, ge=0.0, le=5.0, description="Length penalty")
+    mode: Optional[str] = Field(
+        None,
+        description="'abstractive', or 'hybrid' to cut long texts down to their most salient "
+                    "sentences before abstractive summarization (default from settings)"
+    )
 
     @validator('text')
     def text_not_empty(cls, v):
@@ -47,6 +73,7 @@ class SummarizationService:
         self.max_retries = settings.max_retries
         self.chunk_size = 1024
         self.max_parallel_requests = 3
+        self.mode = settings.summarization_mode
         
     async def _get_client(self) -> httpx.AsyncClient:
         """Create and configure HTTP client with connection pooling"""
@@ -80,29 +107,66 @@ class SummarizationService:
             
         return chunks
 
-    @retry_async(max_retries=3, delay=1)
+    async def _prefilter(self, text: str, params: Dict) -> Tuple[str, Optional[ExtractionResult]]:
+        """
+        In hybrid mode, reduce a long text to the top salient sentences of each
+        section before it is chunked, so far fewer chunks reach the model.
+        """
+        mode = params.get('mode') or self.mode
+        if mode not in SUMMARIZATION_MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown summarization mode {mode!r}")
+        if mode != "hybrid" or len(text.split()) <= self.chunk_size:
+            return text, None
+
+        extraction = await asyncio.to_thread(
+            select_salient,
+            text,
+            ratio=self.settings.extractive_ratio,
+            min_sentences=self.settings.extractive_min_sentences,
+            section_words=self.settings.extractive_section_words,
+            method=self.settings.extractive_method
+        )
+        logger.info(
+            f"Extractive pre-filter kept {extraction.sentences_kept}/{extraction.sentences_in} sentences "
+            f"from {extraction.sections} sections"
+        )
+        return extraction.text, extraction
+
+    def _generation_parameters(self, params: Dict) -> Dict[str, Any]:
+        """Generation parameters sent to the transformer service"""
+        return {
+            "max_length": params.get('max_length', self.settings.max_length),
+            "min_length": params.get('min_length', self.settings.min_length),
+            "do_sample": params.get('do_sample', False),
+            "num_beams": params.get('num_beams', self.settings.num_beams),
+            "length_penalty": params.get('length_penalty', self.settings.length_penalty),
+            "model_name": params.get('model_name', self.settings.default_model)
+        }
+
+    @retry(
+        retry=retry_if_exception(_transient),
+        stop=_retries_exhausted,
+        wait=wait_exponential(multiplier=1, max=10),
+        reraise=True
+    )
     async def _process_chunk(self, chunk: str, client: httpx.AsyncClient, params: Dict) -> str:
         """Process a single chunk of text with retries"""
         try:
             start_time = datetime.utcnow()
             response = await client.post(
                 "/generate",
-                json={
-                    "inputs": chunk,
-                    "parameters": {
-                        "max_length": params.get('max_length', self.settings.max_length),
-                        "min_length": params.get('min_length', self.settings.min_length),
-                        "do_sample": params.get('do_sample', False),
-                        "num_beams": params.get('num_beams', self.settings.num_beams),
-                        "length_penalty": params.get('length_penalty', self.settings.length_penalty),
-                        "model_name": params.get('model_name', self.settings.default_model)
-                    }
-                }
+                json={"inputs": chunk, "parameters": self._generation_parameters(params)}
             )
             response.raise_for_status()
             logger.info(f"Chunk processed in {(datetime.utcnow() - start_time).total_seconds():.2f}s")
             return response.json()["summary"]
-            
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error processing chunk: {str(e)}")
+            if e.response.is_client_error:
+                raise HTTPException(status_code=e.response.status_code, detail=_upstream_detail(e.response))
+            raise HTTPException(status_code=503, detail="Summarization service unavailable")
+
         except httpx.HTTPError as e:
             logger.error(f"HTTP error processing chunk: {str(e)}")
             raise HTTPException(status_code=503, detail="Summarization service unavailable")
@@ -136,39 +200,26 @@ class SummarizationService:
             if max_length:
                 request_params['max_length'] = max_length
 
+            text, extraction = await self._prefilter(request.text, request_params)
+
             async with await self._get_client() as client:
                 # For short texts, process directly
-                if len(request.text.split()) <= self.chunk_size:
-                    summary = await self._process_chunk(request.text, client, request_params)
+                if len(text.split()) <= self.chunk_size:
+                    summary = await self._process_chunk(text, client, request_params)
                 
-                # For long texts, process in chunks with controlled concurrency
+                # For long texts, map chunks and reduce their summaries hierarchically
                 else:
-                    chunks = self._chunk_text(request.text, self.chunk_size)
+                    chunks = self._chunk_text(text, self.chunk_size)
                     logger.info(f"Processing text in {len(chunks)} chunks")
-                    
-                    semaphore = asyncio.Semaphore(self.max_parallel_requests)
-                    
-                    async def process_with_semaphore(chunk: str) -> str:
-                        async with semaphore:
-                            return await self._process_chunk(chunk, client, request_params)
-                    
-                    chunk_summaries = await asyncio.gather(
-                        *[process_with_semaphore(chunk) for chunk in chunks],
-                        return_exceptions=True
-                    )
-                    
-                    # Handle any failed chunks
-                    failed_chunks = [i for i, x in enumerate(chunk_summaries) if isinstance(x, Exception)]
-                    if failed_chunks:
-                        logger.error(f"Failed to process chunks: {failed_chunks}")
-                        raise HTTPException(
-                            status_code=500,
-                            detail=f"Failed to process {len(failed_chunks)} chunks"
-                        )
-                    
-                    # Combine chunk summaries and create final summary if needed
-                    combined_summary = " ".join(chunk_summaries)
-                    if len(combined_summary.split()) > request_params.get('max_length', self.settings.max_length):
+
+                    partials = []
+                    async for event in self._map_reduce(chunks, client, request_params):
+                        if event["event"] == "result":
+                            partials = event["summaries"]
+
+                    # Final pass over what is left, unless it is already short enough
+                    combined_summary = " ".join(partials)
+                    if len(partials) > 1 and len(combined_summary.split()) > request_params.get('max_length', self.settings.max_length):
                         summary = await self._process_chunk(combined_summary, client, request_params)
                     else:
                         summary = combined_summary
@@ -183,9 +234,14 @@ class SummarizationService:
                     text_length=len(request.text.split()),
                     summary_length=len(summary.split()),
                     metadata={
-                        "chunks_processed": len(chunks) if len(request.text.split()) > self.chunk_size else 1,
+                        "chunks_processed": len(chunks) if len(text.split()) > self.chunk_size else 1,
                         "parameters": request_params,
-                        "transformer_service": self.transformer_url
+                        "transformer_service": self.transformer_url,
+                        "extractive": {
+                            "sentences_in": extraction.sentences_in,
+                            "sentences_kept": extraction.sentences_kept,
+                            "sections": extraction.sections
+                        } if extraction else None
                     }
                 )
                 
@@ -194,6 +250,9 @@ class SummarizationService:
                 
                 return response
 
+        except HTTPException:
+            raise
+
         except asyncio.TimeoutError:
             logger.error("Timeout while connecting to transformer service")
             raise HTTPException(status_code=504, detail="Summarization service timeout")
@@ -202,6 +261,135 @@ class SummarizationService:
             logger.error(f"Error in summarization service: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=str(e))
 
+    def _map_reduce(self, chunks: List[str], client: httpx.AsyncClient, params: Dict) -> AsyncIterator[Dict]:
+        """
+        Hierarchical map-reduce over `chunks`: partial summaries are reduced in
+        word-budgeted groups of at most `reduce_fan_in` as soon as enough are
+        ready, with at most `max_parallel_requests` calls in flight. Yields
+        progress events, then the partials left for the final pass.
+        """
+        return hierarchical_map_reduce(
+            chunks,
+            lambda text: self._process_chunk(text, client, params),
+            concurrency=self.max_parallel_requests,
+            budget_words=self.settings.reduce_budget_words,
+            fan_in=self.settings.reduce_fan_in
+        )
+
+    async def _open_stream(self, text: str, client: httpx.AsyncClient, params: Dict) -> httpx.Response:
+        """Start the transformer service's event stream; a rejected request raises its status"""
+        try:
+            response = await client.send(
+                client.build_request(
+                    "POST",
+                    "/summarize/stream",
+                    json={"text": text, "params": self._generation_parameters(params)}
+                ),
+                stream=True
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error opening summary stream: {str(e)}")
+            raise HTTPException(status_code=503, detail="Summarization service unavailable")
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            raise HTTPException(status_code=response.status_code, detail=_upstream_detail(response))
+        return response
+
+    async def _relay(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        """Relay the transformer service's server-sent events unchanged"""
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def stream_summary(
+        self,
+        request: SummarizationRequest,
+        max_length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Summarize text as server-sent events, so the first generated tokens
+        reach the client instead of the finished summary.
+
+        Short texts are streamed straight from the transformer service. Long
+        texts report a `progress` event per map or reduce call and then stream
+        the final combining pass.
+
+        The mode is checked and a short text's stream is opened before this
+        returns, so those failures raise HTTPException with their own status
+        while a response can still carry it. Later failures become `error`
+        events.
+        """
+        request_params = request.dict()
+        if max_length:
+            request_params['max_length'] = max_length
+
+        text, extraction = await self._prefilter(request.text, request_params)
+        client = await self._get_client()
+        upstream = None
+        try:
+            if len(text.split()) <= self.chunk_size:
+                upstream = await self._open_stream(text, client, request_params)
+        except BaseException:
+            await client.aclose()
+            raise
+        return self._stream_events(text, extraction, client, upstream, request_params)
+
+    async def _stream_events(
+        self,
+        text: str,
+        extraction: Optional[ExtractionResult],
+        client: httpx.AsyncClient,
+        upstream: Optional[httpx.Response],
+        request_params: Dict
+    ) -> AsyncIterator[bytes]:
+        def sse(event: str, data: Dict) -> bytes:
+            return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+        try:
+            if extraction:
+                yield sse("extracted", {
+                    "sentences_in": extraction.sentences_in,
+                    "sentences_kept": extraction.sentences_kept
+                })
+
+            if upstream is not None:
+                async for chunk in self._relay(upstream):
+                    yield chunk
+                return
+
+            chunks = self._chunk_text(text, self.chunk_size)
+            partials = []
+            async for event in self._map_reduce(chunks, client, request_params):
+                if event["event"] == "result":
+                    partials = event["summaries"]
+                else:
+                    yield sse("progress", {
+                        "level": event["level"],
+                        "completed": event["completed"],
+                        "chunks_total": event["chunks_total"]
+                    })
+
+            combined_summary = " ".join(partials)
+            if len(partials) > 1 and len(combined_summary.split()) > request_params.get('max_length', self.settings.max_length):
+                response = await self._open_stream(combined_summary, client, request_params)
+                async for chunk in self._relay(response):
+                    yield chunk
+            else:
+                yield sse("token", {"text": combined_summary})
+                yield sse("end", {"summary": combined_summary})
+
+        except Exception as e:
+            # Headers are already sent, so errors travel in the stream
+            logger.error(f"Error streaming summary: {str(e)}", exc_info=True)
+            yield sse("error", {"detail": e.detail if isinstance(e, HTTPException) else str(e)})
+        finally:
+            if upstream is not None:
+                await upstream.aclose()
+            await client.aclose()
+
     async def batch_summarize(
         self,
         requests: List[SummarizationRequest],
@@ -1,20 +1,17 @@
 from functools import lru_cache
-from config.settings import Settings, get_settings
-from .summarization_service import SummarizationService
-from .ocr_service import OCRService
-from .pdf_pipeline import PDFPipelineService
+from config.settings import get_settings
+from .clients.summarizer_client import SummarizationService
+from .clients.ocr_client import OCRService
+
+# Providers take no arguments: FastAPI would read a Settings parameter from
+# the request body, and lru_cache cannot hash it
 
 @lru_cache()
-def get_summarization_service(settings: Settings = get_settings()) -> SummarizationService:
+def get_summarization_service() -> SummarizationService:
     """Dependency provider for SummarizationService"""
-    return SummarizationService(settings)
+    return SummarizationService(get_settings())
 
 @lru_cache()
-def get_ocr_service(settings: Settings = get_settings()) -> OCRService:
+def get_ocr_service() -> OCRService:
     """Dependency provider for OCRService"""
-    return OCRService(settings)
-
-@lru_cache()
-def get_pdf_pipeline_service(settings: Settings = get_settings()) -> PDFPipelineService:
-    """Dependency provider for PDFPipelineService"""
-    return PDFPipelineService(settings)
\ No newline at end of file
+    return OCRService(get_settings())
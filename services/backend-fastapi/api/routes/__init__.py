@@ -3,8 +3,8 @@ API routes module
 """
 from .health import router as health_router
 from .pdf_routes import router as pdf_router
-from .summarization_routes import router as summarization_router
-from .ocr_routes import router as ocr_router
+from .summarize import router as summarization_router
+from .ocr import router as ocr_router
 
 __all__ = [
     'health_router',
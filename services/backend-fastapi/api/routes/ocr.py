@@ -1,7 +1,7 @@
 # backend-fastapi/api/routes/ocr_routes.py
 from fastapi import APIRouter, UploadFile, File, Depends
 from ..dependencies import get_ocr_service
-from ..ocr_service import OCRService
+from ..clients.ocr_client import OCRService
 from typing import Dict, Any
 
 router = APIRouter(prefix="/api/v1/ocr", tags=["ocr"])
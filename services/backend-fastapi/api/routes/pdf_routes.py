@@ -5,8 +5,7 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from ..clients.pipeline_client import get_pipeline_client, PipelineClient, PipelineError
 from typing import Dict, Any
 from loguru import logger
-from ..dependencies import get_current_user  # If you have auth
-from ...domain.models import ProcessingResult
+from domain.types import ProcessingResult
 
 # Create router instance
 router = APIRouter(
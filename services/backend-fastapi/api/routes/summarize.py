@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
-from ..summarization_service import SummarizationService, SummarizationRequest, SummaryResponse
+from fastapi.responses import StreamingResponse
+from ..clients.summarizer_client import SummarizationService, SummarizationRequest, SummaryResponse
 from ..dependencies import get_summarization_service
 from typing import List, Optional
 import asyncio
@@ -31,18 +32,48 @@ async def summarize_text(
     - **model_name**: Name of model to use (optional)
     """
     try:
-        request.validate_text()
         return await summarization_service.summarize_text(
             request, 
             background_tasks,
             max_length=max_length
         )
+    except HTTPException:
+        raise
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error in summarize endpoint: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Summarization failed")
 
+@router.post(
+    "/stream",
+    summary="Stream a summary",
+    description="Stream the summary as server-sent events while it is generated",
+    response_description="text/event-stream of progress, token and end events"
+)
+async def stream_summary(
+    request: SummarizationRequest,
+    max_length: Optional[int] = Query(300, gt=0, le=1000),
+    summarization_service: SummarizationService = Depends(get_summarization_service)
+):
+    """
+    Stream a summary as server-sent events:
+
+    - **progress**: a map (level 0) or reduce call for a long document finished
+    - **token**: newly generated summary text
+    - **end**: the complete summary
+    - **error**: generation failed after streaming started
+
+    Requests rejected before the first event (unknown mode, model or
+    parameters) get their 4xx status instead of a stream.
+    """
+    events = await summarization_service.stream_summary(request, max_length=max_length)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post(
     "/batch",
     response_model=List[SummaryResponse],
@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     debug_mode: bool = os.getenv("DEBUG_MODE", True)
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", 8001))
+    worker_count: int = int(os.getenv("WORKER_COUNT", 1))
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
 
     # Pipeline Service Settings
     pipeline_service_url: str = os.getenv(
@@ -18,9 +20,35 @@ class Settings(BaseSettings):
         "http://ai-powerhouse-pipelines:8005"
     )
     processing_timeout: int = int(os.getenv("PROCESSING_TIMEOUT", 300))
+
+    # OCR Service Settings
+    ocr_service_url: str = os.getenv("OCR_SERVICE_URL", "http://neural-ocr-tesseract:8002")
     
+    # Summarization Settings
+    transformer_service_url: str = os.getenv("TRANSFORMER_SERVICE_URL", "http://transformers-summarizer:8006")
+    transformer_timeout: int = int(os.getenv("TRANSFORMER_TIMEOUT", 300))
+    max_retries: int = int(os.getenv("MAX_RETRIES", 3))
+    default_model: str = os.getenv("DEFAULT_MODEL", "facebook/bart-large-cnn")
+    max_length: int = int(os.getenv("SUMMARY_MAX_LENGTH", 130))
+    min_length: int = int(os.getenv("SUMMARY_MIN_LENGTH", 30))
+    num_beams: int = int(os.getenv("SUMMARY_NUM_BEAMS", 4))
+    length_penalty: float = float(os.getenv("SUMMARY_LENGTH_PENALTY", 2.0))
+    # Hierarchical reduce: whitespace-separated words per reduce input (700 words
+    # is about 900 BPE tokens, under the model's 1024-token limit) and partial
+    # summaries combined per reduce call
+    reduce_budget_words: int = int(os.getenv("REDUCE_BUDGET_WORDS", 700))
+    reduce_fan_in: int = int(os.getenv("REDUCE_FAN_IN", 8))
+    # "abstractive" or "hybrid" (extractive pre-filter for long texts)
+    summarization_mode: str = os.getenv("SUMMARIZATION_MODE", "abstractive")
+    # Share of sentences kept per section, "centroid" or "textrank" scoring
+    extractive_ratio: float = float(os.getenv("EXTRACTIVE_RATIO", 0.05))
+    extractive_min_sentences: int = int(os.getenv("EXTRACTIVE_MIN_SENTENCES", 2))
+    extractive_section_words: int = int(os.getenv("EXTRACTIVE_SECTION_WORDS", 1500))
+    extractive_method: str = os.getenv("EXTRACTIVE_METHOD", "centroid")
+
     # Processing Settings
     min_text_length: int = int(os.getenv("MIN_TEXT_LENGTH", 50))
+    batch_size: int = int(os.getenv("BATCH_SIZE", 10))
     tesseract_language: str = os.getenv("TESSERACT_LANGUAGE", "eng")
     image_quality: int = int(os.getenv("IMAGE_QUALITY", 300))
     
@@ -0,0 +1,127 @@
+# services/backend-fastapi/core/extractive.py
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+EXTRACTIVE_METHODS = ("centroid", "textrank")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i if in into is it its
+may not of on or our shall she should so than that the their them then there these they
+this those to was we were which while who will with would you your
+""".split())
+
+@dataclass
+class ExtractionResult:
+    text: str
+    sentences_in: int
+    sentences_kept: int
+    sections: int
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+def split_sections(text: str, section_words: int) -> List[List[str]]:
+    """
+    Sentences grouped into sections of roughly `section_words` words, breaking
+    at paragraph boundaries where possible so each section stays on one topic.
+    """
+    sections, current, words = [], [], 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        for sentence in split_sentences(paragraph):
+            current.append(sentence)
+            words += len(sentence.split())
+            if words >= section_words * 1.5:
+                sections.append(current)
+                current, words = [], 0
+        if words >= section_words:
+            sections.append(current)
+            current, words = [], 0
+    if current:
+        sections.append(current)
+    return sections
+
+def _terms(sentence: str) -> List[str]:
+    return [w for w in _WORD.findall(sentence.lower()) if w not in _STOPWORDS and len(w) > 1]
+
+def tfidf_matrix(sentences: List[str], idf: Dict[str, float]) -> np.ndarray:
+    """L2-normalised TF-IDF rows, one per sentence, over the terms of `sentences`."""
+    vocabulary: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+    for i, sentence in enumerate(sentences):
+        for term in _terms(sentence):
+            j = vocabulary.setdefault(term, len(vocabulary))
+            rows.append(i)
+            cols.append(j)
+            values.append(idf.get(term, 1.0))
+    matrix = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+    # Repeated (row, col) pairs accumulate, giving tf * idf
+    np.add.at(matrix, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), values)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+def document_idf(sentences: List[str]) -> Dict[str, float]:
+    """Smoothed IDF with sentences as documents, over the whole input."""
+    counts: Dict[str, int] = {}
+    for sentence in sentences:
+        for term in set(_terms(sentence)):
+            counts[term] = counts.get(term, 0) + 1
+    n = len(sentences)
+    return {term: math.log((1 + n) / (1 + df)) + 1 for term, df in counts.items()}
+
+def centroid_scores(vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each sentence to the section's mean TF-IDF vector."""
+    centroid = vectors.mean(axis=0)
+    norm = np.linalg.norm(centroid)
+    return vectors @ (centroid / norm) if norm else np.zeros(len(vectors))
+
+def textrank_scores(vectors: np.ndarray, damping: float = 0.85, iterations: int = 50,
+                    tolerance: float = 1e-6) -> np.ndarray:
+    """PageRank over the sentence cosine-similarity graph."""
+    n = len(vectors)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1 / n), where=out_weight > 0)
+    scores = np.full(n, 1 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+def select_salient(text: str, ratio: float = 0.1, min_sentences: int = 2,
+                   section_words: int = 1500, method: str = "centroid") -> ExtractionResult:
+    """
+    Keep the most salient `ratio` of sentences (at least `min_sentences`) in
+    each section of `text`, in their original order.
+    """
+    if method not in EXTRACTIVE_METHODS:
+        raise ValueError(f"Unknown extractive method {method!r}, expected one of {EXTRACTIVE_METHODS}")
+    sections = split_sections(text, section_words)
+    idf = document_idf([s for section in sections for s in section])
+    score = centroid_scores if method == "centroid" else textrank_scores
+
+    kept_sections = []
+    for sentences in sections:
+        k = max(min_sentences, math.ceil(len(sentences) * ratio))
+        if k >= len(sentences):
+            kept_sections.append(sentences)
+            continue
+        scores = score(tfidf_matrix(sentences, idf))
+        top = np.sort(np.argsort(-scores, kind="stable")[:k])
+        kept_sections.append([sentences[i] for i in top])
+
+    return ExtractionResult(
+        text="\n\n".join(" ".join(section) for section in kept_sections),
+        sentences_in=sum(len(section) for section in sections),
+        sentences_kept=sum(len(section) for section in kept_sections),
+        sections=len(sections)
+    )
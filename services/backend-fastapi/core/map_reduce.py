@@ -0,0 +1,113 @@
+# services/backend-fastapi/core/map_reduce.py
+
+import asyncio
+import heapq
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Tuple
+
+# One partial summary: (index of the first chunk it covers, text)
+Partial = Tuple[int, str]
+
+def _words(partials: List[Partial]) -> int:
+    return sum(len(text.split()) for _, text in partials)
+
+async def hierarchical_map_reduce(
+    chunks: List[str],
+    summarize: Callable[[str], Awaitable[str]],
+    concurrency: int = 3,
+    budget_words: int = 700,
+    fan_in: int = 8,
+    max_levels: int = 16
+) -> AsyncIterator[Dict]:
+    """
+    Summarize `chunks` (map), then summarize groups of partial summaries
+    level by level (reduce) until what is left fits one model input.
+
+    Each level's partials join its buffer in chunk order: one that finishes
+    before an earlier one waits for it, so every group is a contiguous run
+    of the document. A group is handed to the model as soon as its level has
+    `fan_in` partials or adding the next would exceed `budget_words`, so
+    reduction overlaps with the remaining map calls. At most `concurrency`
+    calls run at once, and ready reduce calls go ahead of queued map calls.
+
+    `budget_words` counts whitespace-separated words, not model tokens; the
+    default of 700 leaves room for the ~1.3 BPE tokens per English word of
+    BART-style tokenizers within a 1024-token input, and the summarizer
+    windows anything longer instead of cutting it off.
+
+    Yields a `progress` event after every call, then one `result` event whose
+    `summaries` are the remaining partials in document order; together they
+    fit within `budget_words` and `fan_in`, and the caller makes the final
+    pass over them. Raises RuntimeError if reduction needs more than
+    `max_levels` levels, which only happens if summaries do not get shorter.
+    """
+    jobs: List[Tuple[int, int, int, str]] = []  # (-level, first chunk, level, text)
+    running: Dict[asyncio.Task, Tuple[int, int]] = {}
+    buffers: Dict[int, List[Partial]] = {}
+    # Per level, the first chunks of the partials still to join its buffer, in order,
+    # and those that arrived ahead of an earlier one
+    expected: Dict[int, Deque[int]] = {0: deque(range(len(chunks)))}
+    early: Dict[int, Dict[int, str]] = {}
+    completed: Dict[int, int] = {}
+
+    for index, chunk in enumerate(chunks):
+        heapq.heappush(jobs, (0, index, 0, chunk))
+
+    def flush(level: int):
+        group = buffers.pop(level)
+        expected.setdefault(level + 1, deque()).append(group[0][0])
+        if len(group) == 1 and len(group[0][1].split()) <= budget_words // 2:
+            # Nothing to combine it with at this level; carry it up unchanged
+            arrive(level + 1, *group[0])
+        else:
+            # A lone partial over half the budget is summarized on its own; carried
+            # up, it could meet another like it at every level and never shrink
+            heapq.heappush(jobs, (-(level + 1), group[0][0], level + 1, " ".join(t for _, t in group)))
+
+    def arrive(level: int, first: int, text: str):
+        if level > max_levels:
+            raise RuntimeError(f"Map-reduce did not fit the budget within {max_levels} levels")
+        waiting = early.setdefault(level, {})
+        waiting[first] = text
+        queue = expected[level]
+        while queue and queue[0] in waiting:
+            index = queue.popleft()
+            add(level, index, waiting.pop(index))
+
+    def add(level: int, first: int, text: str):
+        buffer = buffers.get(level)
+        if buffer and (len(buffer) >= fan_in or _words(buffer) + len(text.split()) > budget_words):
+            flush(level)
+        buffers.setdefault(level, []).append((first, text))
+
+    try:
+        while True:
+            while jobs and len(running) < concurrency:
+                _, first, level, text = heapq.heappop(jobs)
+                running[asyncio.ensure_future(summarize(text))] = (level, first)
+
+            if not running:
+                # Nothing is in flight, so every partial has joined its buffer; each covers
+                # a contiguous run of chunks, and their first chunks give document order
+                remaining = sorted(p for level in buffers for p in buffers[level])
+                if len(remaining) <= 1 or (len(remaining) <= fan_in and _words(remaining) <= budget_words):
+                    yield {"event": "result", "summaries": [t for _, t in remaining]}
+                    return
+                # Everything is mapped; push the lowest level's leftovers up
+                flush(min(buffers))
+                continue
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: running[t][1]):
+                level, first = running.pop(task)
+                arrive(level, first, task.result())
+                completed[level] = completed.get(level, 0) + 1
+                yield {
+                    "event": "progress",
+                    "level": level,
+                    "completed": completed[level],
+                    "chunks_total": len(chunks)
+                }
+    finally:
+        for task in running:
+            task.cancel()
@@ -0,0 +1,116 @@
+# services/backend-fastapi/tests/test_map_reduce.py
+
+import asyncio
+
+import pytest
+
+from core.map_reduce import hierarchical_map_reduce
+
+async def run(chunks, summarize, **kwargs):
+    events = [e async for e in hierarchical_map_reduce(chunks, summarize, **kwargs)]
+    return events[:-1], events[-1]["summaries"]
+
+@pytest.mark.asyncio
+async def test_reduces_level_by_level_within_budget_and_order():
+    calls = []
+
+    async def summarize(text):
+        calls.append(text)
+        await asyncio.sleep(0)
+        # Ten-word summary that remembers which chunks it covers
+        return " ".join(w for w in text.split() if w.startswith("c")) + " x" * 10
+
+    chunks = [f"c{i} " + "word " * 100 for i in range(40)]
+    progress, summaries = await run(chunks, summarize, concurrency=3, budget_words=60, fan_in=4)
+
+    assert len(summaries) <= 4
+    assert sum(len(s.split()) for s in summaries) <= 60
+    # Every chunk is covered exactly once, in document order
+    covered = [w for s in summaries for w in s.split() if w.startswith("c")]
+    assert covered == [f"c{i}" for i in range(40)]
+    # No reduce input exceeded the budget
+    assert all(len(text.split()) <= 60 for text in calls if "word" not in text)
+    assert max(e["level"] for e in progress) >= 2
+
+@pytest.mark.asyncio
+async def test_reduction_starts_before_all_chunks_are_mapped():
+    order = []
+
+    async def summarize(text):
+        level = "map" if "word" in text else "reduce"
+        order.append(level)
+        await asyncio.sleep(0.001)
+        return "s" * 3
+
+    chunks = ["word " * 50 for _ in range(30)]
+    await run(chunks, summarize, concurrency=2, budget_words=8, fan_in=4)
+    first_reduce = order.index("reduce")
+    assert first_reduce < order.count("map")
+
+@pytest.mark.asyncio
+async def test_failures_propagate_and_cancel_running_calls():
+    async def summarize(text):
+        if text == "bad":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        return text
+
+    with pytest.raises(RuntimeError):
+        await run(["ok", "bad", "ok"], summarize, concurrency=3)
+
+@pytest.mark.asyncio
+async def test_short_inputs_return_map_outputs_unchanged():
+    async def summarize(text):
+        return text.upper()
+
+    _, summaries = await run(["a", "b"], summarize)
+    assert summaries == ["A", "B"]
+
+@pytest.mark.asyncio
+async def test_partials_over_half_the_budget_are_reduced_alone():
+    calls = []
+
+    async def summarize(text):
+        calls.append(text)
+        tags = " ".join(w for w in text.split() if w.startswith("c"))
+        # Chunks map to 500-word summaries, no two of which fit the budget together
+        return tags + " x" * (499 if "word" in text else 50)
+
+    chunks = [f"c{i} " + "word " * 100 for i in range(2)]
+    _, summaries = await run(chunks, summarize, budget_words=700)
+
+    assert sum(len(s.split()) for s in summaries) <= 700
+    covered = [w for s in summaries for w in s.split() if w.startswith("c")]
+    assert covered == ["c0", "c1"]
+    # One reduce call over c0's partial alone, after which the two fit together
+    assert [w for w in calls[2].split() if w.startswith("c")] == ["c0"]
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_reduction_that_never_shrinks_stops_at_max_levels():
+    async def summarize(text):
+        return " ".join(["x"] * 500)
+
+    with pytest.raises(RuntimeError):
+        await run(["a", "b"], summarize, budget_words=700, max_levels=4)
+
+@pytest.mark.asyncio
+async def test_groups_are_contiguous_when_an_early_chunk_finishes_last():
+    reduces = []
+
+    async def summarize(text):
+        tags = [w for w in text.split() if w.startswith("c")]
+        if "word" in text:
+            await asyncio.sleep(0.05 if tags == ["c1"] else 0.001)
+        else:
+            reduces.append(tags)
+        return " ".join(tags) + " x" * 10
+
+    chunks = [f"c{i} " + "word " * 100 for i in range(12)]
+    _, summaries = await run(chunks, summarize, concurrency=3, budget_words=60, fan_in=4)
+
+    for tags in reduces:
+        indices = [int(t[1:]) for t in tags]
+        assert indices == list(range(indices[0], indices[0] + len(indices)))
+    covered = [w for s in summaries for w in s.split() if w.startswith("c")]
+    assert covered == [f"c{i}" for i in range(12)]
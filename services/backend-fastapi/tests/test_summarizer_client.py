@@ -0,0 +1,90 @@
+# services/backend-fastapi/tests/test_summarizer_client.py
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from tenacity import wait_none
+
+from api.clients.summarizer_client import SummarizationRequest, SummarizationService
+from api.dependencies import get_summarization_service
+from api.routes.summarize import router
+from config.settings import Settings
+
+EVENTS = b'event: token\ndata: {"text": "Short"}\n\nevent: end\ndata: {"summary": "Short"}\n\n'
+
+def _service(handler) -> SummarizationService:
+    service = SummarizationService(Settings())
+
+    async def get_client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://summarizer")
+
+    service._get_client = get_client
+    return service
+
+async def _body(events) -> bytes:
+    return b"".join([chunk async for chunk in events])
+
+@pytest.mark.asyncio
+async def test_stream_relays_transformer_events():
+    service = _service(lambda request: httpx.Response(200, stream=httpx.ByteStream(EVENTS)))
+    events = await service.stream_summary(SummarizationRequest(text="A short text."))
+    assert await _body(events) == EVENTS
+
+@pytest.mark.asyncio
+async def test_stream_rejects_unknown_mode_before_streaming():
+    calls = []
+    service = _service(lambda request: calls.append(request) or httpx.Response(200))
+    with pytest.raises(HTTPException) as e:
+        await service.stream_summary(SummarizationRequest(text="A short text.", mode="poetry"))
+    assert e.value.status_code == 400
+    assert calls == []
+
+@pytest.mark.asyncio
+async def test_stream_passes_on_transformer_rejections():
+    service = _service(lambda request: httpx.Response(400, json={"detail": "Unknown model 'gpt-5'"}))
+    with pytest.raises(HTTPException) as e:
+        await service.stream_summary(SummarizationRequest(text="A short text.", model_name="gpt-5"))
+    assert (e.value.status_code, e.value.detail) == (400, "Unknown model 'gpt-5'")
+
+@pytest.fixture
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(SummarizationService._process_chunk.retry, "wait", wait_none())
+
+@pytest.mark.asyncio
+async def test_chunks_are_retried_only_when_the_service_fails(no_retry_wait):
+    responses = [httpx.Response(503), httpx.Response(200, json={"summary": "Short."})]
+    service = _service(lambda request: responses.pop(0))
+    async with await service._get_client() as client:
+        assert await service._process_chunk("A short text.", client, {}) == "Short."
+
+    calls = []
+    service = _service(lambda request: calls.append(request) or httpx.Response(400, json={"detail": "bad"}))
+    async with await service._get_client() as client:
+        with pytest.raises(HTTPException) as e:
+            await service._process_chunk("A short text.", client, {})
+    assert (e.value.status_code, len(calls)) == (400, 1)
+
+def _app(service: SummarizationService) -> httpx.AsyncClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_summarization_service] = lambda: service
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://backend")
+
+@pytest.mark.asyncio
+async def test_summarize_routes_answer_and_reject():
+    service = _service(lambda request: (
+        httpx.Response(200, stream=httpx.ByteStream(EVENTS)) if request.url.path == "/summarize/stream"
+        else httpx.Response(200, json={"summary": "Short."})
+    ))
+    async with _app(service) as client:
+        response = await client.post("/api/summarize/", json={"text": "A short text."})
+        assert response.status_code == 200
+        assert response.json()["summary"] == "Short."
+
+        response = await client.post("/api/summarize/stream", json={"text": "A short text."})
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.content == EVENTS
+
+        for path in ("/api/summarize/", "/api/summarize/stream"):
+            response = await client.post(path, json={"text": "A short text.", "mode": "poetry"})
+            assert response.status_code == 400
@@ -0,0 +1,103 @@
+# admission.py
+import os
+import math
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from prometheus_client import Counter, Gauge, Histogram
+
+# Requests OCRed at once; matches the two-thread Tesseract executor by default
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", "2"))
+# Requests allowed to wait for a slot; beyond this they are rejected with 503
+OCR_MAX_QUEUE = int(os.getenv("OCR_MAX_QUEUE", "16"))
+OCR_MAX_RETRY_AFTER = int(os.getenv("OCR_MAX_RETRY_AFTER", "60"))
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SECONDS = Histogram(
+    "ocr_queue_seconds",
+    "Time an OCR request waited for a processing slot",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+SERVICE_SECONDS = Histogram(
+    "ocr_service_seconds",
+    "Time an OCR request spent being processed once admitted",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120),
+)
+REJECTED = Counter("ocr_rejected_total", "OCR requests rejected because the queue was full")
+IN_FLIGHT = Gauge("ocr_in_flight", "OCR requests being processed")
+QUEUED = Gauge("ocr_queued", "OCR requests waiting for a processing slot")
+
+class Overloaded(Exception):
+    """Raised when the admission queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"OCR queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+@dataclass
+class Ticket:
+    queue_time: float = 0.0
+    service_time: float = 0.0
+
+class AdmissionController:
+    """
+    Bounded admission for OCR requests: at most `max_concurrency` run, at most
+    `max_queue` wait, and anything beyond that is rejected immediately so
+    callers can back off or route elsewhere instead of timing out.
+    """
+
+    def __init__(self, max_concurrency: int = OCR_MAX_CONCURRENCY, max_queue: int = OCR_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._running = 0
+        # Moving average of service time, for the Retry-After estimate
+        self._mean_service = 1.0
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain."""
+        backlog = (self._waiting + 1) * self._mean_service / self.max_concurrency
+        return max(1, min(OCR_MAX_RETRY_AFTER, math.ceil(backlog)))
+
+    @asynccontextmanager
+    async def admit(self):
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            REJECTED.inc()
+            raise Overloaded(self.retry_after())
+
+        ticket = Ticket()
+        start = time.perf_counter()
+        self._waiting += 1
+        QUEUED.inc()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+            QUEUED.dec()
+        ticket.queue_time = time.perf_counter() - start
+        QUEUE_SECONDS.observe(ticket.queue_time)
+
+        self._running += 1
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            yield ticket
+        finally:
+            ticket.service_time = time.perf_counter() - start
+            SERVICE_SECONDS.observe(ticket.service_time)
+            self._mean_service = 0.8 * self._mean_service + 0.2 * ticket.service_time
+            self._running -= 1
+            IN_FLIGHT.dec()
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queued": self._waiting,
+        }
@@ -0,0 +1,126 @@
+# benchmarks/layout_backend_benchmark.py
+"""
+Accuracy versus latency of the CPU LayoutLM backends against the fp32
+baseline on a fixed, seeded page set, measured through
+LayoutLMProcessor.process_image as `/ocr?layout=true` runs it.
+
+Accuracy is the agreement of each backend's layout words with fp32's: the
+Jaccard overlap of the selected (word, box) sets and the mean score difference
+on words both select. Latency is reported per page end to end (including the
+processor's own OCR) and for the model forward pass alone.
+
+The base checkpoint's token-classification head is untrained, so agreement is
+only meaningful with a fine-tuned one (e.g. a FUNSD checkpoint via --model).
+
+    python model_store.py export <model> --onnx         # for the onnx backend
+    python benchmarks/layout_backend_benchmark.py --pages 20 --backends fp32,int8,onnx --model <model>
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+WORDS = "invoice total amount due date account number reference payment terms section page".split()
+
+def _page(seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    page = Image.new("RGB", (850, 1100), "white")
+    draw = ImageDraw.Draw(page)
+    y = 60
+    while y < 1040:
+        # Headings, short lines and paragraph lines at varying indents
+        x = int(rng.integers(40, 200))
+        line = " ".join(rng.choice(WORDS, size=int(rng.integers(2, 10))))
+        draw.text((x, y), line.title() if rng.random() < 0.2 else line, fill="black")
+        y += int(rng.integers(18, 48))
+    return page
+
+def _percentile(values, q) -> float:
+    return round(float(np.percentile(values, q)) * 1000, 1)
+
+def _selected(text_boxes, layout_info):
+    return {
+        (word, tuple(round(v) for v in info["bbox"])): info["confidence"]
+        for word, info in zip(text_boxes, layout_info)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="LayoutLM backend accuracy/latency benchmark")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--backends", default="fp32,int8,onnx")
+    parser.add_argument("--model", default=None, help="Token-classification checkpoint (default OCR_LAYOUT_MODEL)")
+    parser.add_argument("--warmup", type=int, default=2)
+    args = parser.parse_args()
+
+    import torch
+    from text_extraction import LAYOUTLM_MODEL_NAME, LayoutLMProcessor
+
+    model_name = args.model or LAYOUTLM_MODEL_NAME
+    pages = [_page(seed) for seed in range(args.pages)]
+    baseline = None
+    encodings = None
+    results = []
+
+    for backend in args.backends.split(","):
+        # Same seed for every load, so heads missing from the checkpoint match
+        torch.manual_seed(0)
+        start = time.perf_counter()
+        layoutlm = LayoutLMProcessor(model_name, backend=backend)
+        load_s = time.perf_counter() - start
+        if encodings is None:
+            encodings = [layoutlm.encode(page)[0] for page in pages]
+
+        with torch.no_grad():
+            for page in pages[:args.warmup]:
+                layoutlm.process_image(page)
+            forward = []
+            for encoding in encodings:
+                start = time.perf_counter()
+                layoutlm.model(**encoding)
+                forward.append(time.perf_counter() - start)
+        latencies, selected = [], []
+        for page in pages:
+            start = time.perf_counter()
+            selected.append(_selected(*layoutlm.process_image(page)))
+            latencies.append(time.perf_counter() - start)
+
+        if baseline is None:
+            baseline = selected
+        jaccard, score_diff = [], []
+        for words, reference in zip(selected, baseline):
+            union = words.keys() | reference.keys()
+            shared = words.keys() & reference.keys()
+            jaccard.append(len(shared) / len(union) if union else 1.0)
+            score_diff.extend(abs(words[k] - reference[k]) for k in shared)
+        results.append({
+            "requested": backend,
+            "backend": layoutlm.backend,
+            "load_s": round(load_s, 2),
+            "page_p50_ms": _percentile(latencies, 50),
+            "page_p95_ms": _percentile(latencies, 95),
+            "forward_p50_ms": _percentile(forward, 50),
+            "forward_p95_ms": _percentile(forward, 95),
+            "pages_per_sec": round(len(latencies) / sum(latencies), 2),
+            "words_selected": round(float(np.mean([len(words) for words in selected])), 1),
+            "word_jaccard": round(float(np.mean(jaccard)), 4),
+            "mean_score_diff": round(float(np.mean(score_diff)), 5) if score_diff else None,
+        })
+
+    print(json.dumps({
+        "pages": args.pages,
+        "model": model_name,
+        "threads": torch.get_num_threads(),
+        "baseline": results[0]["backend"],
+        "results": results,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
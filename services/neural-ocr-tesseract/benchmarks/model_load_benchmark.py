@@ -0,0 +1,101 @@
+# benchmarks/model_load_benchmark.py
+"""
+Starts N worker processes at once, as a scale-out would, and reports for each
+the time to load LayoutLM, the time to the end of its first forward pass, and
+its memory: RSS split into file-backed (shared page cache) and anonymous
+(private) pages, plus PSS, which divides shared pages between the processes
+mapping them.
+
+    python model_store.py export                       # once per node
+    python benchmarks/model_load_benchmark.py --workers 4 --source store
+    python benchmarks/model_load_benchmark.py --workers 4 --source hub
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+def _memory() -> dict:
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                fields["Pss"] = int(line.split()[1]) / 1024
+    return {
+        "rss_mb": round(fields["VmRSS"], 1),
+        "rss_anon_mb": round(fields["RssAnon"], 1),
+        "rss_file_mb": round(fields["RssFile"], 1),
+        "pss_mb": round(fields.get("Pss", 0.0), 1),
+    }
+
+def _worker(start: float):
+    sys.path.insert(0, str(SERVICE_DIR))
+    import numpy as np
+    import torch
+    from PIL import Image
+    from text_extraction import get_layoutlm_processor
+
+    layoutlm = get_layoutlm_processor()
+    loaded = time.time()
+
+    page = Image.fromarray(np.full((1100, 850), 255, dtype=np.uint8)).convert("RGB")
+    encoding = layoutlm.processor(page, return_tensors="pt", truncation=True)
+    with torch.no_grad():
+        layoutlm.model(**{k: v.to(layoutlm.device) for k, v in encoding.items()})
+    first = time.time()
+
+    print(json.dumps({
+        "source": layoutlm.source,
+        "load_s": round(loaded - start, 2),
+        "time_to_first_request_s": round(first - start, 2),
+        **_memory(),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="LayoutLM load and memory benchmark")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--source", choices=["store", "hub"], default="store")
+    parser.add_argument("--worker", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        _worker(args.worker)
+        return
+
+    env = dict(os.environ, CUDA_VISIBLE_DEVICES="")
+    empty_store = tempfile.TemporaryDirectory()
+    if args.source == "hub":
+        env["OCR_MODEL_STORE"] = empty_store.name
+
+    start = time.time()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--worker", str(start)],
+            cwd=SERVICE_DIR, env=env, stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(args.workers)
+    ]
+    results = [json.loads(proc.communicate()[0].strip().splitlines()[-1]) for proc in procs]
+    empty_store.cleanup()
+
+    print(json.dumps({
+        "workers": args.workers,
+        "source": args.source,
+        "max_time_to_first_request_s": max(r["time_to_first_request_s"] for r in results),
+        "total_pss_mb": round(sum(r["pss_mb"] for r in results), 1),
+        "per_worker": results,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
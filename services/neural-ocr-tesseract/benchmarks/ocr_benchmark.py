@@ -0,0 +1,126 @@
+# benchmarks/ocr_benchmark.py
+"""
+End-to-end OCR benchmark on a synthetic scanned corpus with known ground
+truth. Runs EnhancedOCRProcessor.extract_text (preprocessing, Tesseract and
+the optional refine pass) with the result cache disabled, and reports
+throughput, latency, accuracy and memory as JSON. extract_text runs its work
+in a worker thread, so `--concurrency` pages really overlap, as in the
+service; `max_in_flight` in the report shows how many did:
+
+    python benchmarks/ocr_benchmark.py --pages 30 --concurrency 2 --output before.json
+
+Compare two runs by diffing the JSON. The corpus is seeded, so runs on the
+same arguments see identical pages.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+# Every page must really be OCRed
+os.environ["OCR_CACHE_ENABLED"] = "false"
+
+from synthetic_pages import generate_corpus, save_corpus
+from src.quality_metrics.ocr_quality import character_error_rate, word_error_rate
+
+def _ms(values, q) -> float:
+    return round(float(np.percentile(values, q)) * 1000, 1)
+
+def _summary(rows) -> dict:
+    return {
+        "pages": len(rows),
+        "cer": round(float(np.mean([r["cer"] for r in rows])), 4),
+        "wer": round(float(np.mean([r["wer"] for r in rows])), 4),
+        "p50_ms": _ms([r["latency"] for r in rows], 50),
+        "p95_ms": _ms([r["latency"] for r in rows], 95),
+    }
+
+async def run(corpus, concurrency: int, refine: bool, language: str):
+    from text_extraction import EnhancedOCRProcessor
+
+    processor = EnhancedOCRProcessor(language=language)
+    semaphore = asyncio.Semaphore(concurrency)
+    in_flight = max_in_flight = 0
+
+    async def one(page):
+        nonlocal in_flight, max_in_flight
+        async with semaphore:
+            in_flight += 1
+            start = time.perf_counter()
+            # Yield once so pages admitted together are all counted before any finishes
+            await asyncio.sleep(0)
+            max_in_flight = max(max_in_flight, in_flight)
+            result = await processor.extract_text(page.image, refine=refine, language=language)
+            latency = time.perf_counter() - start
+            in_flight -= 1
+        return {
+            "dpi": page.dpi,
+            "latency": latency,
+            "cer": character_error_rate(page.text, result.text),
+            "wer": word_error_rate(page.text, result.text),
+            "confidence": result.confidence,
+        }
+
+    # Warm up Tesseract and the executors on one page outside the timed run
+    await processor.extract_text(corpus[0].image, language=language)
+    start = time.perf_counter()
+    rows = await asyncio.gather(*[one(page) for page in corpus])
+    return rows, time.perf_counter() - start, max_in_flight
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end OCR benchmark")
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dpis", default="150,200,300")
+    parser.add_argument("--max-skew", type=float, default=3.0)
+    parser.add_argument("--max-noise", type=float, default=12.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--refine", action="store_true")
+    parser.add_argument("--language", default="eng")
+    parser.add_argument("--save-corpus", type=Path, help="Also write the pages and ground truth here")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(
+        args.pages, seed=args.seed, dpis=[int(d) for d in args.dpis.split(",")],
+        max_skew=args.max_skew, max_noise=args.max_noise
+    )
+    if args.save_corpus:
+        save_corpus(corpus, args.save_corpus)
+
+    rows, elapsed, max_in_flight = asyncio.run(run(corpus, args.concurrency, args.refine, args.language))
+
+    by_dpi = defaultdict(list)
+    for row in rows:
+        by_dpi[row["dpi"]].append(row)
+    # ru_maxrss is in KiB on Linux; Tesseract runs in child processes
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    report = {
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "pages_per_sec": round(len(rows) / elapsed, 3),
+        "elapsed_s": round(elapsed, 2),
+        "max_in_flight": max_in_flight,
+        **_summary(rows),
+        "peak_rss_mb": round(self_rss, 1),
+        "peak_child_rss_mb": round(child_rss, 1),
+        "by_dpi": {str(dpi): _summary(group) for dpi, group in sorted(by_dpi.items())},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/startup_benchmark.py
+"""
+Measures how long a cold OCR service takes to answer its first Tesseract-only
+request. Starts uvicorn in a subprocess, polls /health, then posts a small
+rendered page to /ocr and reports the timings as JSON.
+
+    python benchmarks/startup_benchmark.py --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import httpx
+import numpy as np
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+def _sample_png() -> bytes:
+    img = np.full((200, 800), 255, dtype=np.uint8)
+    cv2.putText(img, "Startup benchmark page", (20, 110), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    success, buffer = cv2.imencode(".png", img)
+    assert success
+    return buffer.tobytes()
+
+def _wait_for(url: str, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, timeout=0.5).status_code == 200:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not become ready")
+
+def run_once(port: int, timeout: float, layout: bool) -> dict:
+    env = dict(os.environ, OCR_PRELOAD_LAYOUT="false")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        env=env
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        health_ready = _wait_for(f"{base_url}/health", start + timeout)
+        response = httpx.post(
+            f"{base_url}/ocr",
+            files={"file": ("page.png", _sample_png(), "image/png")},
+            data={"layout": str(layout).lower()},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        first_response = time.perf_counter()
+        return {
+            "time_to_health_s": health_ready - start,
+            "time_to_first_ocr_s": first_response - start,
+            "layout": layout
+        }
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="OCR service cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=18002)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--layout", action="store_true", help="Request layout analysis on the first call")
+    args = parser.parse_args()
+
+    runs = [run_once(args.port, args.timeout, args.layout) for _ in range(args.runs)]
+    first_ocr = sorted(r["time_to_first_ocr_s"] for r in runs)
+    print(json.dumps({
+        "benchmark": "startup",
+        "runs": runs,
+        "median_time_to_first_ocr_s": first_ocr[len(first_ocr) // 2],
+        "target_s": 1.0
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/transport_benchmark.py
+"""
+Compares the cost of handing page images from the pdf-processor to the OCR
+service for a scanned document, excluding the OCR itself:
+
+  legacy     - the whole document uploaded as multipart for every page
+  multipart  - one PNG per page uploaded as multipart and decoded
+  path       - one PNG per page written to the shared volume and read back
+  shm        - one raw raster per page copied through shared memory
+
+    python benchmarks/transport_benchmark.py --pages 300
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+import cv2
+import httpx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from image_transport import decode_image_bytes, read_shared_memory, read_shared_path
+
+def _scanned_page(width: int, height: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width), 255, dtype=np.uint8)
+    for line in range(60, height - 60, 55):
+        cv2.putText(page, f"Scanned line {line} of page {seed}", (60, line),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+    noise = rng.normal(0, 8, page.shape)
+    return np.clip(page + noise, 0, 255).astype(np.uint8)
+
+def _multipart_body(name: str, content: bytes, content_type: str) -> int:
+    # Build and serialise the request exactly as httpx would send it
+    request = httpx.Request("POST", "http://ocr/ocr", files={"file": (name, content, content_type)})
+    return len(request.read())
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Page image transport benchmark")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--width", type=int, default=2550)
+    parser.add_argument("--height", type=int, default=3300)
+    parser.add_argument("--legacy-samples", type=int, default=10,
+                        help="Whole-document uploads to time; the rest are extrapolated")
+    args = parser.parse_args()
+
+    # A handful of distinct pages is enough; transport cost does not depend on content
+    pages = [_scanned_page(args.width, args.height, seed) for seed in range(4)]
+    pngs = [cv2.imencode(".png", page)[1].tobytes() for page in pages]
+    document = b"".join(pngs[i % len(pngs)] for i in range(args.pages))
+    results = {}
+
+    legacy_samples = min(args.legacy_samples, args.pages)
+    sample_time = sum(
+        _timed(lambda: _multipart_body("document.pdf", document, "application/pdf"))
+        for _ in range(legacy_samples)
+    )
+    results["legacy"] = {
+        "seconds": sample_time / legacy_samples * args.pages,
+        "bytes_moved": len(document) * args.pages,
+        "extrapolated_from": legacy_samples
+    }
+
+    def multipart():
+        for i in range(args.pages):
+            page = pages[i % len(pages)]
+            body = cv2.imencode(".png", page)[1].tobytes()
+            _multipart_body("page.png", body, "image/png")
+            decode_image_bytes(body)
+    results["multipart"] = {
+        "seconds": _timed(multipart),
+        "bytes_moved": sum(len(pngs[i % len(pngs)]) for i in range(args.pages))
+    }
+
+    with tempfile.TemporaryDirectory() as shared_dir:
+        shared_root = Path(shared_dir).resolve()
+
+        def path():
+            for i in range(args.pages):
+                target = shared_root / f"page_{i}.png"
+                cv2.imwrite(str(target), pages[i % len(pages)])
+                read_shared_path(str(target), shared_root)
+                target.unlink()
+        results["path"] = {"seconds": _timed(path), "bytes_moved": 0}
+
+    def shm():
+        for i in range(args.pages):
+            page = pages[i % len(pages)]
+            block = shared_memory.SharedMemory(name=f"bench_{uuid.uuid4().hex[:12]}", create=True, size=page.nbytes)
+            try:
+                block.buf[:page.nbytes] = page.tobytes()
+                read_shared_memory(block.name, page.shape)
+                # The reader unregisters the block from this same process's tracker; re-register for unlink
+                resource_tracker.register(block._name, "shared_memory")
+            finally:
+                block.close()
+                block.unlink()
+    results["shm"] = {"seconds": _timed(shm), "bytes_moved": 0}
+
+    for mode in results.values():
+        mode["pages_per_second"] = args.pages / mode["seconds"] if mode["seconds"] else None
+
+    print(json.dumps({
+        "benchmark": "transport",
+        "pages": args.pages,
+        "page_size": [args.height, args.width],
+        "document_bytes": len(document),
+        "results": results
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
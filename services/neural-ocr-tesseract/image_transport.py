@@ -0,0 +1,85 @@
+# image_transport.py
+import os
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+from multiprocessing import resource_tracker, shared_memory
+
+# Directory shared with the pdf-processor (same volume mounted in both containers)
+SHARED_ROOT = Path(os.getenv("OCR_SHARED_ROOT", "/app/data")).resolve()
+
+# Error code in the 400 body when a reference cannot be reached from this host,
+# which tells the caller to upload the bytes instead
+TRANSPORT_UNAVAILABLE = "transport_unavailable"
+
+class ImageTransportError(Exception):
+    """Raised when an image reference cannot be resolved."""
+    pass
+
+class TransportUnavailable(ImageTransportError):
+    """Raised when a path or shared-memory block does not exist on this host."""
+    pass
+
+def decode_image_bytes(contents: bytes) -> np.ndarray:
+    img = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ImageTransportError("Could not decode image")
+    return img
+
+def read_shared_path(path: str, shared_root: Path = SHARED_ROOT) -> np.ndarray:
+    """Load an image that the caller wrote to the shared volume."""
+    resolved = Path(path).resolve()
+    if shared_root not in resolved.parents:
+        raise TransportUnavailable(f"Path is outside the shared directory: {path}")
+    if not resolved.is_file():
+        raise TransportUnavailable(f"Shared file not found: {path}")
+    img = cv2.imread(str(resolved), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise ImageTransportError(f"Could not decode shared file: {path}")
+    return img
+
+def parse_shape(shape: str) -> Tuple[int, ...]:
+    """Parse a 'height,width' or 'height,width,channels' shape string."""
+    try:
+        dims = tuple(int(d) for d in shape.split(","))
+    except ValueError:
+        raise ImageTransportError(f"Invalid shape: {shape}")
+    if len(dims) not in (2, 3) or any(d <= 0 for d in dims):
+        raise ImageTransportError(f"Invalid shape: {shape}")
+    return dims
+
+def read_shared_memory(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Copy a raw uint8 raster out of a named shared-memory block. The caller owns
+    the block and unlinks it once the request returns.
+    """
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        raise TransportUnavailable(f"Shared memory block not found: {name}")
+    # Attaching registers the block with our resource tracker (bpo-39959), which
+    # would unlink it from under the caller when this worker exits
+    resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        size = int(np.prod(shape))
+        if shm.size < size:
+            raise ImageTransportError(f"Shared memory block {name} is smaller than shape {shape}")
+        return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf[:size]).copy()
+    finally:
+        shm.close()
+
+def resolve_image(contents: Optional[bytes] = None,
+                  path: Optional[str] = None,
+                  shm_name: Optional[str] = None,
+                  shape: Optional[str] = None) -> Tuple[np.ndarray, str]:
+    """Return the image and the transport it arrived by."""
+    if shm_name:
+        if not shape:
+            raise ImageTransportError("shape is required with shm_name")
+        return read_shared_memory(shm_name, parse_shape(shape)), "shm"
+    if path:
+        return read_shared_path(path), "path"
+    if contents is not None:
+        return decode_image_bytes(contents), "multipart"
+    raise ImageTransportError("One of file, path or shm_name is required")
@@ -0,0 +1,141 @@
+# language_detection.py
+import os
+import re
+import logging
+import unicodedata
+import cv2
+import numpy as np
+import pytesseract
+from collections import Counter
+from functools import lru_cache
+from typing import Optional, Set
+
+OCR_DEFAULT_LANGUAGE = os.getenv("OCR_DEFAULT_LANGUAGE", "eng")
+# Requested language that asks for per-page detection
+AUTO_LANGUAGE = "auto"
+# Longest side of the page copy used for script detection
+LANGUAGE_PROBE_MAX_SIDE = int(os.getenv("OCR_LANGUAGE_PROBE_MAX_SIDE", "1200"))
+
+logger = logging.getLogger(__name__)
+
+# Tesseract pack for each non-Latin script; Latin pages are told apart by stopwords
+SCRIPT_LANGUAGES = {
+    "CYRILLIC": "rus",
+    "ARABIC": "ara",
+    "GREEK": "ell",
+    "HEBREW": "heb",
+    "CJK": "chi_sim",
+    "HANGUL": "kor",
+    "HIRAGANA": "jpn",
+    "KATAKANA": "jpn",
+    "DEVANAGARI": "hin",
+    "THAI": "tha",
+}
+
+# Script names as reported by Tesseract OSD
+OSD_SCRIPTS = {
+    "Cyrillic": "CYRILLIC",
+    "Arabic": "ARABIC",
+    "Greek": "GREEK",
+    "Hebrew": "HEBREW",
+    "Han": "CJK",
+    "HanS": "CJK",
+    "HanT": "CJK",
+    "Hangul": "HANGUL",
+    "Japanese": "HIRAGANA",
+    "Devanagari": "DEVANAGARI",
+    "Thai": "THAI",
+}
+
+STOPWORDS = {
+    "eng": {"the", "and", "of", "to", "in", "is", "that", "for", "with", "this", "are", "on", "be", "by"},
+    "deu": {"der", "die", "und", "das", "ist", "nicht", "mit", "den", "von", "zu", "ein", "eine", "auf", "für"},
+    "fra": {"le", "la", "les", "et", "des", "est", "une", "du", "que", "pour", "dans", "pas", "sur", "au"},
+    "spa": {"el", "los", "las", "y", "que", "del", "es", "una", "por", "con", "para", "como", "su", "al"},
+}
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+_SAMPLE_CHARS = 4000
+
+def _script(char: str) -> Optional[str]:
+    try:
+        return unicodedata.name(char).split(" ", 1)[0]
+    except ValueError:
+        return None
+
+def detect_text_language(text: str, default: str = OCR_DEFAULT_LANGUAGE, min_letters: int = 20) -> Optional[str]:
+    """
+    Language pack for a text sample: the dominant Unicode script picks non-Latin
+    packs directly, Latin text is scored against small stopword lists. Returns
+    None when there is too little text to decide.
+    """
+    sample = text[:_SAMPLE_CHARS]
+    scripts = Counter(_script(c) for c in sample if c.isalpha())
+    if sum(scripts.values()) < min_letters:
+        return None
+
+    script = scripts.most_common(1)[0][0]
+    if script != "LATIN":
+        return SCRIPT_LANGUAGES.get(script, default)
+
+    words = [w.lower() for w in _WORD.findall(sample)]
+    scores = {lang: sum(1 for w in words if w in stopwords) for lang, stopwords in STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] >= 2 else default
+
+@lru_cache(maxsize=1)
+def installed_languages() -> Set[str]:
+    try:
+        return set(pytesseract.get_languages(config=""))
+    except Exception as e:
+        logger.warning(f"Could not list Tesseract languages: {str(e)}")
+        return {OCR_DEFAULT_LANGUAGE}
+
+def _probe_image(img: np.ndarray) -> np.ndarray:
+    scale = LANGUAGE_PROBE_MAX_SIDE / max(img.shape[:2])
+    if scale >= 1.0:
+        return img
+    return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+def detect_image_language(img: np.ndarray, default: str = OCR_DEFAULT_LANGUAGE) -> str:
+    """
+    Language pack for a page image, decided on a downscaled copy: OSD gives the
+    script, and Latin pages get a quick low-resolution read for stopwords.
+    """
+    probe = _probe_image(img)
+    try:
+        osd = pytesseract.image_to_osd(probe, output_type=pytesseract.Output.DICT)
+        script = OSD_SCRIPTS.get(osd.get("script"))
+        if script:
+            return SCRIPT_LANGUAGES[script]
+    except pytesseract.TesseractError:
+        # OSD needs a minimum amount of text; fall through to the Latin probe
+        pass
+
+    text = pytesseract.image_to_string(probe, lang=default, config="--oem 1 --psm 3")
+    return detect_text_language(text, default) or default
+
+def needs_image_detection(language: Optional[str], text_hint: Optional[str] = None) -> bool:
+    """Whether resolving `language` falls through to the image probe, the slow path of "auto"."""
+    return language == AUTO_LANGUAGE and not (text_hint and detect_text_language(text_hint))
+
+def resolve_language(language: Optional[str], img: Optional[np.ndarray] = None,
+                     text_hint: Optional[str] = None) -> str:
+    """
+    Turn a requested language into an installed Tesseract pack. "auto" detects
+    from the native text layer when given, otherwise from the image.
+    """
+    if not language:
+        return OCR_DEFAULT_LANGUAGE
+    if language == AUTO_LANGUAGE:
+        detected = detect_text_language(text_hint) if text_hint else None
+        if detected is None and img is not None:
+            detected = detect_image_language(img)
+        language = detected or OCR_DEFAULT_LANGUAGE
+
+    available = installed_languages()
+    packs = [pack for pack in language.split("+") if pack in available]
+    if not packs:
+        logger.warning(f"Language pack {language} not installed, using {OCR_DEFAULT_LANGUAGE}")
+        return OCR_DEFAULT_LANGUAGE
+    return "+".join(packs)
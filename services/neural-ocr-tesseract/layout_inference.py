@@ -0,0 +1,143 @@
+# layout_inference.py
+import os
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# "fp32" runs the model as loaded; "int8" applies PyTorch dynamic quantization to
+# the Linear layers; "onnx" runs the exported graph in ONNX Runtime. Only used on CPU.
+OCR_LAYOUT_BACKEND = os.getenv("OCR_LAYOUT_BACKEND", "fp32").lower()
+OCR_LAYOUT_THREADS = int(os.getenv("OCR_LAYOUT_THREADS", "0"))
+LAYOUT_BACKENDS = ("fp32", "int8", "onnx")
+ONNX_FILE = "model.onnx"
+# Every backend runs a token-classification head, so each word gets a label
+LAYOUT_ARCHITECTURE = "LayoutLMv3ForTokenClassification"
+
+logger = logging.getLogger(__name__)
+
+def word_regions(logits, word_ids: Sequence[Optional[int]], words: Sequence[str],
+                 boxes: Sequence[Sequence[int]], image_size: Tuple[int, int],
+                 min_score: float = 0.5) -> List[Tuple[str, List[float], float]]:
+    """
+    (word, pixel bbox, score) for each word the layout model labels with more
+    than `min_score` confidence. `logits` are one page's token-classification
+    outputs, shape (sequence, labels), from any backend. `word_ids` map tokens
+    to `words` and their 0-1000 normalised `boxes`, None for special tokens.
+    A word is scored at its first sub-word token by the probability of its most
+    likely label other than 0, the background ("O") class.
+    """
+    logits = np.asarray(logits, dtype=np.float32)
+    probabilities = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probabilities /= probabilities.sum(axis=-1, keepdims=True)
+    width, height = image_size
+
+    regions = []
+    seen = set()
+    for token, word in enumerate(word_ids):
+        if word is None or word in seen:
+            continue
+        seen.add(word)
+        score = float(probabilities[token, 1:].max())
+        if score > min_score:
+            x0, y0, x1, y1 = boxes[word]
+            bbox = [x0 * width / 1000, y0 * height / 1000, x1 * width / 1000, y1 * height / 1000]
+            regions.append((words[word], bbox, score))
+    return regions
+
+class OnnxLayoutModel:
+    """
+    ONNX Runtime session behind the same call signature as the PyTorch model,
+    returning the same per-token `logits`.
+    """
+
+    def __init__(self, path: Path, threads: int = OCR_LAYOUT_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, **inputs):
+        import torch
+
+        feed = {k: v.cpu().numpy() for k, v in inputs.items() if k in self.input_names}
+        (logits,) = self.session.run(["logits"], feed)
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def to(self, device: str):
+        return self
+
+    def eval(self):
+        return self
+
+def quantize_int8(model):
+    """
+    Dynamic int8 quantization of the Linear layers: weights are stored as int8,
+    activations are quantized on the fly. Embeddings and layer norms stay fp32.
+    Quantized weights are private copies, so they are not shared through the
+    model store's memory map.
+    """
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def export_onnx(model, processor, path: Path, opset: int = 14) -> Path:
+    """Trace the model on a sample page and write it to `path` with dynamic batch and sequence axes."""
+    import torch
+    from PIL import Image, ImageDraw
+
+    # A page with some text so the trace sees a realistic sequence length
+    page = Image.new("RGB", (850, 1100), "white")
+    draw = ImageDraw.Draw(page)
+    for y in range(80, 1000, 40):
+        draw.text((60, y), "Layout export sample line with several words", fill="black")
+    encoding = processor(page, return_tensors="pt", truncation=True)
+    names = ["input_ids", "attention_mask", "bbox", "pixel_values"]
+    dynamic = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "bbox": {0: "batch", 1: "sequence"},
+        "pixel_values": {0: "batch"},
+        "logits": {0: "batch", 1: "sequence"},
+    }
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            # A trailing dict in args is passed as keyword arguments
+            model, ({name: encoding[name] for name in names},), str(path),
+            input_names=names, output_names=["logits"],
+            dynamic_axes=dynamic, opset_version=opset
+        )
+    return path
+
+def build_layout_model(model, model_dir: Optional[Path], device: str, backend: str = OCR_LAYOUT_BACKEND):
+    """
+    (model, backend) for the requested backend. Falls back to fp32 on GPU and
+    when the ONNX graph has not been exported to the model store.
+    """
+    if backend not in LAYOUT_BACKENDS:
+        raise ValueError(f"Unknown OCR_LAYOUT_BACKEND {backend!r}, expected one of {LAYOUT_BACKENDS}")
+    if backend == "fp32":
+        return model, backend
+    if device != "cpu":
+        logger.warning(f"OCR_LAYOUT_BACKEND={backend} is CPU-only, using fp32 on {device}")
+        return model, "fp32"
+
+    if OCR_LAYOUT_THREADS:
+        import torch
+        torch.set_num_threads(OCR_LAYOUT_THREADS)
+
+    if backend == "int8":
+        return quantize_int8(model), backend
+
+    onnx_path = model_dir / ONNX_FILE if model_dir is not None else None
+    if onnx_path is None or not onnx_path.exists():
+        logger.warning("No exported ONNX graph in the model store, using fp32; run `model_store.py export --onnx`")
+        return model, "fp32"
+    return OnnxLayoutModel(onnx_path), backend
@@ -1,13 +1,18 @@
 # main.py
-import os, torch
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import os
+import asyncio
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import uvicorn
-import numpy as np
-import cv2
-from text_extraction import EnhancedOCRProcessor
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from text_extraction import EnhancedOCRProcessor, get_layoutlm_processor, layoutlm_loaded
+from image_transport import resolve_image, ImageTransportError, TransportUnavailable, TRANSPORT_UNAVAILABLE
+from admission import AdmissionController, Overloaded
+
+# Load LayoutLM in the background at startup instead of on the first layout request
+PRELOAD_LAYOUT = os.getenv("OCR_PRELOAD_LAYOUT", "false").lower() == "true"
 
 app = FastAPI()
 app.add_middleware(
@@ -18,41 +23,100 @@ app.add_middleware(
 )
 
 ocr_processor = EnhancedOCRProcessor()
+admission = AdmissionController()
+
+@app.on_event("startup")
+async def preload_layout_model():
+    if PRELOAD_LAYOUT:
+        # Fire and forget: Tesseract-only requests are served while the model loads
+        asyncio.get_event_loop().run_in_executor(None, get_layoutlm_processor)
 
 class OCRResponse(BaseModel):
     text: str
     confidence: float
     processing_time: float
+    queue_time: float = 0.0
+    service_time: float = 0.0
     layout_info: Optional[List[Dict]] = None
+    metadata: Dict = {}
+    words: Optional[Dict[str, List]] = None
 
 @app.get("/health")
 async def health_check():
-    gpu_available = "cuda" if torch.cuda.is_available() else "cpu"
+    # Only report the device once torch is loaded; importing it here would defeat lazy loading
+    gpu_available = get_layoutlm_processor().device if layoutlm_loaded() else None
     return {
         "status": "healthy",
         "service": "ocr-tesseract",
-        "gpu": gpu_available
+        "gpu": gpu_available,
+        "layout_model_loaded": layoutlm_loaded(),
+        "cache": ocr_processor.cache.stats() if ocr_processor.cache else None,
+        "admission": admission.stats()
     }
 
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.post("/ocr", response_model=OCRResponse)
-async def ocr(file: UploadFile = File(...)):
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(400, "File must be an image")
+async def ocr(
+    file: Optional[UploadFile] = File(None),
+    path: Optional[str] = Form(None),
+    shm_name: Optional[str] = Form(None),
+    shape: Optional[str] = Form(None),
+    layout: bool = Form(False),
+    refine: bool = Form(False),
+    include_words: bool = Form(False),
+    language: Optional[str] = Form(None),
+    text_hint: Optional[str] = Form(None)
+):
+    """
+    OCR a single page image. Callers on the same host can pass `path` (a file on
+    the shared volume) or `shm_name` plus `shape` (a raw uint8 raster in shared
+    memory) instead of uploading the image bytes.
     
-    contents = await file.read()
-    nparr = np.frombuffer(contents, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    `refine` re-OCRs only low-confidence words at a higher scale; `include_words`
+    returns per-word boxes and confidences as column arrays. `language` is a
+    Tesseract pack ("deu", "eng+fra") or "auto", which detects it from
+    `text_hint` (the page's native text layer) or a downscaled copy of the page.
     
-    if img is None:
-        raise HTTPException(400, "Could not decode image")
+    At most OCR_MAX_CONCURRENCY requests run at once and OCR_MAX_QUEUE wait;
+    further requests get 503 with Retry-After. `queue_time` and `service_time`
+    in the response split the latency into waiting and processing.
+    """
+    contents = None
+    if file is not None:
+        if not file.content_type.startswith('image/'):
+            raise HTTPException(400, "File must be an image")
+        contents = await file.read()
     
-    result = await ocr_processor.extract_text(img)
+    try:
+        async with admission.admit() as ticket:
+            try:
+                img, transport = await asyncio.to_thread(
+                    resolve_image, contents, path=path, shm_name=shm_name, shape=shape
+                )
+            except TransportUnavailable as e:
+                raise HTTPException(400, {"code": TRANSPORT_UNAVAILABLE, "message": str(e)})
+            except ImageTransportError as e:
+                raise HTTPException(400, str(e))
+            
+            result = await ocr_processor.extract_text(
+                img, use_layout=layout, refine=refine, language=language, text_hint=text_hint
+            )
+    except Overloaded as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
+    result.metadata["transport"] = transport
     
     return OCRResponse(
         text=result.text,
         confidence=result.confidence,
         processing_time=result.processing_time,
-        layout_info=result.layout_info
+        queue_time=ticket.queue_time,
+        service_time=ticket.service_time,
+        layout_info=result.layout_info,
+        metadata=result.metadata,
+        words=result.words if include_words else None
     )
 
 if __name__ == "__main__":
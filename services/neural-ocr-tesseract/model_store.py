@@ -0,0 +1,171 @@
+# model_store.py
+"""
+Local store of pre-converted model artifacts, so replicas start without
+touching the Hugging Face hub or cache.
+
+    python model_store.py export microsoft/layoutlmv3-base
+
+writes the processor files and a single `model.safetensors` under
+OCR_MODEL_STORE. Workers memory-map the weights read-only: every process on
+the node maps the same page-cache pages instead of holding a private copy.
+"""
+import os
+import json
+import mmap
+import struct
+import logging
+import argparse
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from layout_inference import LAYOUT_ARCHITECTURE
+
+OCR_MODEL_STORE = os.getenv("OCR_MODEL_STORE", "data/models")
+WEIGHTS_FILE = "model.safetensors"
+MANIFEST_FILE = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+# Open maps stay referenced for the life of the process; tensors point into them
+_maps = []
+
+def model_dir(model_name: str, store: str = OCR_MODEL_STORE) -> Path:
+    return Path(store) / model_name.replace("/", "--")
+
+def local_model_dir(model_name: str, store: str = OCR_MODEL_STORE) -> Optional[Path]:
+    """
+    The exported artifact directory for the model, or None if it has not been
+    exported or was exported with a different model head.
+    """
+    path = model_dir(model_name, store)
+    if not (path / WEIGHTS_FILE).exists() or not (path / MANIFEST_FILE).exists():
+        return None
+    if json.loads((path / MANIFEST_FILE).read_text()).get("architecture") != LAYOUT_ARCHITECTURE:
+        logger.warning(f"Model store {path} was exported with another model head; re-export it")
+        return None
+    return path
+
+def mmap_state_dict(path: Path) -> Dict[str, "torch.Tensor"]:
+    """
+    Tensors backed directly by a read-only map of a safetensors file. Unlike
+    safetensors.torch.load_file, nothing is copied into process memory.
+    """
+    import torch
+
+    dtypes = {
+        "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+        "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+        "U8": torch.uint8, "BOOL": torch.bool,
+    }
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _maps.append(mapped)
+
+    state = {}
+    base = 8 + header_size
+    with warnings.catch_warnings():
+        # The map is read-only on purpose; the weights are never written in inference
+        warnings.filterwarnings("ignore", message="The given buffer is not writable")
+        for name, info in header.items():
+            if name == "__metadata__":
+                continue
+            start, end = info["data_offsets"]
+            dtype = dtypes[info["dtype"]]
+            count = (end - start) // torch.empty((), dtype=dtype).element_size()
+            tensor = torch.frombuffer(mapped, dtype=dtype, count=count, offset=base + start)
+            state[name] = tensor.reshape(info["shape"])
+    return state
+
+@contextmanager
+def empty_parameters():
+    """
+    Create module parameters on the meta device, so building a model neither
+    allocates nor randomly initialises weights that are about to be replaced.
+    Buffers stay real: some (position ids) are not saved with the weights and
+    keep the values the constructor gives them.
+    """
+    import torch
+
+    register_parameter = torch.nn.Module.register_parameter
+
+    def register_empty_parameter(module, name, param):
+        register_parameter(module, name, param)
+        if param is not None:
+            module._parameters[name] = torch.nn.Parameter(
+                module._parameters[name].to("meta"), requires_grad=param.requires_grad
+            )
+
+    torch.nn.Module.register_parameter = register_empty_parameter
+    try:
+        yield
+    finally:
+        torch.nn.Module.register_parameter = register_parameter
+
+def assign_weights(model: "torch.nn.Module", state: Dict[str, "torch.Tensor"]):
+    """Point the model's parameters and buffers at `state` without copying."""
+    missing, _ = model.load_state_dict(state, strict=False, assign=True)
+    # Buffers left out of the store keep their constructed values; a missing
+    # parameter would be left on the meta device
+    parameters = dict(model.named_parameters())
+    missing = [name for name in missing if name in parameters]
+    if missing:
+        raise ValueError(f"Weights missing from model store: {', '.join(missing[:5])}")
+    model.requires_grad_(False)
+
+def load_layoutlm(model_name: str, store: str = OCR_MODEL_STORE):
+    """(processor, model) from the local store, or None if the model was not exported."""
+    path = local_model_dir(model_name, store)
+    if path is None:
+        return None
+
+    from transformers import LayoutLMv3Config, LayoutLMv3Processor, LayoutLMv3ForTokenClassification
+
+    processor = LayoutLMv3Processor.from_pretrained(path, local_files_only=True)
+    config = LayoutLMv3Config.from_pretrained(path, local_files_only=True)
+    with empty_parameters():
+        model = LayoutLMv3ForTokenClassification(config)
+    assign_weights(model, mmap_state_dict(path / WEIGHTS_FILE))
+    model.eval()
+    logger.info(f"Loaded {model_name} from model store {path}")
+    return processor, model
+
+def export_layoutlm(model_name: str, store: str = OCR_MODEL_STORE, onnx: bool = False) -> Path:
+    """
+    Download the model once and write it to the store in the mmap-able layout,
+    plus an ONNX graph for OCR_LAYOUT_BACKEND=onnx when requested.
+    """
+    from transformers import LayoutLMv3Processor, LayoutLMv3ForTokenClassification
+
+    path = model_dir(model_name, store)
+    path.mkdir(parents=True, exist_ok=True)
+    LayoutLMv3Processor.from_pretrained(model_name).save_pretrained(path)
+    model = LayoutLMv3ForTokenClassification.from_pretrained(model_name)
+    # One unsharded file so a single map covers every tensor
+    model.save_pretrained(path, safe_serialization=True, max_shard_size="100GB")
+    if onnx:
+        from layout_inference import ONNX_FILE, export_onnx
+        export_onnx(model, LayoutLMv3Processor.from_pretrained(path), path / ONNX_FILE)
+    (path / MANIFEST_FILE).write_text(json.dumps({
+        "model_name": model_name,
+        "architecture": LAYOUT_ARCHITECTURE,
+        "weights": WEIGHTS_FILE,
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "onnx": onnx,
+    }, indent=2))
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR model artifact store")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    export = subcommands.add_parser("export", help="Export a model into the store")
+    export.add_argument("model_name", nargs="?", default="microsoft/layoutlmv3-base")
+    export.add_argument("--store", default=OCR_MODEL_STORE)
+    export.add_argument("--onnx", action="store_true", help="Also export an ONNX graph")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(export_layoutlm(args.model_name, args.store, onnx=args.onnx))
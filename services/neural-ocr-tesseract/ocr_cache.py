@@ -0,0 +1,138 @@
+# ocr_cache.py
+import os
+import json
+import hashlib
+import threading
+import logging
+import numpy as np
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Dict, Optional
+
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "1024"))
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "data/cache/ocr")
+OCR_CACHE_MAX_DISK_ENTRIES = int(os.getenv("OCR_CACHE_MAX_DISK_ENTRIES", "100000"))
+
+logger = logging.getLogger(__name__)
+
+def image_cache_key(img: np.ndarray, *params) -> str:
+    """Hash of the preprocessed bitmap plus every parameter that changes the OCR output."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((img.shape, str(img.dtype)) + params).encode())
+    digest.update(np.ascontiguousarray(img).data)
+    return digest.hexdigest()
+
+class OCRResultCache:
+    """
+    Two-tier cache of OCR results: a bounded in-memory LRU in front of a JSON
+    store on disk. Disk entries survive restarts and are shared by replicas
+    that mount the same directory.
+    """
+
+    def __init__(self,
+                 max_entries: int = OCR_CACHE_SIZE,
+                 cache_dir: Optional[str] = OCR_CACHE_DIR,
+                 max_disk_entries: int = OCR_CACHE_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, result) -> None:
+        value = asdict(result)
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def _remember(self, key: str, value: Dict) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            value = json.loads(path.read_text())
+            os.utime(path)  # Keep recently used entries out of pruning
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable OCR cache entry {key}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, value: Dict) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(value))
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.error(f"OCR cache write error: {str(e)}")
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            prune = self._writes_since_prune >= 1000
+            if prune:
+                self._writes_since_prune = 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        """Drop the least recently used disk entries beyond max_disk_entries."""
+        files = list(self.cache_dir.glob("*/*.json"))
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:excess]:
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
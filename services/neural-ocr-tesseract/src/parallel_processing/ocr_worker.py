@@ -1,78 +1,147 @@
 # services/neural-ocr-tesseract/src/parallel_processing/ocr_worker.py
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+import asyncio
 import httpx
 from loguru import logger
 from ...orchestration.smart_orchestrator import ParallelProcessor, ProcessorResult
 
+def _detail(response: httpx.Response):
+    try:
+        return response.json().get("detail")
+    except (ValueError, AttributeError):
+        return None
+
+def route_missing(response: httpx.Response) -> bool:
+    """
+    Whether the service has no such endpoint, as opposed to an endpoint that
+    rejected the request: the router's own 404 body, or 405/501.
+    """
+    if response.status_code in (405, 501):
+        return True
+    return response.status_code == 404 and _detail(response) == "Not Found"
+
 class OCRWorker(ParallelProcessor):
     """Worker class for parallel OCR processing"""
     
     def __init__(self, 
                  ocr_service_url: str = "http://ocr-tesseract:8004",
                  language: str = "eng",
-                 dpi: int = 300):
+                 dpi: int = 300,
+                 max_connections: int = 16,
+                 max_keepalive_connections: int = 8,
+                 keepalive_expiry: float = 30.0,
+                 max_concurrent_pages: int = 8):
         super().__init__("ocr_worker")
         self.ocr_service_url = ocr_service_url
         self.language = language
         self.dpi = dpi
-        self.client = httpx.AsyncClient(timeout=300.0)
+        # The client talks to a single host, so the pool limits are per-host limits
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+        self.page_semaphore = asyncio.Semaphore(max_concurrent_pages)
+        self._batch_available = True
+        self._document_cache: Optional[Tuple[Path, float, bytes]] = None
         logger.info(f"Initialized OCR worker with language={language}, dpi={dpi}")
 
+    async def start(self):
+        """Open the pooled client. Called lazily on first use if not called explicitly."""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(timeout=300.0, limits=self.limits)
+
+    async def close(self):
+        """Close the pooled client and its keep-alive connections."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def __aenter__(self) -> "OCRWorker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        await self.start()
+        return self.client
+
+    def _read_document(self, file_path: Path) -> bytes:
+        """Read the document once and reuse the bytes for every page of it"""
+        mtime = file_path.stat().st_mtime
+        if self._document_cache and self._document_cache[:2] == (file_path, mtime):
+            return self._document_cache[2]
+        content = file_path.read_bytes()
+        self._document_cache = (file_path, mtime, content)
+        return content
+
+    async def _post_document(self, client: httpx.AsyncClient, endpoint: str,
+                             file_path: Path, data: Dict) -> httpx.Response:
+        """
+        Upload the document. The service's path references are images for
+        /ocr, so a PDF is always sent as a multipart upload.
+        """
+        files = {
+            'file': ('document.pdf', self._read_document(file_path), 'application/pdf')
+        }
+        return await client.post(
+            f"{self.ocr_service_url}/{endpoint}",
+            files=files,
+            data=data
+        )
+
+    def _to_result(self, page_number: int, result: Dict) -> ProcessorResult:
+        return ProcessorResult(
+            processor_name=self.name,
+            page_number=page_number,
+            content=result['text'],
+            confidence=result.get('confidence', 0.5),
+            metadata={
+                'ocr_engine': 'tesseract',
+                'language': self.language,
+                'dpi': self.dpi,
+                'enhancement_applied': True,
+                'detected_languages': result.get('languages', []),
+                'processing_time': result.get('processing_time', 0)
+            }
+        )
+
     async def process_page(self, file_path: Path, page_number: int) -> ProcessorResult:
         """Process a single page with OCR"""
         try:
-            # Prepare request to OCR service
-            async with self.client as client:
-                files = {
-                    'file': ('document.pdf', file_path.read_bytes(), 'application/pdf')
-                }
-                data = {
-                    'page': page_number,
-                    'language': self.language,
-                    'dpi': self.dpi,
-                    'enhance_image': True
-                }
-                
-                response = await client.post(
-                    f"{self.ocr_service_url}/process_page",
-                    files=files,
-                    data=data
-                )
-                
-                if response.status_code != 200:
-                    raise Exception(f"OCR service error: {response.text}")
-                
-                result = response.json()
-                
-                return ProcessorResult(
-                    processor_name=self.name,
-                    page_number=page_number,
-                    content=result['text'],
-                    confidence=result.get('confidence', 0.5),
-                    metadata={
-                        'ocr_engine': 'tesseract',
-                        'language': self.language,
-                        'dpi': self.dpi,
-                        'enhancement_applied': True,
-                        'detected_languages': result.get('languages', []),
-                        'processing_time': result.get('processing_time', 0)
-                    }
-                )
+            client = await self._get_client()
+            data = {
+                'page': page_number,
+                'language': self.language,
+                'dpi': self.dpi,
+                'enhance_image': True
+            }
+            
+            response = await self._post_document(client, "process_page", file_path, data)
+            
+            if response.status_code != 200:
+                raise Exception(f"OCR service error: {response.text}")
+            
+            return self._to_result(page_number, response.json())
                 
         except Exception as e:
             logger.error(f"Error in OCR processing for page {page_number}: {str(e)}")
             raise
 
     async def process_document(self, file_path: Path, page_numbers: List[int]) -> Dict[int, ProcessorResult]:
-        """Process multiple pages in parallel with batched OCR"""
+        """
+        Process multiple pages with one batch request. When the service has no
+        batch endpoint, pages are sent concurrently, at most
+        `max_concurrent_pages` at a time, over the pooled connections.
+        """
         try:
-            # Send batch request to OCR service
-            async with self.client as client:
-                files = {
-                    'file': ('document.pdf', file_path.read_bytes(), 'application/pdf')
-                }
+            if self._batch_available:
+                client = await self._get_client()
                 data = {
                     'pages': ','.join(map(str, page_numbers)),
                     'language': self.language,
@@ -81,36 +150,24 @@ class OCRWorker(ParallelProcessor):
                     'batch_mode': True
                 }
                 
-                response = await client.post(
-                    f"{self.ocr_service_url}/process_batch",
-                    files=files,
-                    data=data
-                )
+                response = await self._post_document(client, "process_batch", file_path, data)
                 
-                if response.status_code != 200:
+                if response.status_code == 200:
+                    return {
+                        int(page_num): self._to_result(int(page_num), result)
+                        for page_num, result in response.json().items()
+                    }
+                if not route_missing(response):
                     raise Exception(f"OCR service error: {response.text}")
-                
-                batch_results = response.json()
-                
-                # Convert to ProcessorResult objects
-                results = {}
-                for page_num, result in batch_results.items():
-                    results[int(page_num)] = ProcessorResult(
-                        processor_name=self.name,
-                        page_number=int(page_num),
-                        content=result['text'],
-                        confidence=result.get('confidence', 0.5),
-                        metadata={
-                            'ocr_engine': 'tesseract',
-                            'language': self.language,
-                            'dpi': self.dpi,
-                            'enhancement_applied': True,
-                            'detected_languages': result.get('languages', []),
-                            'processing_time': result.get('processing_time', 0)
-                        }
-                    )
-                
-                return results
+                logger.warning(f"OCR batch endpoint unavailable ({response.status_code}), fanning out per page")
+                self._batch_available = False
+
+            async def bounded_page(page_number: int) -> ProcessorResult:
+                async with self.page_semaphore:
+                    return await self.process_page(file_path, page_number)
+
+            results = await asyncio.gather(*[bounded_page(page) for page in page_numbers])
+            return {result.page_number: result for result in results}
                 
         except Exception as e:
             logger.error(f"Error in batch OCR processing: {str(e)}")
@@ -0,0 +1,46 @@
+# services/neural-ocr-tesseract/src/quality_metrics/ocr_quality.py
+
+import re
+from typing import Sequence
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so line breaks and spacing do not count as errors"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+def edit_distance(reference: Sequence, hypothesis: Sequence) -> int:
+    """
+    Levenshtein distance between two token sequences. Each row of the DP
+    table is computed with numpy; insertions along the row are resolved with
+    a running minimum, so the Python loop runs once per reference token.
+    """
+    if not reference:
+        return len(hypothesis)
+    if not hypothesis:
+        return len(reference)
+
+    vocab = {}
+    ref = np.array([vocab.setdefault(token, len(vocab)) for token in reference])
+    hyp = np.array([vocab.setdefault(token, len(vocab)) for token in hypothesis])
+    offsets = np.arange(len(hyp) + 1)
+    row = offsets.copy()
+    for token in ref:
+        current = np.empty_like(row)
+        current[0] = row[0] + 1
+        current[1:] = np.minimum(row[1:] + 1, row[:-1] + (hyp != token))
+        # current[j] = min over k <= j of current[k] + (j - k)
+        row = np.minimum.accumulate(current - offsets) + offsets
+    return int(row[-1])
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """Character edits needed to turn the OCR output into the ground truth, per reference character"""
+    reference, hypothesis = normalize_text(reference), normalize_text(hypothesis)
+    return edit_distance(reference, hypothesis) / max(1, len(reference))
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word edits needed to turn the OCR output into the ground truth, per reference word"""
+    reference, hypothesis = normalize_text(reference).split(), normalize_text(hypothesis).split()
+    return edit_distance(reference, hypothesis) / max(1, len(reference))
@@ -0,0 +1,32 @@
+import sys
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict
+
+# src/parallel_processing/ocr_worker.py imports the orchestrator relatively
+# (`...orchestration`), as a module of the pipelines package it is deployed
+# into. Here the service directory stands in for that package, with just the
+# orchestrator base classes the worker builds on.
+
+@dataclass
+class ProcessorResult:
+    processor_name: str
+    page_number: int
+    content: Any
+    confidence: float
+    metadata: Dict = field(default_factory=dict)
+
+class ParallelProcessor:
+    def __init__(self, name: str):
+        self.name = name
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return sys.modules.setdefault(name, module)
+
+_module("pipelines", __path__=[str(Path(__file__).resolve().parent.parent)])
+_module("pipelines.orchestration", __path__=[])
+_module("pipelines.orchestration.smart_orchestrator",
+        ParallelProcessor=ParallelProcessor, ProcessorResult=ProcessorResult)
@@ -63,4 +63,413 @@ def test_ocr_endpoint_with_image(sample_image):
     assert "text" in data
     assert "confidence" in data
     assert "bounding_boxes" in data
-    assert "proces
+    assert "processing_time" in data
+
+def test_layout_model_is_lazy(ocr_processor):
+    """Constructing the processor must not load LayoutLM"""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["layout_model_loaded"] is False
+
+
+def test_preprocessing_skips_denoise_on_clean_scan(ocr_processor, sample_image):
+    """Clean rasters take the fast path; noisy ones are denoised"""
+    clean = ocr_processor.preprocessor.run(sample_image)
+    assert "denoise" not in clean.stages
+
+    noise = np.random.default_rng(0).normal(0, 25, sample_image.shape)
+    noisy = np.clip(sample_image.astype(np.float64) + noise, 0, 255).astype(np.uint8)
+    assert "denoise" in ocr_processor.preprocessor.run(noisy).stages
+
+def _text_page(skew: float = 0.0, lines: int = 25) -> np.ndarray:
+    """Letter-sized page of text lines, rotated by `skew` degrees like a crooked scan"""
+    page = np.full((1100, 850), 255, dtype=np.uint8)
+    for i in range(lines):
+        cv2.putText(page, "payment is due within thirty days of receipt"[:20 + i % 25],
+                    (80, 120 + i * 36), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    if skew:
+        matrix = cv2.getRotationMatrix2D((425, 550), skew, 1.0)
+        page = cv2.warpAffine(page, matrix, (850, 1100), borderValue=255)
+    return page
+
+@pytest.mark.parametrize("skew", [-4.0, -1.5, 2.0, 3.3])
+def test_skew_is_recovered(skew):
+    """A known rotation is measured back within a fraction of a degree and undone"""
+    from image_preprocessing import AdaptivePreprocessor, estimate_skew
+
+    assert estimate_skew(_text_page(skew)) == pytest.approx(skew, abs=0.25)
+    assert "deskew" in AdaptivePreprocessor().run(_text_page(skew)).stages
+
+def test_clean_pages_are_not_rotated():
+    """Straight pages, whatever their layout, and pages without text lines keep their orientation"""
+    from image_preprocessing import AdaptivePreprocessor
+
+    letter = np.full((1100, 850), 255, dtype=np.uint8)
+    for i, line in enumerate(["ACME Corp", "12 Main Street", "Springfield"]):
+        cv2.putText(letter, line, (80, 100 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 0, 2)
+    cv2.putText(letter, "March 3, 2024", (600, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, 0, 2)
+    for i in range(10):
+        cv2.putText(letter, "body text of the letter" + " more" * (i % 5), (80, 300 + i * 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, 0, 2)
+
+    heading = np.full((1100, 850), 255, dtype=np.uint8)
+    cv2.putText(heading, "QUARTERLY REPORT", (120, 150), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 4)
+    cv2.putText(heading, "J. Smith", (550, 950), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+
+    speckle = np.random.default_rng(0).integers(0, 256, (600, 400)).astype(np.uint8)
+
+    preprocessor = AdaptivePreprocessor()
+    for page in (_text_page(), letter, heading, speckle):
+        result = preprocessor.run(page)
+        assert "deskew" not in result.stages
+        assert abs(result.skew_angle) <= preprocessor.skew_threshold
+
+def test_unreachable_reference_reports_transport_unavailable():
+    """Only a reference missing on this host tells the caller to upload instead"""
+    response = client.post("/ocr", data={"shm_name": "ocr_missing_block", "shape": "20,30"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "transport_unavailable"
+
+    response = client.post("/ocr", data={"shm_name": "ocr_missing_block", "shape": "20"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid shape: 20"
+
+def test_ocr_cache_lru_and_disk(tmp_path):
+    """Results are served from memory, then from disk once evicted"""
+    from ocr_cache import OCRResultCache, image_cache_key
+    from text_extraction import OCRResult
+
+    cache = OCRResultCache(max_entries=1, cache_dir=str(tmp_path))
+    first = image_cache_key(np.zeros((4, 4), np.uint8), "--psm 3")
+    second = image_cache_key(np.ones((4, 4), np.uint8), "--psm 3")
+    assert first != second
+    assert first != image_cache_key(np.zeros((4, 4), np.uint8), "--psm 6")
+
+    cache.set(first, OCRResult(text="cover sheet", confidence=90.0, processing_time=1.0))
+    cache.set(second, OCRResult(text="fax header", confidence=80.0, processing_time=1.0))
+    assert cache.get(second)["text"] == "fax header"
+    assert cache.get(first)["text"] == "cover sheet"
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["disk_hits"] == 1
+    assert stats["hit_rate"] == 2 / 3
+
+def test_merge_results_is_ordered_and_deterministic():
+    """Region-only sentences land after their neighbours; output is stable"""
+    from text_merge import merge_texts
+
+    tesseract_text = "Invoice 42. Total due: 100 EUR. Thank you."
+    regions = ["Payment within 30 days.", "invoice 42", "Total due: 100 EUR. Payment within 30 days."]
+    layout_info = [
+        {"bbox": [10, 300, 200, 320], "confidence": 0.9},
+        {"bbox": [10, 10, 200, 30], "confidence": 0.9},
+        {"bbox": [10, 200, 200, 220], "confidence": 0.9},
+    ]
+    bboxes = [d["bbox"] for d in layout_info]
+    merged = merge_texts(tesseract_text, regions, bboxes)
+    assert merged == "Invoice 42. Total due: 100 EUR. Payment within 30 days. Thank you."
+    assert merged == merge_texts(tesseract_text, regions, bboxes)
+
+def test_layout_words_do_not_repeat_text(ocr_processor, monkeypatch):
+    """Word-level layout regions add boxes, not text, and confidences share Tesseract's 0-100 scale"""
+    import text_extraction
+
+    class FakeLayout:
+        def process_image(self, image):
+            words = ["The", "contract", "is", "signed"]
+            return words, [{"bbox": [10 * i, 10, 10 * i + 8, 20], "confidence": 0.8} for i in range(len(words))]
+
+    text = "The contract is signed. Payment is due."
+    monkeypatch.setattr(text_extraction, "_layoutlm", FakeLayout())
+    monkeypatch.setattr(ocr_processor, "_run_tesseract", lambda img, refine, language: (text, 90.0, []))
+    result = ocr_processor._recognize(np.full((40, 60), 255, dtype=np.uint8), use_layout=True)
+    assert result.text == text
+    assert len(result.layout_info) == 4
+    assert result.confidence == pytest.approx(85.0)
+
+def test_tile_stitching_dedupes_overlap():
+    """Words seen whole in two overlapping tiles are kept once; cut words are dropped"""
+    from tiling import tile_grid, stitch_tile_words
+
+    tiles = tile_grid(1000, 7700, 4000, 300)
+    assert [t[0] for t in tiles] == [0, 3700]
+
+    word = {'text': 'drawing', 'left': 3750, 'top': 10, 'width': 100, 'height': 30, 'conf': 90.0}
+    cut = {'text': 'dra', 'left': 3960, 'top': 100, 'width': 40, 'height': 30, 'conf': 40.0}
+    words = stitch_tile_words([(tiles[0], [dict(word), cut]), (tiles[1], [dict(word)])], (1000, 7700))
+    assert [w['text'] for w in words] == ['drawing']
+
+def test_word_columns_and_confidence():
+    """Word arrays round-trip and -1 entries do not drag confidence down"""
+    from word_boxes import to_columns, from_columns, mean_confidence, low_confidence
+
+    words = [
+        {'text': 'Total', 'left': 0, 'top': 0, 'width': 50, 'height': 12, 'conf': 95.0},
+        {'text': '1OO', 'left': 60, 'top': 0, 'width': 30, 'height': 12, 'conf': 31.0},
+        {'text': 'EUR', 'left': 95, 'top': 0, 'width': 30, 'height': 12, 'conf': -1.0},
+    ]
+    columns = to_columns(words)
+    assert columns['conf'] == [95.0, 31.0, -1.0]
+    assert from_columns(columns) == words
+    assert mean_confidence(words) == 63.0
+    assert low_confidence(words, threshold=60, limit=10) == [1]
+
+def test_detect_text_language():
+    """Native text picks the minimal language pack; too little text defers to OCR"""
+    from language_detection import detect_text_language
+
+    assert detect_text_language("Der Vertrag ist nicht gültig, und die Parteien haben mit dem Gericht verhandelt.") == "deu"
+    assert detect_text_language("Le contrat est signé par les parties et la date est fixée dans une annexe.") == "fra"
+    assert detect_text_language("Договор подписан сторонами, оплата в течение тридцати дней.") == "rus"
+    assert detect_text_language("p. 3") is None
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_language_detection(tmp_path, monkeypatch, sample_image):
+    """Repeated "auto" pages are looked up before detection and keep the detected language"""
+    import text_extraction
+    from ocr_cache import OCRResultCache
+    from text_extraction import EnhancedOCRProcessor, OCRResult
+
+    detections = []
+    def resolve(language, img=None, text_hint=None):
+        detections.append(text_hint)
+        return "deu"
+    monkeypatch.setattr(text_extraction, "resolve_language", resolve)
+
+    processor = EnhancedOCRProcessor(cache=OCRResultCache(cache_dir=str(tmp_path)))
+    monkeypatch.setattr(processor, "_recognize", lambda img, use_layout, refine, language: OCRResult(
+        text="Vertrag", confidence=90.0, processing_time=0.0, metadata={"language": language}
+    ))
+
+    first = await processor.extract_text(sample_image, language="auto", text_hint="Der Vertrag")
+    again = await processor.extract_text(sample_image, language="auto", text_hint="Der Vertrag")
+    assert detections == ["Der Vertrag"]
+    assert again.metadata["cache_hit"] and again.metadata["language"] == first.metadata["language"] == "deu"
+
+    # A different hint can detect a different language, so it is a different entry
+    await processor.extract_text(sample_image, language="auto", text_hint="The contract")
+    assert detections == ["Der Vertrag", "The contract"]
+
+@pytest.mark.asyncio
+async def test_image_language_detection_overlaps_recognition(monkeypatch, sample_image):
+    """Without a usable hint, the page is read with the default pack while detection runs"""
+    import threading
+    import text_extraction
+    from text_extraction import EnhancedOCRProcessor, OCRResult
+
+    recognising = threading.Event()
+    overlapped = []
+    def resolve(language, img=None, text_hint=None):
+        overlapped.append(recognising.wait(timeout=5))
+        return detected
+    monkeypatch.setattr(text_extraction, "resolve_language", resolve)
+
+    processor = EnhancedOCRProcessor()
+    processor.cache = None
+    reads = []
+    def recognize(img, use_layout, refine, language):
+        reads.append(language)
+        recognising.set()
+        return OCRResult(text=language, confidence=90.0, processing_time=0.0)
+    monkeypatch.setattr(processor, "_recognize", recognize)
+
+    detected = "eng"
+    result = await processor.extract_text(sample_image, language="auto", text_hint="p. 3")
+    assert (reads, result.text, result.metadata["language"]) == (["eng"], "eng", "eng")
+
+    # When detection picks another pack, the page is read again with it
+    detected = "deu"
+    reads.clear()
+    result = await processor.extract_text(sample_image, language="auto")
+    assert (reads, result.text, result.metadata["language"]) == (["eng", "deu"], "deu", "deu")
+    assert overlapped == [True, True]
+
+@pytest.mark.asyncio
+async def test_admission_rejects_when_queue_full():
+    """Requests beyond the running and queued limits are rejected with a retry hint"""
+    import asyncio
+    from admission import AdmissionController, Overloaded
+
+    admission = AdmissionController(max_concurrency=1, max_queue=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with admission.admit() as ticket:
+            await release.wait()
+        return ticket
+
+    running = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert admission.stats()["running"] == 1
+    assert admission.stats()["queued"] == 1
+
+    with pytest.raises(Overloaded) as exc:
+        async with admission.admit():
+            pass
+    assert exc.value.retry_after >= 1
+
+    release.set()
+    first, second = await asyncio.gather(running, queued)
+    assert second.queue_time >= first.queue_time
+    assert admission.stats()["running"] == 0
+
+@pytest.mark.asyncio
+async def test_ocr_endpoint_rejects_overflow_while_busy(monkeypatch, sample_image):
+    """OCR runs off the event loop, so requests arriving meanwhile are queued or get 503"""
+    import asyncio
+    import time
+    import httpx
+    import main
+    from admission import AdmissionController
+    from text_extraction import OCRResult
+
+    def blocking_recognize(img, use_layout, refine=False, language="eng"):
+        time.sleep(0.5)
+        return OCRResult(text="Test OCR", confidence=90.0, processing_time=0.0)
+
+    monkeypatch.setattr(main.ocr_processor, "_recognize", blocking_recognize)
+    monkeypatch.setattr(main.ocr_processor, "cache", None)
+    monkeypatch.setattr(main, "admission", AdmissionController(max_concurrency=1, max_queue=1))
+
+    png = cv2.imencode(".png", sample_image)[1].tobytes()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://ocr") as http:
+        responses = await asyncio.gather(*[
+            http.post("/ocr", files={"file": ("page.png", png, "image/png")}) for _ in range(4)
+        ])
+
+    assert sorted(r.status_code for r in responses) == [200, 200, 503, 503]
+    assert all(r.headers["Retry-After"] for r in responses if r.status_code == 503)
+
+def _ocr_worker(handler):
+    # Imported through the pipelines package stubbed in conftest.py
+    from pipelines.src.parallel_processing.ocr_worker import OCRWorker
+    import httpx
+
+    worker = OCRWorker(ocr_service_url="http://ocr")
+    worker.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return worker
+
+@pytest.mark.asyncio
+async def test_ocr_worker_pools_one_client_for_its_lifetime():
+    """The pooled client opens on entry or first use and is reused until closed"""
+    from pipelines.src.parallel_processing.ocr_worker import OCRWorker
+
+    async with OCRWorker(ocr_service_url="http://ocr", max_connections=4) as worker:
+        client = worker.client
+        assert client is not None and not client.is_closed
+        assert await worker._get_client() is client
+    assert worker.client is None and client.is_closed
+
+    # A worker used without the context manager opens the client lazily
+    lazy = OCRWorker(ocr_service_url="http://ocr")
+    assert lazy.client is None
+    assert await lazy._get_client() is await lazy._get_client()
+    await lazy.close()
+
+@pytest.mark.asyncio
+async def test_ocr_worker_fans_out_when_batch_route_missing(tmp_path):
+    """A missing batch route sends pages one by one, each as an upload"""
+    import re
+    import httpx
+    document = tmp_path / "scan.pdf"
+    document.write_bytes(b"%PDF-1.4")
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/process_batch":
+            return httpx.Response(404, json={"detail": "Not Found"})
+        # PDFs are never sent as path references, which /ocr reads as images
+        body = request.content
+        assert b'filename="document.pdf"' in body and b'name="path"' not in body
+        page = re.search(rb'name="page"\r\n\r\n(\d+)', body).group(1).decode()
+        return httpx.Response(200, json={"text": f"page {page}", "confidence": 0.9})
+
+    worker = _ocr_worker(handler)
+    results = await worker.process_document(document, [1, 2, 3])
+    assert {n: r.content for n, r in results.items()} == {1: "page 1", 2: "page 2", 3: "page 3"}
+    assert not worker._batch_available
+
+    await worker.process_document(document, [4])
+    assert calls.count("/process_batch") == 1
+
+@pytest.mark.asyncio
+async def test_ocr_worker_only_fans_out_on_a_missing_route(tmp_path):
+    """A 404 from the batch route itself is an error, not a reason to fan out"""
+    import httpx
+    document = tmp_path / "scan.pdf"
+    document.write_bytes(b"%PDF-1.4")
+
+    worker = _ocr_worker(lambda request: httpx.Response(200, json={"1": {"text": "uploaded"}}))
+    assert (await worker.process_document(document, [1]))[1].content == "uploaded"
+
+    rejected = _ocr_worker(lambda request: httpx.Response(404, json={"detail": "Page 9 not in document"}))
+    with pytest.raises(Exception, match="Page 9"):
+        await rejected.process_document(document, [9])
+    assert rejected._batch_available
+
+def test_layout_word_regions_from_token_logits():
+    """Per-token logits from any backend become scored word boxes in image pixels"""
+    from layout_inference import word_regions
+
+    words = ["Invoice", "total", "due"]
+    boxes = [[100, 50, 300, 80], [100, 100, 200, 130], [500, 900, 600, 950]]
+    # <s> In##voice total due </s>: sub-word and special tokens are not words of their own
+    word_ids = [None, 0, 0, 1, 2, None]
+    logits = np.array([
+        [0.0, 9.0], [-3.0, 3.0], [3.0, -3.0], [4.0, -4.0], [0.0, 2.0], [0.0, 9.0]
+    ])
+
+    regions = word_regions(logits, word_ids, words, boxes, image_size=(850, 1100))
+    assert [word for word, _, _ in regions] == ["Invoice", "due"]
+    assert regions[0][1] == [85.0, 55.0, 255.0, 88.0]
+    assert regions[0][2] == pytest.approx(1 / (1 + np.exp(-6.0)))
+    assert word_regions(logits, word_ids, words, boxes, (850, 1100), min_score=0.95) == [regions[0]]
+
+def test_model_store_weights_are_memory_mapped(tmp_path):
+    """Stored weights load as read-only views of the file, not copies"""
+    torch = pytest.importorskip("torch")
+    safetensors_torch = pytest.importorskip("safetensors.torch")
+    from model_store import mmap_state_dict, assign_weights, empty_parameters
+
+    class Model(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(4, 2)
+            # Not saved with the weights, like LayoutLM's position ids
+            self.register_buffer("offset", torch.ones(2), persistent=False)
+
+        def forward(self, x):
+            return self.linear(x) + self.offset
+
+    model = Model()
+    path = tmp_path / "model.safetensors"
+    safetensors_torch.save_file(model.state_dict(), str(path))
+
+    state = mmap_state_dict(path)
+    assert torch.equal(state["linear.weight"], model.linear.weight.detach())
+
+    with empty_parameters():
+        fresh = Model()
+    assert fresh.linear.weight.is_meta and not fresh.offset.is_meta
+    assign_weights(fresh, state)
+    assert fresh.linear.weight.data_ptr() == state["linear.weight"].data_ptr()
+    assert torch.equal(fresh(torch.ones(1, 4)), model(torch.ones(1, 4)))
+
+    with empty_parameters():
+        partial = Model()
+    with pytest.raises(ValueError, match="linear.bias"):
+        assign_weights(partial, {"linear.weight": state["linear.weight"]})
+
+def test_ocr_error_rates():
+    """CER/WER are edit distances normalised by the ground truth length"""
+    from src.quality_metrics.ocr_quality import edit_distance, character_error_rate, word_error_rate
+
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("", "abc") == 3
+    assert character_error_rate("total due", "total  due\n") == 0.0
+    assert character_error_rate("abcd", "abxd") == 0.25
+    assert word_error_rate("the invoice total", "the invoce total") == pytest.approx(1 / 3)
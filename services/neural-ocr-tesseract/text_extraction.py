@@ -1,15 +1,36 @@
 # text_extraction.py
+import os
 import pytesseract
 import cv2
 import time
-import torch
-from transformers import LayoutLMv3Processor, LayoutLMv3ForSequenceClassification
+import asyncio
+import threading
 from PIL import Image
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
+from image_preprocessing import AdaptivePreprocessor
+from ocr_cache import OCRResultCache, OCR_CACHE_ENABLED, image_cache_key
+from text_merge import reading_order
+from tiling import (
+    OCR_TILE_THRESHOLD, OCR_TILE_SIZE, OCR_TILE_OVERLAP, OCR_TILE_WORKERS,
+    tile_grid, stitch_tile_words
+)
+from language_detection import OCR_DEFAULT_LANGUAGE, AUTO_LANGUAGE, needs_image_detection, resolve_language
+from model_store import load_layoutlm, local_model_dir
+from layout_inference import OCR_LAYOUT_BACKEND, build_layout_model, word_regions
+from word_boxes import (
+    OCR_RETRY_CONFIDENCE, OCR_RETRY_PSM, OCR_RETRY_SCALE, OCR_RETRY_MAX_WORDS,
+    to_columns, mean_confidence, low_confidence
+)
+
+# A token-classification checkpoint; the base model's classification head is untrained
+LAYOUTLM_MODEL_NAME = os.getenv("OCR_LAYOUT_MODEL", "microsoft/layoutlmv3-base")
+
+_layoutlm: Optional["LayoutLMProcessor"] = None
+_layoutlm_lock = threading.Lock()
 
 @dataclass
 class OCRResult:
@@ -17,92 +38,286 @@ class OCRResult:
     confidence: float
     processing_time: float
     layout_info: Optional[List[Dict]] = None
+    metadata: Dict = field(default_factory=dict)
+    # Per-word boxes and confidences in column form, see word_boxes.to_columns
+    words: Optional[Dict[str, List]] = None
 
 class LayoutLMProcessor:
-    def __init__(self, model_name: str = "microsoft/layoutlmv3-base"):
+    def __init__(self, model_name: str = LAYOUTLM_MODEL_NAME, backend: str = OCR_LAYOUT_BACKEND):
+        # torch/transformers are imported here so Tesseract-only workers never pay for them
+        import torch
+        from transformers import LayoutLMv3Processor, LayoutLMv3ForTokenClassification
+
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.processor = LayoutLMv3Processor.from_pretrained(model_name)
-        self.model = LayoutLMv3ForSequenceClassification.from_pretrained(model_name).to(self.device)
+        # Pre-exported weights are memory-mapped and shared with other workers on the node
+        stored = load_layoutlm(model_name)
+        if stored is not None:
+            self.processor, model = stored
+            self.source = "store"
+        else:
+            self.processor = LayoutLMv3Processor.from_pretrained(model_name)
+            model = LayoutLMv3ForTokenClassification.from_pretrained(model_name)
+            self.source = "hub"
+        model, self.backend = build_layout_model(model, local_model_dir(model_name), self.device, backend)
+        self.model = model.to(self.device)
         self.logger = logging.getLogger(__name__)
 
+    def encode(self, image: Image.Image) -> Tuple[Dict, List[Optional[int]], List[str], List[List[int]]]:
+        """
+        Model inputs for a page, plus the words and 0-1000 boxes found by the
+        processor's OCR and the word each token belongs to.
+        """
+        features = self.processor.image_processor(image.convert("RGB"), return_tensors="pt")
+        words, boxes = features["words"][0], features["boxes"][0]
+        encoding = self.processor.tokenizer(words, boxes=boxes, truncation=True, return_tensors="pt")
+        inputs = {**encoding, "pixel_values": features["pixel_values"]}
+        return inputs, encoding.word_ids(0), words, boxes
+
     def process_image(self, image: Image.Image) -> Tuple[List[str], List[Dict]]:
-        encoding = self.processor(image, return_tensors="pt", truncation=True)
-        encoding = {k: v.to(self.device) for k, v in encoding.items()}
+        """Words the layout model labels confidently, with their pixel boxes and scores."""
+        inputs, word_ids, words, boxes = self.encode(image)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
         
+        import torch
         with torch.no_grad():
-            outputs = self.model(**encoding)
+            outputs = self.model(**inputs)
         
         text_boxes = []
         layout_info = []
         
-        for box, score in zip(outputs.bboxes[0], outputs.scores[0]):
-            if score > 0.5:
-                x1, y1, x2, y2 = box.tolist()
-                text_boxes.append(pytesseract.image_to_string(
-                    image.crop((x1, y1, x2, y2))
-                ))
-                layout_info.append({
-                    "bbox": [x1, y1, x2, y2],
-                    "confidence": float(score)
-                })
+        logits = outputs.logits[0].float().cpu().numpy()
+        for word, bbox, score in word_regions(logits, word_ids, words, boxes, image.size):
+            text_boxes.append(word)
+            layout_info.append({
+                "bbox": bbox,
+                "confidence": score
+            })
         
         return text_boxes, layout_info
 
+def get_layoutlm_processor() -> LayoutLMProcessor:
+    """Return the process-wide LayoutLM processor, loading it on first use."""
+    global _layoutlm
+    if _layoutlm is None:
+        with _layoutlm_lock:
+            if _layoutlm is None:
+                start_time = time.time()
+                _layoutlm = LayoutLMProcessor()
+                logging.getLogger(__name__).info(
+                    f"Loaded LayoutLM model ({_layoutlm.backend}) from {_layoutlm.source} in {time.time() - start_time:.2f}s"
+                )
+    return _layoutlm
+
+def layoutlm_loaded() -> bool:
+    return _layoutlm is not None
+
 class EnhancedOCRProcessor:
-    def __init__(self):
+    def __init__(self, cache: Optional[OCRResultCache] = None, language: str = OCR_DEFAULT_LANGUAGE):
         self.tesseract_config = "--oem 1 --psm 3"
-        self.layoutlm = LayoutLMProcessor()
+        self.language = language
+        self.preprocessor = AdaptivePreprocessor()
+        self.cache = cache if cache is not None else (OCRResultCache() if OCR_CACHE_ENABLED else None)
         self.executor = ThreadPoolExecutor(max_workers=2)
+        self.tile_threshold = OCR_TILE_THRESHOLD
+        self.tile_size = OCR_TILE_SIZE
+        self.tile_overlap = OCR_TILE_OVERLAP
+        self.tile_executor = ThreadPoolExecutor(max_workers=OCR_TILE_WORKERS)
+        self.retry_confidence = OCR_RETRY_CONFIDENCE
+        self.retry_psm = OCR_RETRY_PSM
+        self.retry_scale = OCR_RETRY_SCALE
+        self.retry_max_words = OCR_RETRY_MAX_WORDS
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def layoutlm(self) -> LayoutLMProcessor:
+        return get_layoutlm_processor()
 
     async def preprocess_image(self, img: np.ndarray) -> np.ndarray:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        denoised = cv2.fastNlMeansDenoising(gray)
-        _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        return binary
+        return (await asyncio.to_thread(self.preprocessor.run, img)).image
+
+    async def extract_text(self, img: np.ndarray, use_layout: bool = False, refine: bool = False,
+                           language: Optional[str] = None, text_hint: Optional[str] = None) -> OCRResult:
+        """
+        `language` is a Tesseract pack such as "deu" or "eng+fra", or "auto" to
+        detect it from `text_hint` (the page's native text layer) or the image.
+
+        Preprocessing, detection, the cache and recognition all block, so they
+        run in a worker thread and the event loop keeps admitting requests.
+        """
+        return await asyncio.to_thread(
+            self._extract_text, img, use_layout, refine, language, text_hint
+        )
 
-    async def extract_text(self, img: np.ndarray) -> OCRResult:
+    def _extract_text(self, img: np.ndarray, use_layout: bool, refine: bool,
+                      language: Optional[str], text_hint: Optional[str]) -> OCRResult:
         start_time = time.time()
         
-        # Parallel processing for both OCR engines
-        processed_img = await self.preprocess_image(img)
-        pil_image = Image.fromarray(processed_img)
+        preprocessed = self.preprocessor.run(img)
+        processed_img = preprocessed.image
+        requested = language or self.language
+        metadata = {
+            "preprocessing": preprocessed.to_metadata(),
+            "cache_hit": False,
+            "tiled": max(processed_img.shape[:2]) > self.tile_threshold
+        }
+        
+        cache_key = None
+        if self.cache is not None:
+            # Keyed on the requested language, and for "auto" the hint it is
+            # detected from, so a hit skips detection as well as recognition
+            cache_key = image_cache_key(
+                processed_img, self.tesseract_config, requested,
+                text_hint if requested == AUTO_LANGUAGE else None,
+                (LAYOUTLM_MODEL_NAME, OCR_LAYOUT_BACKEND) if use_layout else None,
+                (self.tile_size, self.tile_overlap) if metadata["tiled"] else None,
+                (self.retry_confidence, self.retry_psm, self.retry_scale, self.retry_max_words) if refine else None
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                result = OCRResult(**cached)
+                result.processing_time = time.time() - start_time
+                result.metadata = {
+                    **metadata,
+                    "language": cached["metadata"].get("language", requested),
+                    "cache_hit": True
+                }
+                return result
+        
+        if needs_image_detection(requested, text_hint):
+            # OSD and the probe read run on the executor while the page is read
+            # with the default pack; it is only read again if another pack wins
+            detection = self.executor.submit(resolve_language, requested, processed_img, text_hint)
+            result = self._recognize(processed_img, use_layout, refine, OCR_DEFAULT_LANGUAGE)
+            language = detection.result()
+            if language != OCR_DEFAULT_LANGUAGE:
+                result = self._recognize(processed_img, use_layout, refine, language)
+        else:
+            language = resolve_language(requested, processed_img, text_hint)
+            result = self._recognize(processed_img, use_layout, refine, language)
+        metadata["language"] = language
+        result.processing_time = time.time() - start_time
+        result.metadata = {**metadata, **result.metadata}
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return result
+
+    def _recognize(self, processed_img: np.ndarray, use_layout: bool, refine: bool = False,
+                   language: str = OCR_DEFAULT_LANGUAGE) -> OCRResult:
+        if not use_layout:
+            tesseract_text, tesseract_conf, words = self.executor.submit(
+                self._run_tesseract, processed_img, refine, language
+            ).result()
+            return OCRResult(
+                text=tesseract_text,
+                confidence=tesseract_conf,
+                processing_time=0.0,
+                metadata=self._word_metadata(words, refine),
+                words=to_columns(words)
+            )
         
         # Run Tesseract and LayoutLM in parallel
-        tesseract_future = self.executor.submit(self._run_tesseract, processed_img)
-        layoutlm_future = self.executor.submit(self.layoutlm.process_image, pil_image)
+        pil_image = Image.fromarray(processed_img)
+        tesseract_future = self.executor.submit(self._run_tesseract, processed_img, refine, language)
+        layoutlm_future = self.executor.submit(
+            lambda: self.layoutlm.process_image(pil_image)
+        )
         
         # Get results
-        tesseract_text, tesseract_conf = tesseract_future.result()
-        layoutlm_boxes, layout_info = layoutlm_future.result()
-        
-        # Merge results
-        combined_text = self._merge_results(tesseract_text, layoutlm_boxes)
-        combined_conf = (tesseract_conf + sum(d['confidence'] for d in layout_info)) / (1 + len(layout_info))
+        tesseract_text, tesseract_conf, words = tesseract_future.result()
+        _, layout_info = layoutlm_future.result()
         
-        processing_time = time.time() - start_time
+        # The layout model labels words its processor's own OCR read, so it adds
+        # boxes and scores but no text; the text stays Tesseract's
+        combined_conf = tesseract_conf
+        if layout_info:
+            # Tesseract reports 0-100, the layout model 0-1 probabilities
+            layout_conf = 100 * sum(d['confidence'] for d in layout_info) / len(layout_info)
+            combined_conf = (tesseract_conf + layout_conf) / 2
         
         return OCRResult(
-            text=combined_text,
+            text=tesseract_text,
             confidence=combined_conf,
-            processing_time=processing_time,
-            layout_info=layout_info
+            processing_time=0.0,
+            layout_info=layout_info,
+            metadata=self._word_metadata(words, refine),
+            words=to_columns(words)
         )
 
-    def _run_tesseract(self, img: np.ndarray) -> Tuple[str, float]:
-        data = pytesseract.image_to_data(img, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
-        text = " ".join([word for word in data['text'] if word.strip()])
-        conf = sum(data['conf']) / len(data['conf']) if len(data['conf']) > 0 else 0.0
-        return text, conf
+    def _word_metadata(self, words: List[Dict], refine: bool) -> Dict:
+        metadata = {"word_count": len(words)}
+        if refine:
+            metadata["refined_words"] = sum(1 for word in words if word.get('refined'))
+        return metadata
 
-    def _merge_results(self, tesseract_text: str, layoutlm_boxes: List[str]) -> str:
-        """Merge results from both OCR engines with basic deduplication"""
-        all_text = [tesseract_text] + layoutlm_boxes
-        unique_text = set()
-        
-        for text in all_text:
-            for sentence in text.split('.'):
-                sentence = sentence.strip()
-                if sentence:
-                    unique_text.add(sentence)
+    def _run_tesseract(self, img: np.ndarray, refine: bool = False,
+                       language: str = OCR_DEFAULT_LANGUAGE) -> Tuple[str, float, List[Dict]]:
+        if max(img.shape[:2]) > self.tile_threshold:
+            words = self._tesseract_words_tiled(img, language)
+        else:
+            words = self._tesseract_words(img, language=language)
+        if refine:
+            words = self._refine_low_confidence(img, words, language)
+        text = " ".join(word['text'] for word in words)
+        return text, mean_confidence(words), words
+
+    def _tesseract_words(self, img: np.ndarray, x: int = 0, y: int = 0,
+                         config: Optional[str] = None, language: str = OCR_DEFAULT_LANGUAGE) -> List[Dict]:
+        """Recognised words with boxes offset into page coordinates"""
+        data = pytesseract.image_to_data(
+            img, lang=language, config=config or self.tesseract_config, output_type=pytesseract.Output.DICT
+        )
+        return [
+            {'text': text, 'left': left + x, 'top': top + y, 'width': width, 'height': height, 'conf': float(conf)}
+            for text, left, top, width, height, conf in zip(
+                data['text'], data['left'], data['top'], data['width'], data['height'], data['conf']
+            )
+            if text.strip()
+        ]
+
+    def _tesseract_words_tiled(self, img: np.ndarray, language: str = OCR_DEFAULT_LANGUAGE) -> List[Dict]:
+        """OCR overlapping tiles in parallel and stitch the words back together in reading order"""
+        tiles = tile_grid(img.shape[0], img.shape[1], self.tile_size, self.tile_overlap)
+        futures = [
+            (tile, self.tile_executor.submit(
+                self._tesseract_words, img[tile[1]:tile[1] + tile[3], tile[0]:tile[0] + tile[2]],
+                tile[0], tile[1], language=language
+            ))
+            for tile in tiles
+        ]
+        words = stitch_tile_words([(tile, future.result()) for tile, future in futures], img.shape)
         
-        return '. '.join(unique_text)
\ No newline at end of file
+        order = reading_order([
+            [w['left'], w['top'], w['left'] + w['width'], w['top'] + w['height']] for w in words
+        ])
+        self.logger.debug(f"Tiled OCR: {len(tiles)} tiles, {len(words)} words")
+        return [words[i] for i in order]
+
+    def _refine_low_confidence(self, img: np.ndarray, words: List[Dict],
+                               language: str = OCR_DEFAULT_LANGUAGE) -> List[Dict]:
+        """Re-OCR only the low-confidence words, keeping a new reading when it is more confident"""
+        targets = low_confidence(words, self.retry_confidence, self.retry_max_words)
+        futures = [(i, self.tile_executor.submit(self._reocr_word, img, words[i], language)) for i in targets]
+        refined = list(words)
+        for i, future in futures:
+            candidate = future.result()
+            if candidate is not None and candidate['conf'] > words[i]['conf']:
+                refined[i] = candidate
+        return refined
+
+    def _reocr_word(self, img: np.ndarray, word: Dict, language: str = OCR_DEFAULT_LANGUAGE) -> Optional[Dict]:
+        pad = max(4, word['height'] // 4)
+        top, left = max(0, word['top'] - pad), max(0, word['left'] - pad)
+        crop = img[top:word['top'] + word['height'] + pad, left:word['left'] + word['width'] + pad]
+        if crop.size == 0:
+            return None
+        crop = cv2.resize(crop, None, fx=self.retry_scale, fy=self.retry_scale, interpolation=cv2.INTER_CUBIC)
+        candidates = self._tesseract_words(crop, config=f"--oem 1 --psm {self.retry_psm}", language=language)
+        if not candidates:
+            return None
+        return {
+            **word,
+            'text': " ".join(c['text'] for c in candidates),
+            'conf': mean_confidence(candidates),
+            'refined': True
+        }
@@ -0,0 +1,83 @@
+# text_merge.py
+import re
+import hashlib
+from typing import Dict, List, Optional, Sequence
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+def sentence_fingerprint(sentence: str) -> Optional[bytes]:
+    """
+    Stable fingerprint that ignores case, spacing and punctuation. Uses blake2b
+    rather than hash() so it is identical across processes and runs.
+    """
+    normalized = _NON_WORD.sub(" ", sentence.lower()).strip()
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
+def reading_order(bboxes: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Indices of [x1, y1, x2, y2] boxes in reading order: top to bottom by line,
+    left to right within a line. Boxes whose vertical centre falls inside the
+    current line's band are treated as the same line.
+    """
+    by_top = sorted(range(len(bboxes)), key=lambda i: (bboxes[i][1], bboxes[i][0]))
+    order: List[int] = []
+    line: List[int] = []
+    line_bottom = None
+    for i in by_top:
+        x1, y1, x2, y2 = bboxes[i][:4]
+        centre = (y1 + y2) / 2
+        if line and centre > line_bottom:
+            order.extend(sorted(line, key=lambda j: bboxes[j][0]))
+            line = []
+        if not line:
+            line_bottom = y2
+        line.append(i)
+    order.extend(sorted(line, key=lambda j: bboxes[j][0]))
+    return order
+
+def merge_texts(primary_text: str,
+                region_texts: Sequence[str],
+                region_bboxes: Optional[Sequence[Sequence[float]]] = None) -> str:
+    """
+    Merge region texts into the primary (full-page) text in one pass.
+
+    The primary sentences keep their order. Region sentences that already occur
+    in it only move the insertion point; new ones are inserted after the last
+    matched sentence, so text found only by the region engine lands where it
+    appears on the page. Regions are visited in bounding-box reading order when
+    boxes are given. The output is deterministic for the same inputs.
+    """
+    primary = split_sentences(primary_text)
+    position: Dict[bytes, int] = {}
+    for i, sentence in enumerate(primary):
+        fp = sentence_fingerprint(sentence)
+        if fp is not None:
+            position.setdefault(fp, i)
+    seen = set(position)
+
+    # inserts[i + 1] holds new sentences that follow primary sentence i
+    inserts: List[List[str]] = [[] for _ in range(len(primary) + 1)]
+    order = reading_order(region_bboxes) if region_bboxes else range(len(region_texts))
+    anchor = -1
+    for region in order:
+        for sentence in split_sentences(region_texts[region]):
+            fp = sentence_fingerprint(sentence)
+            if fp is None:
+                continue
+            if fp in position:
+                anchor = position[fp]
+            elif fp not in seen:
+                seen.add(fp)
+                inserts[anchor + 1].append(sentence)
+
+    merged = list(inserts[0])
+    for i, sentence in enumerate(primary):
+        merged.append(sentence)
+        merged.extend(inserts[i + 1])
+    return " ".join(merged)
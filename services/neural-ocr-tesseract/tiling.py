@@ -0,0 +1,75 @@
+# tiling.py
+import os
+from typing import Dict, List, Tuple
+
+# Rasters whose longest side exceeds this many pixels are OCRed in tiles
+OCR_TILE_THRESHOLD = int(os.getenv("OCR_TILE_THRESHOLD", "8000"))
+OCR_TILE_SIZE = int(os.getenv("OCR_TILE_SIZE", "4000"))
+# Must exceed the widest word and tallest text line so each word is whole in some tile
+OCR_TILE_OVERLAP = int(os.getenv("OCR_TILE_OVERLAP", "300"))
+OCR_TILE_WORKERS = int(os.getenv("OCR_TILE_WORKERS", str(os.cpu_count() or 2)))
+
+# A word this close to an interior tile edge is treated as cut off
+_EDGE_MARGIN = 2
+
+def tile_grid(height: int, width: int, tile_size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """(x, y, w, h) tiles covering the image, neighbours overlapping by `overlap` pixels."""
+    step = max(1, tile_size - overlap)
+
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (x, y, min(tile_size, width - x), min(tile_size, height - y))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+def _iou(a: Dict, b: Dict) -> float:
+    ix = max(0, min(a['left'] + a['width'], b['left'] + b['width']) - max(a['left'], b['left']))
+    iy = max(0, min(a['top'] + a['height'], b['top'] + b['height']) - max(a['top'], b['top']))
+    inter = ix * iy
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union else 0.0
+
+def stitch_tile_words(tile_words: List[Tuple[Tuple[int, int, int, int], List[Dict]]],
+                      image_shape: Tuple[int, int],
+                      cell_size: int = 256) -> List[Dict]:
+    """
+    Combine per-tile words (boxes already in page coordinates) into one list.
+
+    Words touching an interior tile edge are dropped because they were cut; the
+    overlapping neighbour sees them whole. Words read in two overlapping tiles
+    are deduplicated by box overlap, using a coarse grid so each word is only
+    compared with its spatial neighbours.
+    """
+    height, width = image_shape[:2]
+    grid: Dict[Tuple[int, int], List[Dict]] = {}
+    kept: List[Dict] = []
+
+    for (x, y, w, h), words in tile_words:
+        for word in words:
+            left, top = word['left'], word['top']
+            right, bottom = left + word['width'], top + word['height']
+            if ((x > 0 and left <= x + _EDGE_MARGIN) or
+                    (y > 0 and top <= y + _EDGE_MARGIN) or
+                    (x + w < width and right >= x + w - _EDGE_MARGIN) or
+                    (y + h < height and bottom >= y + h - _EDGE_MARGIN)):
+                continue
+
+            cells = [
+                (cx, cy)
+                for cx in range(left // cell_size, right // cell_size + 1)
+                for cy in range(top // cell_size, bottom // cell_size + 1)
+            ]
+            if any(_iou(word, other) > 0.5 for cell in cells for other in grid.get(cell, ())):
+                continue
+            kept.append(word)
+            for cell in cells:
+                grid.setdefault(cell, []).append(word)
+
+    return kept
@@ -0,0 +1,35 @@
+# word_boxes.py
+import os
+from typing import Dict, List
+
+# Words below this Tesseract confidence (0-100) are re-OCRed in the refine pass
+OCR_RETRY_CONFIDENCE = float(os.getenv("OCR_RETRY_CONFIDENCE", "60"))
+# Page segmentation mode for the re-OCR pass; 8 treats the crop as a single word
+OCR_RETRY_PSM = int(os.getenv("OCR_RETRY_PSM", "8"))
+# Upscale factor for word crops, equivalent to re-rendering at a higher DPI
+OCR_RETRY_SCALE = float(os.getenv("OCR_RETRY_SCALE", "2.0"))
+OCR_RETRY_MAX_WORDS = int(os.getenv("OCR_RETRY_MAX_WORDS", "100"))
+
+WORD_FIELDS = ("text", "left", "top", "width", "height", "conf")
+
+def to_columns(words: List[Dict]) -> Dict[str, List]:
+    """
+    Column-oriented form of a word list: one array per field instead of one
+    object per word, which roughly halves the JSON size and maps directly onto
+    numpy arrays for callers that need to filter by box or confidence.
+    """
+    return {name: [word[name] for word in words] for name in WORD_FIELDS}
+
+def from_columns(columns: Dict[str, List]) -> List[Dict]:
+    return [dict(zip(WORD_FIELDS, values)) for values in zip(*(columns[name] for name in WORD_FIELDS))]
+
+def mean_confidence(words: List[Dict]) -> float:
+    """Mean word confidence, ignoring Tesseract's -1 entries for non-word rows."""
+    confs = [word['conf'] for word in words if word['conf'] >= 0]
+    return sum(confs) / len(confs) if confs else 0.0
+
+def low_confidence(words: List[Dict], threshold: float, limit: int) -> List[int]:
+    """Indices of the least confident words below the threshold, at most `limit`."""
+    candidates = [i for i, word in enumerate(words) if 0 <= word['conf'] < threshold]
+    candidates.sort(key=lambda i: words[i]['conf'])
+    return sorted(candidates[:limit])
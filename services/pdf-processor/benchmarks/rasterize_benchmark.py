@@ -0,0 +1,103 @@
+# benchmarks/rasterize_benchmark.py
+"""
+Measures how fast scanned pages are rendered for OCR:
+
+  sequential - every page at the target DPI, RGB, in this process (the old path)
+  pool       - PageRasterizer with N workers, grayscale, DPI capped at the scan resolution
+
+The synthetic document mixes 300 DPI and 150 DPI scans so the downsampling
+path is exercised.
+
+    python benchmarks/rasterize_benchmark.py --pages 100 --workers 1,2,4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from rasterizer import PageRasterizer
+
+def _scan_image(dpi: int, seed: int) -> bytes:
+    # US Letter at the given scan resolution
+    width, height = int(8.5 * dpi), int(11 * dpi)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    step = max(1, dpi // 6)
+    for y in range(dpi // 2, height - dpi // 2, step):
+        draw.text((dpi // 2, y), f"Scanned line {y} of page {seed} at {dpi} dpi", fill=0)
+    out = tempfile.SpooledTemporaryFile()
+    image.save(out, format="PNG")
+    out.seek(0)
+    return out.read()
+
+def _build_document(path: str, pages: int, high_dpi_ratio: float):
+    scans = {300: _scan_image(300, 0), 150: _scan_image(150, 1)}
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=612, height=792)
+        dpi = 300 if i < pages * high_dpi_ratio else 150
+        page.insert_image(page.rect, stream=scans[dpi])
+    doc.save(path)
+
+def _sequential(path: str, dpi: int) -> float:
+    start = time.perf_counter()
+    with fitz.open(path) as doc:
+        for page in doc:
+            page.get_pixmap(dpi=dpi).samples
+    return time.perf_counter() - start
+
+async def _pool(path: str, pages: int, dpi: int, workers: int) -> dict:
+    rasterizer = PageRasterizer(dpi=dpi, max_workers=workers)
+    try:
+        # Warm the pool so process start-up is not counted
+        async for raster in rasterizer.rasterize(path, [0]):
+            raster.release()
+
+        start = time.perf_counter()
+        pixels = 0
+        async for raster in rasterizer.rasterize(path, list(range(pages))):
+            pixels += raster.width * raster.height
+            raster.release()
+        elapsed = time.perf_counter() - start
+    finally:
+        rasterizer.shutdown()
+    return {"workers": workers, "seconds": round(elapsed, 3),
+            "pages_per_sec": round(pages / elapsed, 2), "megapixels": round(pixels / 1e6, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Page rasterization benchmark")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}",
+                        help="Comma-separated worker counts to measure")
+    parser.add_argument("--high-dpi-ratio", type=float, default=0.5,
+                        help="Share of pages scanned at 300 DPI; the rest are 150 DPI")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scanned.pdf")
+        _build_document(path, args.pages, args.high_dpi_ratio)
+
+        sequential = _sequential(path, args.dpi)
+        results = {
+            "pages": args.pages,
+            "dpi": args.dpi,
+            "sequential": {"seconds": round(sequential, 3),
+                           "pages_per_sec": round(args.pages / sequential, 2)},
+            "pool": [
+                asyncio.run(_pool(path, args.pages, args.dpi, int(workers)))
+                for workers in args.workers.split(",")
+            ],
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Dict, Any
+import importlib.util
+import os
+from pydantic import BaseSettings, Field
+from functools import lru_cache
+
+def _load_project_settings():
+    """
+    Load the project-wide settings. They live in the repository's own
+    config/settings.py, which this module would shadow as `config.settings`,
+    so they are imported by path.
+    """
+    path = Path(__file__).resolve().parent.parent.parent.parent / "config" / "settings.py"
+    spec = importlib.util.spec_from_file_location("project_settings", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.settings
+
+project_settings = _load_project_settings()
+
+class PDFProcessorSettings(BaseSettings):
+    """PDF Processor service specific settings."""
+
+    # Service configuration
+    service_name: str = "pdf-processor"
+    host: str = Field(default="0.0.0.0", env="PDF_PROCESSOR_HOST")
+    port: int = Field(default=8003, env="PDF_PROCESSOR_PORT")
+    debug: bool = Field(default=False, env="DEBUG")
+
+    # Processing settings
+    max_file_size: int = Field(default=100 * 1024 * 1024)  # 100MB
+    chunk_size: int = Field(default=1000)
+    batch_size: int = Field(default=10)
+    processing_timeout: int = Field(default=300)
+
+    # OCR settings
+    enable_ocr: bool = True
+    ocr_confidence_threshold: float = 0.8
+    tesseract_language: str = "eng"
+
+    # PDF extraction settings
+    min_text_length: int = 50
+    extract_images: bool = True
+    image_quality: int = Field(default=300)  # DPI for image extraction
+    # Pages needing OCR are rendered in a process pool; scans coarser than
+    # image_quality are rendered at their own resolution, floored at this
+    rasterize_min_dpi: int = Field(default=150, env="RASTERIZE_MIN_DPI")
+    rasterize_workers: int = Field(default=os.cpu_count() or 1, env="RASTERIZE_WORKERS")
+    rasterize_chunk_size: int = Field(default=4, env="RASTERIZE_CHUNK_SIZE")
+    # Text pages with embedded scans keep their native text; only images
+    # covering at least this share of the page are OCRed
+    hybrid_ocr: bool = Field(default=True, env="HYBRID_OCR")
+    ocr_min_region_ratio: float = Field(default=0.02, env="OCR_MIN_REGION_RATIO")
+
+    # Storage paths
+    base_dir: Path = Path(__file__).parent.parent
+    data_dir: Path = base_dir / "data"
+    upload_dir: Path = data_dir / "uploads"
+    processed_dir: Path = data_dir / "processed"
+    failed_dir: Path = data_dir / "failed"
+    temp_dir: Path = data_dir / "temp"
+
+    # Cache settings
+    enable_cache: bool = True
+    cache_ttl: int = 3600  # 1 hour
+
+    # External services
+    ocr_service_url: str = Field(
+        default="http://ocr-tesseract:8004",
+        env="OCR_URL"
+    )
+    summarizer_service_url: str = Field(
+        default="http://transformers-summarizer:8005",
+        env="SUMMARIZER_URL"
+    )
+    # "auto" passes shared memory when the OCR service runs on the same host
+    # and falls back to multipart uploads once it reports it cannot reach it
+    ocr_transport: str = Field(default="auto", env="OCR_TRANSPORT")
+
+    class Config:
+        env_file = project_settings.base_dir / "config" / "environments" / f"{os.getenv('ENVIRONMENT', 'development')}.env"
+        env_file_encoding = 'utf-8'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._create_directories()
+        self._load_project_settings()
+
+    def _create_directories(self):
+        """Ensure all required directories exist."""
+        for path in [self.data_dir, self.upload_dir, self.processed_dir,
+                    self.failed_dir, self.temp_dir]:
+            path.mkdir(parents=True, exist_ok=True)
+
+    def _load_project_settings(self):
+        """Load and merge project-wide settings."""
+        pdf_settings = project_settings.pdf_processor_settings
+
+        # Update processing settings from project config
+        self.max_file_size = pdf_settings['processing']['max_file_size']
+        self.chunk_size = pdf_settings['processing']['chunk_size']
+        self.batch_size = pdf_settings['processing']['batch_size']
+        self.processing_timeout = pdf_settings['processing']['timeout']
+
+@lru_cache()
+def get_settings() -> PDFProcessorSettings:
+    """Creates cached instance of settings."""
+    return PDFProcessorSettings()
+
+# Modules import the project-wide settings as `settings` and build their own
+# PDFProcessorSettings
+settings = project_settings
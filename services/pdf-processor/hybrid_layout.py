@@ -0,0 +1,74 @@
+from typing import Dict, List, Sequence, Tuple
+import fitz  # PyMuPDF
+
+# (x0, y0, x1, y1) in PDF points
+BBox = Tuple[float, float, float, float]
+
+def _centre_inside(bbox: Sequence[float], region: fitz.Rect) -> bool:
+    return fitz.Point((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2) in region
+
+def find_ocr_regions(
+    page: fitz.Page,
+    min_area_ratio: float = 0.02,
+    max_text_chars: int = 20
+) -> List[BBox]:
+    """
+    Bounding boxes of images on the page that need OCR: large enough to hold
+    text and without a native text layer of their own. Searchable scans carry
+    invisible text over the image and are skipped.
+    """
+    page_area = abs(page.rect)
+    words = page.get_text("words")
+    regions: List[fitz.Rect] = []
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info['bbox']) & page.rect
+        if bbox.is_empty or abs(bbox) < page_area * min_area_ratio:
+            continue
+        if any(bbox in region for region in regions):
+            continue
+        covered = sum(len(w[4]) for w in words if _centre_inside(w[:4], bbox))
+        if covered > max_text_chars:
+            continue
+        regions.append(bbox)
+    return [tuple(region) for region in regions]
+
+def text_blocks(page: fitz.Page, exclude: Sequence[BBox] = ()) -> List[Dict]:
+    """Native text blocks with their bounding boxes, minus those inside `exclude`."""
+    excluded = [fitz.Rect(bbox) for bbox in exclude]
+    blocks = []
+    for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks"):
+        if block_type != 0 or not text.strip():
+            continue
+        if any(_centre_inside((x0, y0, x1, y1), region) for region in excluded):
+            continue
+        blocks.append({'bbox': (x0, y0, x1, y1), 'text': text.strip()})
+    return blocks
+
+def reading_order(bboxes: Sequence[Sequence[float]]) -> List[int]:
+    """
+    Indices of [x0, y0, x1, y1] boxes in reading order: top to bottom by line,
+    left to right within a line. The same ordering as the OCR service's
+    text_merge.reading_order, copied because the services share no code at
+    build time; tests/test_pdf_processor.py checks the two agree.
+    """
+    by_top = sorted(range(len(bboxes)), key=lambda i: (bboxes[i][1], bboxes[i][0]))
+    order: List[int] = []
+    line: List[int] = []
+    line_bottom = None
+    for i in by_top:
+        x0, y0, x1, y1 = bboxes[i][:4]
+        centre = (y0 + y1) / 2
+        if line and centre > line_bottom:
+            order.extend(sorted(line, key=lambda j: bboxes[j][0]))
+            line = []
+        if not line:
+            line_bottom = y1
+        line.append(i)
+    order.extend(sorted(line, key=lambda j: bboxes[j][0]))
+    return order
+
+def merge_regions(blocks: List[Dict], region_texts: Dict[BBox, str]) -> str:
+    """Native text blocks and OCRed region texts joined in reading order."""
+    items = [(block['bbox'], block['text']) for block in blocks]
+    items.extend((bbox, text.strip()) for bbox, text in region_texts.items() if text.strip())
+    return "\n\n".join(items[i][1] for i in reading_order([bbox for bbox, _ in items]))
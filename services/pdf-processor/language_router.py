@@ -0,0 +1,74 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Tesseract pack for each non-Latin script; Latin pages are told apart by stopwords.
+# The OCR service applies the same rules in its language_detection.py. Each
+# service is built from its own Docker context, so neither can import the
+# other's copy; tests/test_pdf_processor.py fails if the two disagree.
+SCRIPT_LANGUAGES = {
+    "CYRILLIC": "rus",
+    "ARABIC": "ara",
+    "GREEK": "ell",
+    "HEBREW": "heb",
+    "CJK": "chi_sim",
+    "HANGUL": "kor",
+    "HIRAGANA": "jpn",
+    "KATAKANA": "jpn",
+    "DEVANAGARI": "hin",
+    "THAI": "tha",
+}
+
+STOPWORDS = {
+    "eng": {"the", "and", "of", "to", "in", "is", "that", "for", "with", "this", "are", "on", "be", "by"},
+    "deu": {"der", "die", "und", "das", "ist", "nicht", "mit", "den", "von", "zu", "ein", "eine", "auf", "für"},
+    "fra": {"le", "la", "les", "et", "des", "est", "une", "du", "que", "pour", "dans", "pas", "sur", "au"},
+    "spa": {"el", "los", "las", "y", "que", "del", "es", "una", "por", "con", "para", "como", "su", "al"},
+}
+
+# Pages without enough native text are sent with this and detected by the OCR service
+AUTO_LANGUAGE = "auto"
+
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+def _script(char: str) -> Optional[str]:
+    try:
+        return unicodedata.name(char).split(" ", 1)[0]
+    except ValueError:
+        return None
+
+def detect_language(text: str, default: str = "eng", min_letters: int = 20) -> Optional[str]:
+    """
+    Detects the Tesseract language pack for a page from its native text layer.
+    Returns None when there is too little text to decide.
+    """
+    sample = text[:4000]
+    scripts = Counter(_script(c) for c in sample if c.isalpha())
+    if sum(scripts.values()) < min_letters:
+        return None
+
+    script = scripts.most_common(1)[0][0]
+    if script != "LATIN":
+        return SCRIPT_LANGUAGES.get(script, default)
+
+    words = [w.lower() for w in _WORD.findall(sample)]
+    scores = {lang: sum(1 for w in words if w in stopwords) for lang, stopwords in STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] >= 2 else default
+
+def group_pages_by_language(
+    extraction_result: Dict[int, dict],
+    page_numbers: List[int],
+    default: str = "eng"
+) -> Dict[str, List[int]]:
+    """
+    Groups OCR pages by language pack so each OCR batch loads only the pack it
+    needs, instead of running every page with a combined "eng+deu+fra" model.
+    """
+    groups: Dict[str, List[int]] = {}
+    for page_num in page_numbers:
+        text = extraction_result.get(page_num, {}).get('text', '')
+        language = detect_language(text, default) or AUTO_LANGUAGE
+        groups.setdefault(language, []).append(page_num)
+    return groups
@@ -18,7 +18,10 @@ service_settings = PDFProcessorSettings()
 # Import our components
 from text_extractor import PDFTextExtractor
 from text_chunker import TextChunker
-from ocr_fallback import OCRProcessor
+from ocr_fallback import OCRServiceClient
+from rasterizer import BBox, PageRasterizer
+import page_ocr
+from language_router import group_pages_by_language
 from models import ProcessingResult, ProcessingStatus, ProcessingRequest
 
 # Configure logging based on environment
@@ -54,10 +57,17 @@ text_chunker = TextChunker(
     overlap=50
 )
 
-ocr_processor = OCRProcessor(
-    lang=service_settings.tesseract_language,
+ocr_processor = OCRServiceClient(
+    base_url=service_settings.ocr_service_url,
+    transport=service_settings.ocr_transport
+)
+
+rasterizer = PageRasterizer(
     dpi=service_settings.image_quality,
-    enhance_image=True
+    min_dpi=service_settings.rasterize_min_dpi,
+    max_workers=service_settings.rasterize_workers,
+    chunk_size=service_settings.rasterize_chunk_size,
+    use_shared_memory=service_settings.ocr_transport != "multipart"
 )
 
 # Store processing status
@@ -82,19 +92,29 @@ class ProcessingOrchestrator:
             # Extract text and images
             extraction_result = await text_extractor.extract_text(str(file_path))
             
-            # Identify pages needing OCR
-            ocr_pages = [
-                page_num for page_num, content in extraction_result.items()
-                if content['needs_ocr']
-            ]
+            # Identify pages needing OCR, in full or only for their image regions
+            ocr_pages = page_ocr.pages_needing_ocr(extraction_result)
             
-            # Process OCR in parallel if needed
+            # Process OCR in parallel if needed, one batch per language pack
             if ocr_pages:
-                logger.info(f"Running OCR for {len(ocr_pages)} pages in task {task_id}")
-                ocr_results = await ocr_processor.process_pages(str(file_path), ocr_pages)
+                language_groups = await asyncio.to_thread(
+                    group_pages_by_language,
+                    extraction_result,
+                    ocr_pages,
+                    service_settings.tesseract_language
+                )
+                logger.info(
+                    f"Running OCR for {len(ocr_pages)} pages in task {task_id}: "
+                    + ", ".join(f"{lang}={len(pages)}" for lang, pages in language_groups.items())
+                )
+                page_languages = {
+                    page_num: language
+                    for language, pages in language_groups.items()
+                    for page_num in pages
+                }
+                ocr_results = await self.ocr_pages(file_path, page_languages, extraction_result)
                 # Merge OCR results back into extraction_result
-                for page_num, ocr_text in ocr_results.items():
-                    extraction_result[page_num]['text'] = ocr_text
+                page_ocr.merge_ocr_results(extraction_result, ocr_results)
             
             # Chunk the extracted text
             all_chunks = await text_chunker.chunk_document(extraction_result)
@@ -122,6 +142,22 @@ class ProcessingOrchestrator:
             failed_path = self.failed_dir / file_path.name
             file_path.rename(failed_path)
 
+    async def ocr_pages(
+        self,
+        file_path: Path,
+        page_languages: Dict[int, str],
+        extraction_result: Dict[int, dict]
+    ) -> Dict[int, Dict[Optional[BBox], str]]:
+        """OCRs the pages, at most `batch_size` rendered pages in flight."""
+        return await page_ocr.ocr_pages(
+            rasterizer,
+            ocr_processor,
+            file_path,
+            page_languages,
+            extraction_result,
+            max_in_flight=service_settings.batch_size
+        )
+
     async def save_result(self, task_id: str, result: ProcessingResult):
         """Saves processing results to disk."""
         result_path = self.results_dir / f"{task_id}.json"
@@ -209,6 +245,11 @@ async def get_result(task_id: str):
     
     return status.result
 
+@app.on_event("shutdown")
+async def shutdown():
+    rasterizer.shutdown()
+    await ocr_processor.close()
+
 if __name__ == "__main__":
     uvicorn.run(
         app,
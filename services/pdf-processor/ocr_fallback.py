@@ -1,60 +1,162 @@
-from typing import Dict, List
+from typing import Dict, Optional, Tuple
 import httpx
 from loguru import logger
 import asyncio
+import uuid
 from io import BytesIO
+from multiprocessing import shared_memory
+from PIL import Image
+from rasterizer import RasterPage
+
+# Error code in the OCR service's 400 body when it cannot open a shared-memory
+# reference from its host and needs the bytes uploaded instead
+TRANSPORT_UNAVAILABLE = "transport_unavailable"
+
+def transport_unavailable(response: httpx.Response) -> bool:
+    """Whether the OCR service rejected a local reference as unreachable, as opposed to any other error."""
+    if response.status_code != 400:
+        return False
+    try:
+        detail = response.json().get("detail")
+    except ValueError:
+        return False
+    return isinstance(detail, dict) and detail.get("code") == TRANSPORT_UNAVAILABLE
 
 class OCRServiceClient:
     """Client for communicating with OCR service."""
-    
-    def __init__(self, base_url: str = "http://ocr-tesseract:8004"):
+
+    def __init__(
+        self,
+        base_url: str = "http://ocr-tesseract:8004",
+        transport: str = "auto"
+    ):
+        """
+        Args:
+            base_url: OCR service URL
+            transport: "auto" passes shared-memory handles until the OCR service
+                reports it cannot reach them, "multipart" always uploads bytes
+        """
         self.base_url = base_url
         self.client = httpx.AsyncClient(timeout=300.0)  # 5 minute timeout
-        
-    async def process_pages(
+        self.transport = transport
+        self._local_available = transport != "multipart"
+
+    def _disable_local(self, response: httpx.Response):
+        logger.warning(
+            f"OCR service cannot reach local references ({response.json()['detail']['message']}); "
+            "falling back to multipart uploads"
+        )
+        self._local_available = False
+
+    async def ocr_image(
         self,
-        pdf_path: str,
-        page_numbers: List[int]
-    ) -> Dict[int, str]:
+        buffer: bytes,
+        shape: Tuple[int, ...],
+        layout: bool = False,
+        language: Optional[str] = None,
+        text_hint: Optional[str] = None
+    ) -> Dict:
         """
-        Send pages to OCR service for processing.
-        
+        OCR a single raw uint8 raster (grayscale or RGB).
+
         Args:
-            pdf_path: Path to the PDF file
-            page_numbers: List of page numbers to process
-            
+            buffer: Raw pixel bytes, row-major
+            shape: (height, width) or (height, width, channels)
+            layout: Request LayoutLM layout analysis
+            language: Tesseract language pack, or "auto"
+            text_hint: Native text of the page, used for "auto" language detection
+
         Returns:
-            Dictionary mapping page numbers to extracted text
+            The OCR service response for the page
         """
+        data = _ocr_form(layout, language, text_hint)
         try:
-            # Read PDF file
-            with open(pdf_path, 'rb') as f:
-                pdf_data = f.read()
-            
-            # Prepare multipart form data
-            files = {
-                'file': ('document.pdf', BytesIO(pdf_data), 'application/pdf')
-            }
-            data = {
-                'pages': ','.join(map(str, page_numbers))
-            }
-            
-            # Send request to OCR service
+            if self._local_available:
+                response = await self._post_shared_memory(buffer, shape, data)
+                if response.status_code == 200:
+                    return response.json()
+                if not transport_unavailable(response):
+                    raise OCRServiceError(f"OCR service error: {response.text}")
+                self._disable_local(response)
+
+            png = await asyncio.to_thread(_encode_png, buffer, shape)
             response = await self.client.post(
-                f"{self.base_url}/process",
-                files=files,
+                f"{self.base_url}/ocr",
+                files={'file': ('page.png', png, 'image/png')},
                 data=data
             )
-            
             if response.status_code != 200:
                 raise OCRServiceError(f"OCR service error: {response.text}")
-            
             return response.json()
-            
+
+        except OCRServiceError:
+            raise
         except Exception as e:
             logger.error(f"Error in OCR service communication: {str(e)}")
-            raise OCRServiceError(f"Failed to process pages: {str(e)}")
+            raise OCRServiceError(f"Failed to process image: {str(e)}")
+
+    async def ocr_raster(
+        self,
+        raster: RasterPage,
+        layout: bool = False,
+        language: Optional[str] = None,
+        text_hint: Optional[str] = None
+    ) -> Dict:
+        """
+        OCR a page rendered by PageRasterizer. Rasters already in shared memory
+        are passed by name, so the pixels are never copied on this side.
+        """
+        if raster.shm_name and self._local_available:
+            data = _ocr_form(layout, language, text_hint)
+            try:
+                response = await self.client.post(
+                    f"{self.base_url}/ocr",
+                    data={**data, 'shm_name': raster.shm_name, 'shape': ','.join(map(str, raster.shape))}
+                )
+            except Exception as e:
+                logger.error(f"Error in OCR service communication: {str(e)}")
+                raise OCRServiceError(f"Failed to process image: {str(e)}")
+            if response.status_code == 200:
+                return response.json()
+            if not transport_unavailable(response):
+                raise OCRServiceError(f"OCR service error: {response.text}")
+            self._disable_local(response)
+
+        buffer = await asyncio.to_thread(raster.read)
+        return await self.ocr_image(buffer, raster.shape, layout, language, text_hint)
+
+    async def _post_shared_memory(self, buffer: bytes, shape: Tuple[int, ...], data: Dict) -> httpx.Response:
+        shm = shared_memory.SharedMemory(
+            name=f"ocr_{uuid.uuid4().hex[:16]}", create=True, size=len(buffer)
+        )
+        try:
+            shm.buf[:len(buffer)] = buffer
+            return await self.client.post(
+                f"{self.base_url}/ocr",
+                data={**data, 'shm_name': shm.name, 'shape': ','.join(map(str, shape))}
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    async def close(self):
+        await self.client.aclose()
+
+def _ocr_form(layout: bool, language: Optional[str], text_hint: Optional[str]) -> Dict:
+    data = {'layout': str(layout).lower()}
+    if language:
+        data['language'] = language
+    if text_hint:
+        data['text_hint'] = text_hint
+    return data
+
+def _encode_png(buffer: bytes, shape: Tuple[int, ...]) -> bytes:
+    mode = 'L' if len(shape) == 2 else 'RGB'
+    image = Image.frombuffer(mode, (shape[1], shape[0]), buffer, 'raw', mode, 0, 1)
+    out = BytesIO()
+    image.save(out, format='PNG')
+    return out.getvalue()
 
 class OCRServiceError(Exception):
     """Custom exception for OCR service errors."""
-    pass
\ No newline at end of file
+    pass
@@ -0,0 +1,90 @@
+from typing import Dict, List, Optional
+from pathlib import Path
+import asyncio
+from hybrid_layout import merge_regions
+from ocr_fallback import OCRServiceClient
+from rasterizer import BBox, PageRasterizer, RasterPage
+
+def pages_needing_ocr(extraction_result: Dict[int, dict]) -> List[int]:
+    """Pages to OCR: in full when flagged needs_ocr, otherwise for their `ocr_regions`."""
+    return [
+        page_num for page_num, content in extraction_result.items()
+        if content['needs_ocr'] or content.get('ocr_regions')
+    ]
+
+def merge_ocr_results(
+    extraction_result: Dict[int, dict],
+    ocr_results: Dict[int, Dict[Optional[BBox], str]]
+):
+    """
+    Writes OCR text back into the pages. A whole-page OCR replaces the page's
+    text; on hybrid pages the native text blocks stay and the OCRed images
+    slot in by position.
+    """
+    for page_num, region_texts in ocr_results.items():
+        content = extraction_result[page_num]
+        if content['needs_ocr']:
+            content['text'] = region_texts[None]
+        else:
+            content['text'] = merge_regions(content.pop('text_blocks'), region_texts)
+
+async def ocr_pages(
+    rasterizer: PageRasterizer,
+    ocr_client: OCRServiceClient,
+    file_path: Path,
+    page_languages: Dict[int, str],
+    extraction_result: Dict[int, dict],
+    max_in_flight: int
+) -> Dict[int, Dict[Optional[BBox], str]]:
+    """
+    Renders the OCR pages in the rasterizer pool and OCRs each raster as it
+    arrives. Pages flagged needs_ocr are rendered whole; other pages only
+    have their `ocr_regions` rendered. Pages are rendered grouped by language
+    so consecutive requests reuse the same Tesseract pack. A raster is only
+    pulled from the pool once one of `max_in_flight` OCR slots is free, which
+    bounds how many rendered pages sit in memory.
+
+    Returns:
+        Page number to {region bbox: text}, with a None key for whole pages
+    """
+    slots = asyncio.Semaphore(max_in_flight)
+    results: Dict[int, Dict[Optional[BBox], str]] = {}
+    tasks = []
+
+    async def ocr_page(raster: RasterPage):
+        try:
+            page_num = raster.page_number
+            response = await ocr_client.ocr_raster(
+                raster,
+                language=page_languages[page_num],
+                text_hint=extraction_result[page_num]['text']
+            )
+            results.setdefault(page_num, {})[raster.clip] = response['text']
+        finally:
+            raster.release()
+            slots.release()
+
+    full_pages = [p for p in page_languages if extraction_result[p]['needs_ocr']]
+    regions = {
+        p: extraction_result[p]['ocr_regions']
+        for p in page_languages if not extraction_result[p]['needs_ocr']
+    }
+    rasters = rasterizer.rasterize(str(file_path), full_pages, regions)
+    try:
+        while True:
+            await slots.acquire()
+            try:
+                raster = await rasters.__anext__()
+            except StopAsyncIteration:
+                slots.release()
+                break
+            tasks.append(asyncio.create_task(ocr_page(raster)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        await rasters.aclose()
+    return results
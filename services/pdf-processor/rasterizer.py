@@ -0,0 +1,208 @@
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+import os
+import uuid
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import fitz  # PyMuPDF
+from loguru import logger
+
+# (x0, y0, x1, y1) in PDF points
+BBox = Tuple[float, float, float, float]
+
+@dataclass
+class RasterPage:
+    """
+    An 8-bit grayscale raster of a page, or of the `clip` region of a page,
+    held in shared memory when possible.
+    """
+    page_number: int
+    width: int
+    height: int
+    dpi: int
+    clip: Optional[BBox] = None
+    source_dpi: Optional[float] = None
+    shm_name: Optional[str] = None
+    samples: Optional[bytes] = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.height, self.width)
+
+    def read(self) -> bytes:
+        """Returns the raw pixel bytes, copying them out of shared memory if needed."""
+        if self.samples is not None:
+            return self.samples
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            return bytes(shm.buf[:self.width * self.height])
+        finally:
+            shm.close()
+
+    def release(self):
+        """Frees the shared-memory block. Safe to call more than once."""
+        if self.shm_name is None:
+            return
+        try:
+            shm = shared_memory.SharedMemory(name=self.shm_name)
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        self.shm_name = None
+
+def source_dpi(page: fitz.Page, clip: Optional[fitz.Rect] = None) -> Optional[float]:
+    """
+    Effective resolution of the sharpest image drawn on the page (or inside
+    `clip`), or None when there are no images. Rendering above this only
+    interpolates pixels.
+    """
+    best = None
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info['bbox'])
+        if bbox.width <= 0 or bbox.height <= 0:
+            continue
+        if clip is not None and not bbox.intersects(clip):
+            continue
+        # Page units are points (1/72 inch)
+        dpi = min(info['width'] / (bbox.width / 72), info['height'] / (bbox.height / 72))
+        best = dpi if best is None else max(best, dpi)
+    return best
+
+def _to_shared_memory(samples) -> Optional[str]:
+    try:
+        shm = shared_memory.SharedMemory(
+            name=f"raster_{uuid.uuid4().hex[:16]}", create=True, size=len(samples)
+        )
+    except OSError as e:
+        # /dev/shm full or unavailable; the caller gets the bytes instead
+        logger.warning(f"Shared memory unavailable for page raster: {str(e)}")
+        return None
+    shm.buf[:len(samples)] = samples
+    # Ownership passes to the parent, which unlinks the block after OCR
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()
+    return shm.name
+
+def render_pages(
+    pdf_path: str,
+    jobs: List[Tuple[int, Optional[BBox]]],
+    dpi: int,
+    min_dpi: int,
+    use_shared_memory: bool = True
+) -> List[RasterPage]:
+    """
+    Renders (page number, clip) jobs to grayscale rasters; a None clip renders
+    the whole page. Runs inside a worker process.
+    """
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for page_number, clip in jobs:
+            page = doc[page_number]
+            rect = fitz.Rect(clip) if clip else None
+            scan_dpi = source_dpi(page, rect)
+            target_dpi = dpi if scan_dpi is None else int(max(min_dpi, min(dpi, round(scan_dpi))))
+            pix = page.get_pixmap(dpi=target_dpi, colorspace=fitz.csGRAY, alpha=False, clip=rect)
+            samples = pix.samples_mv if hasattr(pix, 'samples_mv') else pix.samples
+            shm_name = _to_shared_memory(samples) if use_shared_memory else None
+            pages.append(RasterPage(
+                page_number=page_number,
+                width=pix.width,
+                height=pix.height,
+                dpi=target_dpi,
+                clip=clip,
+                source_dpi=scan_dpi,
+                shm_name=shm_name,
+                samples=None if shm_name else bytes(samples)
+            ))
+    return pages
+
+class PageRasterizer:
+    """Renders the pages that need OCR in a process pool."""
+
+    def __init__(
+        self,
+        dpi: int = 300,
+        min_dpi: int = 150,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 4,
+        use_shared_memory: bool = True
+    ):
+        """
+        Args:
+            dpi: Target resolution; pages whose scans are coarser render at the scan resolution
+            min_dpi: Floor for the downsampled resolution
+            max_workers: Render processes (defaults to the CPU count)
+            chunk_size: Pages per task, so each worker opens the document once per chunk
+            use_shared_memory: Hand rasters over in shared memory rather than pickled bytes
+        """
+        self.dpi = dpi
+        self.min_dpi = min_dpi
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.use_shared_memory = use_shared_memory
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        logger.info(f"Initialized PageRasterizer with dpi={dpi}, workers={self.max_workers}")
+
+    async def rasterize(
+        self,
+        pdf_path: str,
+        page_numbers: List[int],
+        regions: Optional[Dict[int, List[BBox]]] = None
+    ) -> AsyncIterator[RasterPage]:
+        """
+        Yields rasters of whole pages and of page regions as soon as their chunk
+        is rendered. At most one chunk per worker is in flight, so rasters are
+        only produced as fast as the consumer takes them.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: Pages to render whole
+            regions: Page number to the bounding boxes to render from that page
+        """
+        loop = asyncio.get_running_loop()
+        jobs = [(page_number, None) for page_number in page_numbers]
+        for page_number, bboxes in (regions or {}).items():
+            jobs.extend((page_number, tuple(bbox)) for bbox in bboxes)
+        chunks = [
+            jobs[i:i + self.chunk_size]
+            for i in range(0, len(jobs), self.chunk_size)
+        ]
+        pending = set()
+        ready: Deque[RasterPage] = deque()
+        next_chunk = 0
+        try:
+            while next_chunk < len(chunks) or pending:
+                while next_chunk < len(chunks) and len(pending) < self.max_workers:
+                    pending.add(loop.run_in_executor(
+                        self.executor, render_pages, pdf_path, chunks[next_chunk],
+                        self.dpi, self.min_dpi, self.use_shared_memory
+                    ))
+                    next_chunk += 1
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Take every finished chunk's rasters before raising for a failed one
+                for future in done:
+                    if future.exception() is None:
+                        ready.extend(future.result())
+                for future in done:
+                    future.result()
+                while ready:
+                    yield ready.popleft()
+        finally:
+            # Free rasters the consumer never received: rendered but not yet
+            # yielded when it stopped early or an error was raised, or still rendering
+            for raster in ready:
+                raster.release()
+            for future in pending:
+                future.add_done_callback(_release_rendered)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def _release_rendered(future: asyncio.Future):
+    if future.cancelled() or future.exception():
+        return
+    for raster in future.result():
+        raster.release()
@@ -0,0 +1,251 @@
+import asyncio
+import importlib.util
+import os
+from pathlib import Path
+
+import cv2
+import fitz
+import httpx
+import numpy as np
+import pytest
+
+from hybrid_layout import find_ocr_regions, merge_regions, reading_order, text_blocks
+from language_router import AUTO_LANGUAGE, detect_language, group_pages_by_language
+from ocr_fallback import OCRServiceClient, OCRServiceError, TRANSPORT_UNAVAILABLE
+from page_ocr import merge_ocr_results, ocr_pages, pages_needing_ocr
+from rasterizer import PageRasterizer
+
+OCR_SERVICE_DIR = Path(__file__).resolve().parents[2] / "neural-ocr-tesseract"
+
+GERMAN = "Der Vertrag ist nicht gültig, und die Parteien haben mit dem Gericht verhandelt."
+ENGLISH = "The contract is signed by the parties and the payment is due within thirty days."
+RUSSIAN = "Договор подписан сторонами, оплата в течение тридцати дней."
+
+def _ocr_client(handler) -> OCRServiceClient:
+    client = OCRServiceClient(base_url="http://ocr")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def _page() -> bytes:
+    return np.full((20, 30), 255, dtype=np.uint8).tobytes()
+
+@pytest.mark.asyncio
+async def test_ocr_client_falls_back_when_transport_unavailable():
+    """An explicit transport_unavailable switches this and later pages to multipart uploads"""
+    uploads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b"shm_name" in request.content and b"filename=" not in request.content:
+            return httpx.Response(400, json={"detail": {"code": TRANSPORT_UNAVAILABLE, "message": "not found"}})
+        uploads.append(request)
+        return httpx.Response(200, json={"text": "ok"})
+
+    client = _ocr_client(handler)
+    assert (await client.ocr_image(_page(), (20, 30)))["text"] == "ok"
+    assert not client._local_available
+    await client.ocr_image(_page(), (20, 30))
+    assert len(uploads) == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, body", [
+    (400, {"detail": "Invalid shape: 20"}),
+    (404, {"detail": "Not Found"}),
+    (422, {"detail": [{"loc": ["body", "layout"], "msg": "bad"}]}),
+])
+async def test_ocr_client_keeps_local_transport_on_other_errors(status, body):
+    """Other errors are reported as they are and never turn off local transport"""
+    client = _ocr_client(lambda request: httpx.Response(status, json=body))
+    with pytest.raises(OCRServiceError):
+        await client.ocr_image(_page(), (20, 30))
+    assert client._local_available
+
+def _shm_rasters() -> set:
+    return {name for name in os.listdir("/dev/shm") if name.startswith("raster_")}
+
+@pytest.mark.asyncio
+async def test_rasterize_releases_unconsumed_rasters_on_close(tmp_path):
+    """Closing the generator early frees rasters rendered but never yielded"""
+    pdf_path = tmp_path / "scan.pdf"
+    with fitz.open() as doc:
+        for i in range(8):
+            doc.new_page(width=200, height=200).insert_text((20, 40), f"page {i}")
+        doc.save(pdf_path)
+
+    before = _shm_rasters()
+    rasterizer = PageRasterizer(dpi=72, min_dpi=72, max_workers=2, chunk_size=2)
+    pages = rasterizer.rasterize(str(pdf_path), list(range(8)))
+    first = await pages.__anext__()
+    assert first.shm_name in _shm_rasters()
+    first.release()
+    await pages.aclose()
+
+    # Chunks still rendering are freed as they finish
+    await asyncio.to_thread(rasterizer.executor.shutdown, True)
+    await asyncio.sleep(0.1)
+    assert _shm_rasters() - before == set()
+
+def _form_field(body: bytes, name: str) -> str:
+    return body.split(f'name="{name}"\r\n\r\n'.encode())[1].split(b"\r\n")[0].decode()
+
+@pytest.mark.asyncio
+async def test_ocr_pages_sends_whole_pages_and_regions_with_upload_fallback(tmp_path):
+    """Scanned pages go whole, text pages only as their regions, each with its language"""
+    pdf_path = tmp_path / "mixed.pdf"
+    with fitz.open() as doc:
+        for i in range(2):
+            doc.new_page(width=200, height=200).insert_text((20, 40), f"page {i}")
+        doc.save(pdf_path)
+    extraction_result = {
+        0: {'text': "", 'needs_ocr': True},
+        1: {'text': "Native text", 'needs_ocr': False, 'ocr_regions': [(20, 100, 120, 150)]},
+    }
+    sent, shm_attempts = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b"filename=" not in request.content:
+            shm_attempts.append(request)
+            return httpx.Response(400, json={"detail": {"code": TRANSPORT_UNAVAILABLE, "message": "not found"}})
+        language = _form_field(request.content, "language")
+        png = request.content.split(b'filename="page.png"')[1].split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n--", 1)[0]
+        height, width = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_GRAYSCALE).shape
+        sent.append((language, (height, width)))
+        return httpx.Response(200, json={"text": f"{language} {height}x{width}"})
+
+    before = _shm_rasters()
+    rasterizer = PageRasterizer(dpi=72, min_dpi=72, max_workers=1, chunk_size=1)
+    try:
+        results = await ocr_pages(rasterizer, _ocr_client(handler), pdf_path, {0: "eng", 1: "deu"},
+                                  extraction_result, max_in_flight=1)
+    finally:
+        rasterizer.shutdown()
+
+    assert results == {0: {None: "eng 200x200"}, 1: {(20, 100, 120, 150): "deu 50x100"}}
+    assert sorted(sent) == [("deu", (50, 100)), ("eng", (200, 200))]
+    # Only the first page tried shared memory; the rest went straight to uploads
+    assert len(shm_attempts) == 1
+    assert _shm_rasters() - before == set()
+
+def _png(width: int, height: int, text: str = "") -> bytes:
+    img = np.full((height, width), 255, dtype=np.uint8)
+    if text:
+        cv2.putText(img, text, (10, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2)
+    return cv2.imencode(".png", img)[1].tobytes()
+
+def _mixed_page(doc: fitz.Document) -> fitz.Page:
+    """A text page with a scanned figure, a searchable scan and a small logo"""
+    page = doc.new_page(width=600, height=800)
+    page.insert_text((72, 80), "Quarterly report introduction.")
+    page.insert_image(fitz.Rect(72, 200, 528, 450), stream=_png(912, 500, "Revenue by region"),
+                      keep_proportion=False)
+    # Too short to count as a text layer; dropped in favour of the figure's OCR
+    page.insert_text((90, 230), "Fig. 1")
+    scan = fitz.Rect(72, 470, 528, 560)
+    page.insert_image(scan, stream=_png(912, 180, "Signed copy"), keep_proportion=False)
+    page.insert_text((80, 520), "Signed copy of the agreement on file", render_mode=3)
+    page.insert_image(fitz.Rect(540, 20, 560, 40), stream=_png(40, 40), keep_proportion=False)
+    page.insert_text((72, 700), "Closing remarks.")
+    return page
+
+def test_hybrid_layout_finds_image_regions():
+    """Only large images without their own text layer are sent to OCR"""
+    with fitz.open() as doc:
+        regions = find_ocr_regions(_mixed_page(doc))
+    assert regions == [(72.0, 200.0, 528.0, 450.0)]
+
+def test_hybrid_layout_merges_in_reading_order():
+    """OCRed region text replaces the text under it and lands between the blocks around it"""
+    with fitz.open() as doc:
+        page = _mixed_page(doc)
+        regions = find_ocr_regions(page)
+        blocks = text_blocks(page, exclude=regions)
+    text = merge_regions(blocks, {regions[0]: "Revenue by region\n"})
+    assert text.split("\n\n") == [
+        "Quarterly report introduction.",
+        "Revenue by region",
+        "Signed copy of the agreement on file",
+        "Closing remarks.",
+    ]
+
+class _FakeOCR:
+    """Reads each raster as the region it was rendered from"""
+    async def ocr_raster(self, raster, language=None, text_hint=None):
+        return {'text': "Full page scan" if raster.clip is None else "Revenue by region"}
+
+@pytest.mark.asyncio
+async def test_hybrid_pages_keep_native_text_and_scans_are_replaced(tmp_path):
+    """Scanned pages take the whole-page OCR; hybrid pages only OCR their figures"""
+    pdf_path = tmp_path / "report.pdf"
+    with fitz.open() as doc:
+        doc.new_page(width=600, height=800).insert_image(fitz.Rect(0, 0, 600, 800), stream=_png(600, 800, "Scan"))
+        mixed = _mixed_page(doc)
+        regions = find_ocr_regions(mixed)
+        blocks = text_blocks(mixed, exclude=regions)
+        doc.new_page(width=600, height=800).insert_text((72, 80), "Plain text page.")
+        doc.save(pdf_path)
+    extraction_result = {
+        0: {'text': "", 'needs_ocr': True},
+        1: {'text': "native", 'needs_ocr': False, 'ocr_regions': regions, 'text_blocks': blocks},
+        2: {'text': "Plain text page.", 'needs_ocr': False},
+    }
+
+    pages = pages_needing_ocr(extraction_result)
+    assert pages == [0, 1]
+    rasterizer = PageRasterizer(dpi=72, min_dpi=72, max_workers=1)
+    try:
+        results = await ocr_pages(rasterizer, _FakeOCR(), pdf_path, {p: "eng" for p in pages},
+                                  extraction_result, max_in_flight=2)
+    finally:
+        rasterizer.shutdown()
+    assert results == {0: {None: "Full page scan"}, 1: {regions[0]: "Revenue by region"}}
+
+    merge_ocr_results(extraction_result, results)
+    assert extraction_result[0]['text'] == "Full page scan"
+    assert extraction_result[1]['text'].split("\n\n") == [
+        "Quarterly report introduction.",
+        "Revenue by region",
+        "Signed copy of the agreement on file",
+        "Closing remarks.",
+    ]
+    assert 'text_blocks' not in extraction_result[1]
+    assert extraction_result[2]['text'] == "Plain text page."
+
+def test_group_pages_by_language():
+    """Pages go to the pack their native text names; pages without text are detected by OCR"""
+    extraction = {1: {'text': GERMAN}, 2: {'text': ENGLISH}, 3: {'text': "p. 3"}, 4: {'text': RUSSIAN}, 5: {}}
+    assert group_pages_by_language(extraction, [1, 2, 3, 4, 5]) == {
+        "deu": [1], "eng": [2], AUTO_LANGUAGE: [3, 5], "rus": [4]
+    }
+    # Latin text without enough stopwords falls back to the default pack
+    assert group_pages_by_language({1: {'text': "Lorem ipsum dolor sit amet consectetur"}}, [1], "fra") == {"fra": [1]}
+
+def _ocr_service_module(name: str):
+    """A module from the OCR service's sources, when they are checked out next to this service"""
+    path = OCR_SERVICE_DIR / f"{name}.py"
+    if not path.exists():
+        pytest.skip("OCR service sources not available")
+    spec = importlib.util.spec_from_file_location(f"ocr_service_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_language_detection_matches_ocr_service():
+    """The copy of the detection rules agrees with the OCR service's"""
+    pytest.importorskip("pytesseract")
+    import language_router
+    ocr = _ocr_service_module("language_detection")
+
+    assert language_router.SCRIPT_LANGUAGES == ocr.SCRIPT_LANGUAGES
+    assert language_router.STOPWORDS == ocr.STOPWORDS
+    assert AUTO_LANGUAGE == ocr.AUTO_LANGUAGE
+    for text in (GERMAN, ENGLISH, RUSSIAN, "p. 3", "Lorem ipsum dolor sit amet consectetur"):
+        assert detect_language(text, "eng") == ocr.detect_text_language(text, "eng")
+
+def test_reading_order_matches_ocr_service():
+    """The copy of the reading order agrees with the OCR service's"""
+    ocr = _ocr_service_module("text_merge")
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        tops = rng.uniform(0, 700, 12)
+        lefts = rng.uniform(0, 500, 12)
+        bboxes = [(x, y, x + rng.uniform(20, 100), y + rng.uniform(8, 30)) for x, y in zip(lefts, tops)]
+        assert reading_order(bboxes) == ocr.reading_order(bboxes)
@@ -4,6 +4,7 @@ import os
 from loguru import logger
 from PIL import Image
 import io
+from hybrid_layout import find_ocr_regions, text_blocks
 
 # Import settings
 from config.settings import settings as project_settings
@@ -17,6 +18,8 @@ class PDFTextExtractor:
         self.min_text_length = min_text_length or service_settings.min_text_length
         self.extract_images = service_settings.extract_images
         self.image_quality = service_settings.image_quality
+        self.hybrid_ocr = service_settings.hybrid_ocr
+        self.min_region_ratio = service_settings.ocr_min_region_ratio
         logger.info(f"Initialized PDFTextExtractor with min_text_length={self.min_text_length}")
 
     async def extract_text(self, file_path: str) -> Dict[int, dict]:
@@ -46,6 +49,13 @@ class PDFTextExtractor:
                 if len(page_content['text'].strip()) < self.min_text_length and page_content['has_images']:
                     page_content['needs_ocr'] = True
                     logger.info(f"Page {page_num} needs OCR: insufficient text length")
+                elif self.hybrid_ocr and page_content['has_images']:
+                    # Text page with scanned exhibits: OCR only the image regions
+                    regions = find_ocr_regions(page, self.min_region_ratio)
+                    if regions:
+                        page_content['ocr_regions'] = regions
+                        page_content['text_blocks'] = text_blocks(page, regions)
+                        logger.info(f"Page {page_num} needs OCR for {len(regions)} image regions")
                 
                 if self.extract_images and page_content['has_images']:
                     page_content['images'] = await self._extract_page_images(page)
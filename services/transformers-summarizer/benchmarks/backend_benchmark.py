@@ -0,0 +1,84 @@
+"""
+Latency, throughput and ROUGE parity of the summarizer's CPU inference
+backends (pytorch fp32, int8, onnx) on the fixed parity corpus.
+
+    python benchmarks/backend_benchmark.py --backends pytorch,int8,onnx --runs 3
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.generation import resolve_generation_params
+from core.models.transformer_model import SummarizerService
+from utils.rouge import rouge_scores
+
+CORPUS_PATH = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "parity_corpus.json"
+
+def _bench(backend: str, model: str, corpus, params, runs: int, batch_size: int, onnx_root: str) -> dict:
+    start = time.perf_counter()
+    service = SummarizerService(model, enable_gpu=False, backend=backend, onnx_root=onnx_root)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up so lazy allocation is not counted
+    service.summarize_batch(corpus[:1], params)
+
+    latencies = []
+    for _ in range(runs):
+        for text in corpus:
+            start = time.perf_counter()
+            service.summarize_batch([text], params)
+            latencies.append(time.perf_counter() - start)
+
+    summaries = []
+    start = time.perf_counter()
+    for _ in range(runs):
+        summaries = []
+        for i in range(0, len(corpus), batch_size):
+            summaries.extend(service.summarize_batch(corpus[i:i + batch_size], params))
+    batched_seconds = time.perf_counter() - start
+
+    return {
+        "backend": service.backend,
+        "load_seconds": round(load_seconds, 2),
+        "memory_mb": round(service.memory_footprint() / 2**20, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+        "batched_docs_per_sec": round(runs * len(corpus) / batched_seconds, 3),
+        "summaries": summaries,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizer inference backend benchmark")
+    parser.add_argument("--model", default="facebook/bart-large-cnn")
+    parser.add_argument("--backends", default="pytorch,int8,onnx")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--num-beams", type=int, default=4)
+    parser.add_argument("--onnx-dir", default="data/models/onnx")
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    args = parser.parse_args()
+
+    corpus = json.loads(Path(args.corpus).read_text())
+    params = resolve_generation_params({"max_length": 80, "min_length": 20, "num_beams": args.num_beams})
+    results = [
+        _bench(backend, args.model, corpus, params, args.runs, args.batch_size, args.onnx_dir)
+        for backend in args.backends.split(",")
+    ]
+
+    # ROUGE of every backend against the first one (pytorch by default)
+    reference = results[0]["summaries"]
+    for result in results:
+        scores = [rouge_scores(s, r) for s, r in zip(result.pop("summaries"), reference)]
+        result["rouge_vs_" + results[0]["backend"]] = {
+            name: round(float(np.mean([s[name] for s in scores])), 4) for name in scores[0]
+        }
+    print(json.dumps({"model": args.model, "documents": len(corpus), "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
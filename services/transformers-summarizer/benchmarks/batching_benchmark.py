@@ -0,0 +1,104 @@
+"""
+Throughput of the summarizer with and without dynamic batching, at several
+concurrency levels. Runs the model in-process behind the same ModelExecutor
+and DynamicBatcher the service uses. Three modes are compared: unbatched
+(batch size 1), batched in arrival order, and batched within token-length
+buckets; padding efficiency is the share of real tokens in the padded batches.
+
+    python benchmarks/batching_benchmark.py --requests 64 --concurrency 1,4,16,32
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.batching import DynamicBatcher
+from core.executor import ModelExecutor
+from core.models.transformer_model import SummarizerService
+
+SENTENCES = [
+    "The company reported quarterly revenue of 4.2 billion dollars, up 12 percent from a year earlier.",
+    "Operating margin improved as supply chain costs eased and pricing held firm across regions.",
+    "The board approved a new share buyback programme and raised the dividend by five percent.",
+    "Management expects demand to soften in the second half because of higher interest rates.",
+    "The contract may be terminated by either party with ninety days written notice.",
+    "All disputes arising under this agreement shall be resolved by binding arbitration.",
+    "The supplier shall maintain insurance coverage of no less than two million dollars.",
+    "Payment is due within thirty days of receipt of a correctly issued invoice.",
+]
+
+def _chunks(count: int, seed: int = 0):
+    # Chunk lengths vary like a real document fan-out
+    rng = np.random.default_rng(seed)
+    return [
+        " ".join(rng.choice(SENTENCES, size=int(rng.integers(6, 30))))
+        for _ in range(count)
+    ]
+
+async def _run(service, texts, concurrency: int, mode: str, batch_size: int, max_wait: float) -> dict:
+    real_tokens = padded_tokens = 0
+
+    def batch_fn(model_name, inputs, params):
+        nonlocal real_tokens, padded_tokens
+        encodings = [service.encode(i) if isinstance(i, str) else i for i in inputs]
+        lengths = [len(e) for e in encodings]
+        real_tokens += sum(lengths)
+        padded_tokens += max(lengths) * len(lengths)
+        return service.generate_batch(encodings, params)
+
+    batcher = DynamicBatcher(
+        batch_fn, ModelExecutor(), max_batch_size=1 if mode == "unbatched" else batch_size,
+        max_wait=max_wait, max_queue=len(texts),
+        encode_fn=(lambda model_name, text: service.encode(text)) if mode == "bucketed" else None
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            await batcher.submit(text, {"max_length": 60, "min_length": 10})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(text) for text in texts])
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "mode": mode,
+        "padding_efficiency": round(real_tokens / padded_tokens, 3),
+        "requests_per_sec": round(len(texts) / elapsed, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarizer dynamic batching and length bucketing benchmark")
+    parser.add_argument("--model", default="facebook/bart-large-cnn")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", default="1,4,16,32")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    service = SummarizerService(args.model)
+    texts = _chunks(args.requests)
+    # Warm-up so the first measured batch does not pay for lazy initialisation
+    service.summarize_batch(texts[:2], {"max_length": 20, "min_length": 5, "num_beams": 1})
+
+    results = []
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for mode in ("unbatched", "batched", "bucketed"):
+            results.append(asyncio.run(
+                _run(service, texts, concurrency, mode, args.batch_size, args.max_wait_ms / 1000)
+            ))
+    print(json.dumps({"model": args.model, "requests": args.requests, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# services/transformers-summarizer/config/settings.py
+
+from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import List
+import os
+
+class Settings(BaseSettings):
+    # API Settings
+    PROJECT_NAME: str = "Transformers Summarizer"
+    API_VERSION: str = "v1"
+    DEBUG: bool = False
+    PORT: int = 8006
+    LOG_LEVEL: str = "INFO"
+
+    # Model Settings
+    DEFAULT_MODEL: str = "facebook/bart-large-cnn"
+    BACKUP_MODEL: str = "google/pegasus-large"
+    # Models requests may route to; DEFAULT_MODEL is always included
+    AVAILABLE_MODELS: List[str] = ["facebook/bart-large-cnn", "google/pegasus-large"]
+    # Models kept loaded at once, and their combined memory budget (0 = unlimited)
+    MAX_RESIDENT_MODELS: int = 2
+    MAX_MODEL_MEMORY_MB: int = 0
+    MAX_INPUT_LENGTH: int = 1024
+    # Tokens shared by consecutive windows when an input exceeds MAX_INPUT_LENGTH
+    WINDOW_STRIDE_TOKENS: int = 32
+    MAX_OUTPUT_LENGTH: int = 150
+    MODEL_BATCH_SIZE: int = 8
+    # How long the first request of a batch waits for others to join
+    BATCH_MAX_WAIT_MS: float = 10.0
+    # Token-length bucket bounds; requests are only batched within a bucket
+    BATCH_LENGTH_BUCKETS: List[int] = [64, 128, 256, 512, 1024]
+
+    # Performance
+    ENABLE_GPU: bool = True
+    # "pytorch", or a CPU-only backend: "int8" (dynamic quantization) or "onnx" (ONNX Runtime)
+    INFERENCE_BACKEND: str = "pytorch"
+    # Exported ONNX models, one directory per model
+    ONNX_MODEL_DIR: str = "data/models/onnx"
+    # Intra-op threads for CPU inference (0 = library default)
+    INFERENCE_THREADS: int = 0
+    # Inference requests allowed to wait for the model executor before 503
+    MAX_QUEUE_SIZE: int = 64
+
+    # Summary cache: in-memory LRU in front of an on-disk store
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SUMMARY_CACHE_DIR: str = "data/cache/summaries"
+    SUMMARY_CACHE_MAX_DISK_BYTES: int = 1024 * 1024 * 1024
+    # Seconds a cached summary stays valid
+    CACHE_TTL: int = 7 * 24 * 3600
+
+    # Monitoring
+    ENABLE_METRICS: bool = True
+
+    class Config:
+        env_file = os.getenv(
+            "ENV_FILE",
+            os.path.join(os.path.dirname(__file__), "environments", "development.env")
+        )
+        case_sensitive = True
+        extra = "ignore"
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,133 @@
+import asyncio
+import bisect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.executor import ModelExecutor, QueueFullError
+from core.generation import generation_key, resolve_generation_params
+from utils.metrics import BATCH_SIZE, PADDING_EFFICIENCY, REJECTED
+
+logger = logging.getLogger(__name__)
+
+# batch_fn(model_name, inputs, resolved_generation_params) -> one summary per
+# input, where inputs are the raw texts, or their encodings when the batcher
+# has an encode_fn(model_name, text)
+BatchFn = Callable[[Optional[str], List[Any], Dict[str, Any]], List[str]]
+EncodeFn = Callable[[Optional[str], str], Sequence[int]]
+
+# Upper token-length bound of each bucket; longer inputs share the last bucket
+DEFAULT_LENGTH_BUCKETS = (64, 128, 256, 512, 1024)
+
+class DynamicBatcher:
+    """
+    Groups concurrent summarization requests into padded batch `generate` calls.
+
+    Requests are queued per model and generation-parameter key, since only
+    requests for the same model with the same max_length, num_beams, etc. can
+    share a call. A queue is handed to
+    the model when it reaches `max_batch_size` or when its oldest request has
+    waited `max_wait` seconds. While the model is busy, queues keep filling, so
+    batches grow with load rather than piling up as batches of one.
+
+    With an `encode_fn`, each request is tokenized once on submit and queued
+    with its encoding, which is what `batch_fn` then receives. Queues are
+    further split into token-length buckets and sorted by length, so a short
+    chunk is not padded out to the longest one in the batch.
+    """
+
+    def __init__(self, batch_fn: BatchFn, executor: ModelExecutor,
+                 max_batch_size: int = 8, max_wait: float = 0.01, max_queue: int = 64,
+                 encode_fn: Optional[EncodeFn] = None,
+                 length_buckets: Sequence[int] = DEFAULT_LENGTH_BUCKETS):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.encode_fn = encode_fn
+        self.length_buckets = sorted(length_buckets)
+        self.pending = 0
+        # key -> [(length, input, future)]
+        self._queues: Dict[Tuple, List[Tuple[int, Any, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple, asyncio.TimerHandle] = {}
+        self._params: Dict[Tuple, Dict[str, Any]] = {}
+        self._scheduled: set = set()
+        # One batch on the model at a time; the next one forms while it runs
+        self._model_slot = asyncio.Semaphore(1)
+
+    async def submit(self, text: str, params: Dict[str, Any] = None, model_name: Optional[str] = None,
+                     encoding: Optional[Sequence[int]] = None) -> str:
+        """
+        Summary of `text`. Callers that already tokenized it (e.g. into
+        overflow windows) pass `encoding` so it is not encoded again.
+        """
+        if self.pending >= self.max_queue:
+            REJECTED.inc()
+            raise QueueFullError(f"Inference queue full ({self.pending} pending)")
+        loop = asyncio.get_running_loop()
+        resolved = resolve_generation_params(params)
+        item, length = text, 0
+        if encoding is not None:
+            item, length = encoding, len(encoding)
+        elif self.encode_fn is not None:
+            item = self.encode_fn(model_name, text)
+            length = len(item)
+        key = (model_name, generation_key(resolved), self._bucket(length))
+        self._params[key] = resolved
+        future = loop.create_future()
+        queue = self._queues.setdefault(key, [])
+        bisect.insort(queue, (length, item, future), key=lambda entry: entry[0])
+
+        if len(queue) >= self.max_batch_size:
+            self._schedule(key)
+        elif len(queue) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._schedule, key)
+        self.pending += 1
+        try:
+            return await future
+        finally:
+            self.pending -= 1
+
+    def _bucket(self, length: int) -> int:
+        return min(bisect.bisect_left(self.length_buckets, length), len(self.length_buckets) - 1)
+
+    def _schedule(self, key: Tuple):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if key not in self._scheduled:
+            self._scheduled.add(key)
+            asyncio.get_running_loop().create_task(self._dispatch(key))
+
+    async def _dispatch(self, key: Tuple):
+        async with self._model_slot:
+            self._scheduled.discard(key)
+            queue = self._queues.get(key, [])
+            batch, rest = queue[:self.max_batch_size], queue[self.max_batch_size:]
+            if rest:
+                # Already waited at least one window; send them next
+                self._queues[key] = rest
+                self._schedule(key)
+            else:
+                self._queues.pop(key, None)
+            batch = [entry for entry in batch if not entry[2].cancelled()]
+            if not batch:
+                return
+
+            BATCH_SIZE.observe(len(batch))
+            if any(length for length, _, _ in batch):
+                # Real tokens over the tokens the padded batch computes on
+                lengths = [length for length, _, _ in batch]
+                PADDING_EFFICIENCY.observe(sum(lengths) / (max(lengths) * len(lengths) or 1))
+            try:
+                summaries = await self.executor.run(
+                    self.batch_fn, key[0], [item for _, item, _ in batch], self._params[key]
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for (_, _, future), summary in zip(batch, summaries):
+                if not future.done():
+                    future.set_result(summary)
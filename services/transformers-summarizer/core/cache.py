@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of an input, so re-extracted boilerplate still hits."""
+    return re.sub(r"\s+", " ", text).strip()
+
+def summary_cache_key(text: str, model_name: str, params_key: Tuple) -> str:
+    """Hash of the normalized input, the model and every resolved generation parameter."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((model_name, params_key)).encode())
+    digest.update(normalize_text(text).encode())
+    return digest.hexdigest()
+
+class SummaryCache:
+    """
+    Two-tier cache of cleaned summaries: an in-memory LRU bounded by total
+    size in front of a JSON store on disk bounded by total size and entry age.
+    Disk entries survive restarts and are shared by replicas that mount the
+    same directory.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 1024 * 1024 * 1024,
+                 ttl: float = 86400):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        # key -> (summary, stored_at)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._forget(key)
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, *entry)
+        return entry[0]
+
+    def set(self, key: str, summary: str) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, summary, stored_at)
+        self._write_disk(key, summary, stored_at)
+
+    def _remember(self, key: str, summary: str, stored_at: float) -> None:
+        self._forget(key)
+        self._entries[key] = (summary, stored_at)
+        self._bytes += len(summary)
+        while self._bytes > self.max_bytes and self._entries:
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            value = json.loads(path.read_text())
+            if now - value["stored_at"] > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            os.utime(path)  # Keep recently used entries out of pruning
+            return value["summary"], value["stored_at"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable summary cache entry {key}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _write_disk(self, key: str, summary: str, stored_at: float) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"summary": summary, "stored_at": stored_at}))
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.error(f"Summary cache write error: {str(e)}")
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            prune = self._writes_since_prune >= 1000
+            if prune:
+                self._writes_since_prune = 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        """Drop expired disk entries, then the least recently used ones beyond max_disk_bytes."""
+        now = time.time()
+        files = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            # mtime is refreshed on reads, so this also ages out unused entries
+            if now - stat.st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from utils.metrics import INFERENCE_SECONDS, QUEUE_DEPTH, QUEUE_SECONDS, REJECTED
+
+logger = logging.getLogger(__name__)
+
+class QueueFullError(Exception):
+    """Raised when more inference calls are waiting than the executor accepts."""
+
+class ModelExecutor:
+    """
+    Runs model calls on one dedicated thread, off the event loop.
+
+    The model is not thread-safe and a single generate call already uses every
+    core (or the whole GPU), so calls are serialised here instead of competing.
+    The event loop stays free to accept connections and answer /health and
+    /metrics while inference runs.
+    """
+
+    def __init__(self, max_queue: int = 64):
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_queue:
+            REJECTED.inc()
+            raise QueueFullError(f"Inference queue full ({self._pending} pending)")
+
+        submitted = time.perf_counter()
+        started = None
+
+        def timed():
+            nonlocal started
+            started = time.perf_counter()
+            QUEUE_SECONDS.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                INFERENCE_SECONDS.observe(time.perf_counter() - started)
+
+        self._pending += 1
+        QUEUE_DEPTH.inc()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+            QUEUE_DEPTH.dec()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
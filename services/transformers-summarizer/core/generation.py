@@ -0,0 +1,60 @@
+from typing import Any, Dict, Tuple
+
+# Resolved defaults, matching facebook/bart-large-cnn's generation config, so two
+# requests that differ only in omitted-vs-default values batch and cache together
+GENERATION_DEFAULTS: Dict[str, Any] = {
+    "max_length": 130,
+    "min_length": 30,
+    "num_beams": 4,
+    "length_penalty": 2.0,
+    "no_repeat_ngram_size": 3,
+    "do_sample": False,
+    "top_k": 50,
+    "top_p": 0.95,
+    "temperature": 1.0,
+}
+
+_BOOLEANS = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}
+
+def _coerce(name: str, default: Any, value: Any) -> Any:
+    """
+    `value` converted to the type of the parameter's default. Booleans are
+    parsed rather than truth-tested, so "false" stays False.
+    """
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        parsed = _BOOLEANS.get(str(value).strip().lower())
+        if parsed is not None:
+            return parsed
+    else:
+        try:
+            return type(default)(value)
+        except (TypeError, ValueError):
+            pass
+    raise ValueError(f"Invalid generation parameter {name}={value!r}")
+
+def resolve_generation_params(params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Generation kwargs for `generate`: the defaults overridden by known request
+    params. Raises ValueError for a value that does not fit the parameter.
+    """
+    params = params or {}
+    resolved = {
+        name: _coerce(name, default, params[name]) if params.get(name) is not None else default
+        for name, default in GENERATION_DEFAULTS.items()
+    }
+    if not resolved["do_sample"]:
+        # Ignored by greedy/beam search; fixed so they do not split batches
+        resolved.update(top_k=GENERATION_DEFAULTS["top_k"], top_p=GENERATION_DEFAULTS["top_p"],
+                        temperature=GENERATION_DEFAULTS["temperature"])
+    return resolved
+
+def generation_key(params: Dict[str, Any]) -> Tuple:
+    """Hashable key of the resolved parameters; requests with equal keys can share a `generate` call."""
+    resolved = resolve_generation_params(params)
+    return tuple(resolved[name] for name in GENERATION_DEFAULTS)
+
+def resolve_streaming_params(params: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Resolved params for a streamed summary: streaming follows one hypothesis, so beam search is off."""
+    return resolve_generation_params({**(params or {}), "num_beams": 1})
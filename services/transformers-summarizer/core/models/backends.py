@@ -0,0 +1,77 @@
+# services/transformers-summarizer/core/models/backends.py
+
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+logger = logging.getLogger(__name__)
+
+# "pytorch" runs the model as loaded (fp16 on GPU); "int8" applies PyTorch
+# dynamic quantization to the Linear layers; "onnx" runs the exported encoder
+# and decoder graphs in ONNX Runtime. int8 and onnx are CPU-only.
+INFERENCE_BACKENDS = ("pytorch", "int8", "onnx")
+
+def onnx_model_dir(onnx_root: str, model_name: str) -> Path:
+    return Path(onnx_root) / model_name.replace("/", "--")
+
+def quantize_int8(model):
+    """
+    Dynamic int8 quantization of the Linear layers: weights are stored as int8,
+    activations are quantized on the fly. Embeddings and layer norms stay fp32,
+    and `generate` (beam search, streaming) works unchanged.
+    """
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def load_onnx_model(model_name: str, onnx_root: str, threads: int = 0):
+    """
+    ONNX Runtime seq2seq model with the `generate` API of the PyTorch one.
+    Exported on first use and saved under `onnx_root`, so later loads skip the
+    export.
+    """
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+
+    path = onnx_model_dir(onnx_root, model_name)
+    if path.exists():
+        return ORTModelForSeq2SeqLM.from_pretrained(path, session_options=options, use_cache=True)
+
+    logger.info(f"Exporting {model_name} to ONNX in {path}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, session_options=options,
+                                                 use_cache=True)
+    model.save_pretrained(path)
+    return model
+
+def load_seq2seq_model(model_name: str, device: torch.device, backend: str = "pytorch",
+                       onnx_root: Optional[str] = None, threads: int = 0) -> Tuple[object, str]:
+    """
+    (model, backend) for the requested backend. Falls back to pytorch on GPU,
+    where fp16 already beats both CPU backends.
+    """
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown INFERENCE_BACKEND {backend!r}, expected one of {INFERENCE_BACKENDS}")
+    if backend != "pytorch" and device.type != "cpu":
+        logger.warning(f"INFERENCE_BACKEND={backend} is CPU-only, using pytorch on {device}")
+        backend = "pytorch"
+    if device.type == "cpu" and threads:
+        torch.set_num_threads(threads)
+
+    if backend == "onnx":
+        return load_onnx_model(model_name, onnx_root or "data/models/onnx", threads), backend
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(
+        model_name,
+        torch_dtype=torch.float16 if device.type == "cuda" else torch.float32,
+        low_cpu_mem_usage=True
+    ).to(device)
+    model.eval()
+    if backend == "int8":
+        model = quantize_int8(model)
+    return model, backend
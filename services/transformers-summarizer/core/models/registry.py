@@ -0,0 +1,127 @@
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.metrics import MODEL_EVICTIONS, MODEL_LOAD_SECONDS, MODEL_LOADS, RESIDENT_MODEL_BYTES, RESIDENT_MODELS
+
+logger = logging.getLogger(__name__)
+
+class UnknownModelError(ValueError):
+    """Raised for a model name that is not in the registry's allow-list."""
+
+class ModelRegistry:
+    """
+    Lazily loaded summarization models, routed by name.
+
+    Up to `max_resident` models stay in memory, and together they must fit
+    in `max_memory_bytes` (0 disables the limit); the least recently used
+    are evicted first. Tokenizers are small and stay loaded once requested,
+    so requests for an evicted model can still be encoded on the event loop.
+
+    `get` loads weights and must run on the model executor thread, which
+    also serialises eviction against inference. `tokenizer` is thread-safe;
+    a tokenizer loads under its own lock, so only requests for that model
+    wait for it.
+    """
+
+    def __init__(self, models: Iterable[str], default_model: str,
+                 load_model: Callable[..., Any], load_tokenizer: Callable[[str], Any],
+                 max_resident: int = 2, max_memory_bytes: int = 0):
+        self.models = list(dict.fromkeys([default_model, *models]))
+        self.default_model = default_model
+        self.load_model = load_model
+        self.load_tokenizer = load_tokenizer
+        self.max_resident = max_resident
+        self.max_memory_bytes = max_memory_bytes
+        self._resident: "OrderedDict[str, Any]" = OrderedDict()
+        self._footprints: Dict[str, int] = {}
+        self._tokenizers: Dict[str, Any] = {}
+        self._tokenizer_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, model_name: Optional[str] = None) -> str:
+        """Canonical model name for a request; None means the default model."""
+        model_name = model_name or self.default_model
+        if model_name not in self.models:
+            raise UnknownModelError(f"Unknown model {model_name!r}; available: {', '.join(self.models)}")
+        return model_name
+
+    def has_tokenizer(self, model_name: str) -> bool:
+        return model_name in self._tokenizers
+
+    def tokenizer(self, model_name: str):
+        tokenizer = self._tokenizers.get(model_name)
+        if tokenizer is not None:
+            return tokenizer
+        with self._lock:
+            lock = self._tokenizer_locks.setdefault(model_name, threading.Lock())
+        # Loading reads (or downloads) files; /health and other models must not wait on it
+        with lock:
+            if model_name not in self._tokenizers:
+                self._tokenizers[model_name] = self.load_tokenizer(model_name)
+            return self._tokenizers[model_name]
+
+    def get(self, model_name: str):
+        """The loaded model for `model_name`, loading it (and evicting others) if needed."""
+        model_name = self.resolve(model_name)
+        with self._lock:
+            if model_name in self._resident:
+                self._resident.move_to_end(model_name)
+                return self._resident[model_name]
+
+        tokenizer = self.tokenizer(model_name)
+        # Make room by count first, so the old weights are freed before the new ones load
+        self._evict(keep=self.max_resident - 1)
+        start = time.perf_counter()
+        model = self.load_model(model_name, tokenizer=tokenizer)
+        MODEL_LOAD_SECONDS.labels(model_name=model_name).observe(time.perf_counter() - start)
+        MODEL_LOADS.labels(model_name=model_name).inc()
+
+        with self._lock:
+            self._resident[model_name] = model
+            self._footprints[model_name] = model.memory_footprint()
+        if self.max_memory_bytes:
+            self._evict(keep=self.max_resident, max_bytes=self.max_memory_bytes)
+        self._update_gauges()
+        return model
+
+    def _evict(self, keep: int, max_bytes: int = 0):
+        evicted = []
+        with self._lock:
+            # The most recently used model is never evicted, even if it alone is over budget
+            while len(self._resident) > max(keep, 0) or (
+                max_bytes and len(self._resident) > 1 and sum(self._footprints.values()) > max_bytes
+            ):
+                name, model = self._resident.popitem(last=False)
+                self._footprints.pop(name, None)
+                evicted.append((name, model))
+
+        for name, model in evicted:
+            logger.info(f"Evicting model {name}")
+            MODEL_EVICTIONS.labels(model_name=name).inc()
+            model.cleanup()
+        if evicted:
+            gc.collect()
+            self._update_gauges()
+
+    def _update_gauges(self):
+        with self._lock:
+            RESIDENT_MODELS.set(len(self._resident))
+            RESIDENT_MODEL_BYTES.set(sum(self._footprints.values()))
+
+    def resident(self) -> List[str]:
+        with self._lock:
+            return list(self._resident)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "available": self.models,
+                "resident": list(self._resident),
+                "resident_bytes": sum(self._footprints.values()),
+                "max_resident": self.max_resident,
+                "max_memory_bytes": self.max_memory_bytes
+            }
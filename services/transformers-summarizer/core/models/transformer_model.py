@@ -1,71 +1,129 @@
-# src/services/model_service.py
+# services/transformers-summarizer/core/models/transformer_model.py
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers import AutoTokenizer, TextStreamer
 import torch
 import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
+from core.generation import resolve_generation_params
+from core.models.backends import load_seq2seq_model
+from utils.metrics import TOKENS_PROCESSED
+
+logger = logging.getLogger(__name__)
+
+class CallbackStreamer(TextStreamer):
+    """Hands each decoded piece of text to `on_text(text, stream_end)` as generation progresses."""
+
+    def __init__(self, tokenizer, on_text: Callable[[str, bool], None]):
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.on_text = on_text
+
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        self.on_text(text, stream_end)
+
+def load_tokenizer(model_name: str, max_input_length: Optional[int] = None):
+    """Fast tokenizer for `model_name`, optionally capped below the model's own input limit."""
+    kwargs = {"model_max_length": max_input_length} if max_input_length else {}
+    return AutoTokenizer.from_pretrained(model_name, use_fast=True, **kwargs)
+
+def encode(tokenizer, text: str) -> List[int]:
+    """
+    Token ids for one input, truncated to the tokenizer's limit. Always called
+    with the same settings, so the fast tokenizer's truncation state never
+    changes while the model thread pads and decodes.
+    """
+    return tokenizer(text, max_length=tokenizer.model_max_length, truncation=True)["input_ids"]
 
 class SummarizerService:
-    def __init__(self, model_name="facebook/bart-large-cnn"):
-        """Initialize the summarization service."""
-        self.logger = self._setup_logger()
-        self.device = 0 if torch.cuda.is_available() else -1  # Use GPU if available
-        self.logger.info(f"Device set to {'GPU' if self.device == 0 else 'CPU'}")
-        
-        try:
-            self.logger.info(f"Loading model: {model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-            self.pipeline = pipeline("summarization", model=self.model, tokenizer=self.tokenizer, device=self.device)
-            self.logger.info(f"Model {model_name} loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to load model {model_name}: {e}")
-            self.pipeline = None
+    """
+    One seq2seq summarization model and its tokenizer.
 
-    def summarize_text(self, text, params=None):
-        """Generate a summary for the given text."""
-        if not text or not text.strip():
-            self.logger.warning("Received empty or invalid text for summarization")
-            return "Invalid input. Please provide a valid text."
+    `encode` may be called from the event loop; everything that touches the
+    model runs on the model executor thread.
+    """
 
+    def __init__(self, model_name: str = "facebook/bart-large-cnn", tokenizer=None,
+                 enable_gpu: bool = True, max_input_length: Optional[int] = None,
+                 backend: str = "pytorch", onnx_root: Optional[str] = None, threads: int = 0):
+        self.model_name = model_name
+        self.device = torch.device("cuda" if torch.cuda.is_available() and enable_gpu else "cpu")
+        logger.info(f"Loading model {model_name} on {self.device} ({backend})")
         try:
-            params = params or {}
-            min_length = params.get("min_length", 30)
-            max_length = params.get("max_length", 130)
-            do_sample = params.get("do_sample", False)
-            top_k = params.get("top_k", 50)
-            top_p = params.get("top_p", 0.95)
-            
-            self.logger.info(f"Summarizing text with params: {params}")
-            summary = self.pipeline(
-                text, 
-                min_length=min_length, 
-                max_length=max_length, 
-                do_sample=do_sample, 
-                top_k=top_k, 
-                top_p=top_p
-            )[0]["summary_text"]
-            self.logger.info("Summary generated successfully")
-            return summary
+            self.tokenizer = tokenizer or load_tokenizer(model_name, max_input_length)
+            self.model, self.backend = load_seq2seq_model(
+                model_name, self.device, backend, onnx_root=onnx_root, threads=threads
+            )
+        except ValueError:
+            raise
         except Exception as e:
-            self.logger.error(f"Error during summarization: {e}")
-            return "An error occurred during summarization. Please try again."
+            logger.error(f"Error loading model {model_name}: {e}")
+            raise RuntimeError(f"Failed to load model {model_name}") from e
+        logger.info(f"Model {model_name} loaded successfully ({self.backend})")
+
+    def encode(self, text: str) -> List[int]:
+        return encode(self.tokenizer, text)
+
+    def generate_batch(self, encodings: List[List[int]], params: Dict[str, Any]) -> List[str]:
+        """
+        Summarize already-encoded inputs in one padded `generate` call.
+        `params` are resolved generation kwargs shared by the whole batch.
+        """
+        inputs = self.tokenizer.pad(
+            {"input_ids": encodings}, padding=True, return_tensors="pt"
+        ).to(self.device)
+        TOKENS_PROCESSED.labels(model_name=self.model_name).inc(sum(len(e) for e in encodings))
+        with torch.no_grad():
+            output_ids = self.model.generate(**inputs, early_stopping=True, **params)
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+    def summarize_batch(self, texts: List[str], params: Dict[str, Any]) -> List[str]:
+        """Summarize several texts in one padded `generate` call."""
+        return self.generate_batch([self.encode(text) for text in texts], params)
+
+    def summarize(self, text: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Summarize one text; `params` may be partial and are resolved against the defaults."""
+        return self.summarize_batch([text], resolve_generation_params(params))[0]
+
+    def stream_encoded(self, encoding: List[int], params: Dict[str, Any],
+                       on_text: Callable[[str, bool], None]) -> str:
+        """
+        Summarize one already-encoded input, passing decoded text to `on_text`
+        as tokens are generated. Streaming needs a single hypothesis, so
+        `params` must be greedy or sampling (num_beams=1). Returns the full
+        summary.
+        """
+        inputs = self.tokenizer.pad({"input_ids": [encoding]}, return_tensors="pt").to(self.device)
+        TOKENS_PROCESSED.labels(model_name=self.model_name).inc(len(encoding))
+        streamer = CallbackStreamer(self.tokenizer, on_text)
+        with torch.no_grad():
+            output_ids = self.model.generate(**inputs, streamer=streamer, **params)
+        return self.tokenizer.decode(output_ids[0], skip_special_tokens=True)
+
+    def stream_summary(self, text: str, params: Dict[str, Any],
+                       on_text: Callable[[str, bool], None]) -> str:
+        """Stream the summary of one text, truncated to the model's input limit."""
+        return self.stream_encoded(self.encode(text), params, on_text)
 
-    def is_model_loaded(self):
-        """Check if the model pipeline is loaded."""
-        return self.pipeline is not None
+    def memory_footprint(self) -> int:
+        """Bytes held by the model's weights."""
+        if self.backend == "onnx":
+            # Sessions hold roughly the size of the exported graphs
+            return sum(f.stat().st_size for f in Path(self.model.model_save_dir).glob("*.onnx*"))
+        total = 0
+        # state_dict, unlike parameters(), includes int8 packed Linear weights
+        for value in self.model.state_dict().values():
+            for tensor in value if isinstance(value, tuple) else (value,):
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.numel() * tensor.element_size()
+        return total
 
-    def is_gpu_available(self):
-        """Check if GPU is available."""
+    def is_gpu_available(self) -> bool:
         return torch.cuda.is_available()
 
-    @staticmethod
-    def _setup_logger():
-        """Set up logging for the service."""
-        logger = logging.getLogger("SummarizerService")
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        return logger
+    def cleanup(self):
+        """Release the model's memory."""
+        if hasattr(self, "model"):
+            del self.model
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
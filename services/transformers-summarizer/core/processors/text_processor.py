@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,18 +11,29 @@ class TextProcessor:
     """
 
     @staticmethod
-    def validate_text(text: str, max_length: int = 1024) -> str:
+    def validate_text(text: str, max_length: int = 1024, tokenizer=None) -> str:
         """
         Validates the input text:
-        - Truncates to max_length.
         - Ensures non-empty and properly formatted input.
+        - Truncates to max_length: tokens when a tokenizer is given (cut at
+          the last whole token), otherwise characters.
+        Use `token_windows` to keep the overflow instead of dropping it.
         """
         try:
             if not text or not text.strip():
                 raise ValueError("Input text is empty or invalid.")
 
             text = text.strip()
-            if len(text) > max_length:
+            if tokenizer is not None:
+                encoding = tokenizer(
+                    text, max_length=max_length, truncation=True,
+                    add_special_tokens=False, return_offsets_mapping=True
+                )
+                offsets = encoding["offset_mapping"]
+                if offsets and offsets[-1][1] < len(text.rstrip()):
+                    logger.warning(f"Input text exceeds {max_length} tokens. Truncating.")
+                    text = text[:offsets[-1][1]]
+            elif len(text) > max_length:
                 logger.warning(f"Input text exceeds {max_length} characters. Truncating.")
                 text = text[:max_length]
 
@@ -31,6 +42,35 @@ class TextProcessor:
             logger.error(f"Text validation error: {str(e)}")
             raise
 
+    @staticmethod
+    def token_windows(text: str, tokenizer, max_tokens: Optional[int] = None,
+                      stride: int = 0) -> List[List[int]]:
+        """
+        Validates the input text and encodes it into model-ready windows of at
+        most max_tokens (default: the tokenizer's limit) token ids each,
+        special tokens included. Text beyond the limit becomes further
+        windows instead of being dropped; consecutive windows share `stride`
+        tokens of context. The text is tokenized once.
+        """
+        try:
+            if not text or not text.strip():
+                raise ValueError("Input text is empty or invalid.")
+
+            encoding = tokenizer(
+                text.strip(),
+                max_length=max_tokens or tokenizer.model_max_length,
+                truncation=True,
+                stride=stride,
+                return_overflowing_tokens=True
+            )
+            windows = encoding["input_ids"]
+            if len(windows) > 1:
+                logger.info(f"Input text split into {len(windows)} token windows.")
+            return windows
+        except Exception as e:
+            logger.error(f"Text windowing error: {str(e)}")
+            raise
+
     @staticmethod
     def clean_output(summary: str) -> str:
         """
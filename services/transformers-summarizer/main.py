@@ -1,64 +1,301 @@
 import os
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import time
+import asyncio
 import logging
-from src.core.summarizer import SummarizerService
-from src.utils.logging import setup_logging
-from src.core.config import get_settings
+from typing import Any, Dict, Optional
+
+import torch
+import uvicorn
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pydantic import BaseModel, Field
+
+from core.executor import ModelExecutor, QueueFullError
+from core.batching import DynamicBatcher
+from core.cache import SummaryCache, summary_cache_key
+from core.generation import generation_key, resolve_streaming_params
+from core.models.registry import ModelRegistry, UnknownModelError
+from core.models.transformer_model import SummarizerService, encode, load_tokenizer
+from core.processors.text_processor import TextProcessor
+from utils.logging import setup_logging
+from utils.metrics import CACHE_LOOKUPS, REQUEST_LATENCY, TIME_TO_FIRST_TOKEN
+from config.settings import get_settings
 
 settings = get_settings()
-setup_logging()
+setup_logging(settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
-summarizer = SummarizerService()
-
-class SummarizerHandler(BaseHTTPRequestHandler):
-    def _send_response(self, status_code, data):
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
-
-    def do_POST(self):
-        if self.path == '/summarize':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
-            try:
-                request_data = json.loads(post_data.decode())
-                text = request_data.get('text')
-                params = request_data.get('params', {})
-                
-                if not text:
-                    self._send_response(400, {'error': 'No text provided'})
-                    return
-                
-                summary = summarizer.summarize_text(text, params)
-                self._send_response(200, {'summary': summary})
-                
-            except Exception as e:
-                logger.error(f"Error processing request: {str(e)}")
-                self._send_response(500, {'error': str(e)})
-        else:
-            self._send_response(404, {'error': 'Not found'})
-
-    def do_GET(self):
-        if self.path == '/health':
-            health_info = {
-                'status': 'healthy',
-                'model_loaded': summarizer.is_model_loaded(),
-                'gpu_available': summarizer.is_gpu_available()
-            }
-            self._send_response(200, health_info)
-        else:
-            self._send_response(404, {'error': 'Not found'})
-
-def run_server(port=8006):
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, SummarizerHandler)
-    logger.info(f"Starting summarizer service on port {port}")
-    httpd.serve_forever()
+app = FastAPI(title=settings.PROJECT_NAME)
+
+# Every model call goes through this single-threaded executor; the event loop
+# only parses requests and answers health/metrics
+model_executor = ModelExecutor(max_queue=settings.MAX_QUEUE_SIZE)
+_model_ready = asyncio.Event()
+_load_task: Optional[asyncio.Task] = None
+_load_error: Optional[str] = None
+
+def _load_model(model_name, tokenizer=None):
+    return SummarizerService(
+        model_name,
+        tokenizer=tokenizer,
+        enable_gpu=settings.ENABLE_GPU,
+        backend=settings.INFERENCE_BACKEND,
+        onnx_root=settings.ONNX_MODEL_DIR,
+        threads=settings.INFERENCE_THREADS
+    )
+
+def _cache_model_key(model_name: str) -> str:
+    # Quantized and ONNX outputs differ slightly from fp32 ones, so they are cached apart
+    return f"{model_name}@{settings.INFERENCE_BACKEND}"
+
+# Models are loaded on first use and evicted least-recently-used
+registry = ModelRegistry(
+    settings.AVAILABLE_MODELS,
+    settings.DEFAULT_MODEL,
+    load_model=_load_model,
+    load_tokenizer=lambda model_name: load_tokenizer(model_name, settings.MAX_INPUT_LENGTH),
+    max_resident=settings.MAX_RESIDENT_MODELS,
+    max_memory_bytes=settings.MAX_MODEL_MEMORY_MB * 1024 * 1024
+)
+
+def _encode(model_name, text):
+    # Tokenizers outlive evictions, so this never waits for model weights
+    return encode(registry.tokenizer(model_name), text)
+
+def _generate_batch(model_name, encodings, params):
+    return registry.get(model_name).generate_batch(encodings, params)
+
+def _stream_summary(model_name, encoding, params, on_text):
+    return registry.get(model_name).stream_encoded(encoding, params, on_text)
+
+# Concurrent requests for the same model with the same generation parameters
+# and a similar token length share one generate call
+batcher = DynamicBatcher(
+    _generate_batch,
+    model_executor,
+    max_batch_size=settings.MODEL_BATCH_SIZE,
+    max_wait=settings.BATCH_MAX_WAIT_MS / 1000,
+    max_queue=settings.MAX_QUEUE_SIZE,
+    encode_fn=_encode,
+    length_buckets=settings.BATCH_LENGTH_BUCKETS
+)
+
+# Boilerplate clauses and disclaimers recur across documents; summarize them once
+summary_cache = SummaryCache(
+    max_bytes=settings.SUMMARY_CACHE_MAX_BYTES,
+    cache_dir=settings.SUMMARY_CACHE_DIR,
+    max_disk_bytes=settings.SUMMARY_CACHE_MAX_DISK_BYTES,
+    ttl=settings.CACHE_TTL
+) if settings.SUMMARY_CACHE_ENABLED else None
+
+class SummarizeRequest(BaseModel):
+    text: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    model_name: Optional[str] = None
+
+class GenerateRequest(BaseModel):
+    """Request shape used by the backend's summarizer client."""
+    inputs: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+
+@app.on_event("startup")
+async def load_model():
+    global _load_task
+
+    async def load():
+        global _load_error
+        try:
+            await model_executor.run(registry.get, settings.DEFAULT_MODEL)
+        except Exception as e:
+            logger.error(f"Failed to load default model {settings.DEFAULT_MODEL}: {str(e)}")
+            _load_error = str(e)
+        finally:
+            _model_ready.set()
+
+    # Load in the background so /health answers while the weights are read; the
+    # reference keeps the task from being garbage-collected mid-load
+    _load_task = asyncio.create_task(load())
+
+async def _wait_for_model(model_name: str):
+    """
+    Requests for the default model wait for its startup load and get a 503 if
+    it failed. Other models load on first use on the model executor.
+    """
+    if model_name != registry.default_model:
+        return
+    await _model_ready.wait()
+    if _load_error is not None:
+        raise HTTPException(503, f"Model {model_name} failed to load: {_load_error}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    model_executor.shutdown()
+
+async def _route(params: Dict[str, Any], model_name: Optional[str] = None) -> str:
+    """Resolve the requested model (explicit or in params) and make sure its tokenizer is loaded."""
+    try:
+        model_name = registry.resolve(model_name or params.get("model_name"))
+    except UnknownModelError as e:
+        raise HTTPException(400, str(e))
+    if not registry.has_tokenizer(model_name):
+        await asyncio.to_thread(registry.tokenizer, model_name)
+    return model_name
+
+async def _summarize(text: str, params: Dict[str, Any], endpoint: str,
+                     model_name: Optional[str] = None) -> str:
+    if not text or not text.strip():
+        raise HTTPException(400, "No text provided")
+    start = time.perf_counter()
+    model_name = await _route(params, model_name)
+    try:
+        cache_key = summary_cache_key(text, _cache_model_key(model_name), generation_key(params))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    summary = await asyncio.to_thread(summary_cache.get, cache_key) if summary_cache else None
+    if summary is not None:
+        CACHE_LOOKUPS.labels(result="hit").inc()
+        REQUEST_LATENCY.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+        return summary
+    CACHE_LOOKUPS.labels(result="miss").inc()
+
+    await _wait_for_model(model_name)
+    try:
+        # Inputs past the model limit become extra windows rather than being cut off;
+        # the windows batch like any other requests and their summaries are joined
+        windows = TextProcessor.token_windows(
+            text, registry.tokenizer(model_name), stride=settings.WINDOW_STRIDE_TOKENS
+        )
+        window_summaries = await asyncio.gather(
+            *[batcher.submit(text, params, model_name, encoding=window) for window in windows]
+        )
+        summary = TextProcessor.clean_output(" ".join(window_summaries))
+    except QueueFullError as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        logger.error(f"Error processing request: {str(e)}")
+        raise HTTPException(500, str(e))
+    if summary_cache:
+        await asyncio.to_thread(summary_cache.set, cache_key, summary)
+    REQUEST_LATENCY.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+    return summary
+
+@app.post("/summarize")
+async def summarize(request: SummarizeRequest):
+    summary = await _summarize(request.text, request.params, "summarize", request.model_name)
+    return {"summary": summary}
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/summarize/stream")
+async def summarize_stream(request: SummarizeRequest):
+    """
+    Server-sent events: a `token` event per piece of decoded text as it is
+    generated, then one `end` event with the cleaned full summary (or an
+    `error` event). Generation is greedy or sampling; beam search cannot
+    stream, so num_beams is ignored here. Inputs past the model limit are
+    split into token windows as in /summarize and streamed one after another.
+    """
+    if not request.text or not request.text.strip():
+        raise HTTPException(400, "No text provided")
+    start = time.perf_counter()
+    model_name = await _route(request.params, request.model_name)
+    try:
+        params = resolve_streaming_params(request.params)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    cache_key = summary_cache_key(request.text, _cache_model_key(model_name), generation_key(params))
+    cached = await asyncio.to_thread(summary_cache.get, cache_key) if summary_cache else None
+    if cached is not None:
+        CACHE_LOOKUPS.labels(result="hit").inc()
+
+        async def replay():
+            yield _sse("token", {"text": cached})
+            yield _sse("end", {"summary": cached, "cached": True})
+        return StreamingResponse(replay(), media_type="text/event-stream")
+    CACHE_LOOKUPS.labels(result="miss").inc()
+
+    # Windowed before the response starts, so bad input is still a 400 and not an error event
+    try:
+        windows = TextProcessor.token_windows(
+            request.text, registry.tokenizer(model_name), stride=settings.WINDOW_STRIDE_TOKENS
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if model_executor.pending >= model_executor.max_queue:
+        raise HTTPException(503, "Inference queue full", headers={"Retry-After": "5"})
+    await _wait_for_model(model_name)
+
+    loop = asyncio.get_running_loop()
+    pieces: asyncio.Queue = asyncio.Queue()
+
+    def on_text(text: str, stream_end: bool):
+        # Called on the model thread
+        if text:
+            loop.call_soon_threadsafe(pieces.put_nowait, text)
+
+    async def generate() -> str:
+        summaries = []
+        for i, window in enumerate(windows):
+            if i:
+                pieces.put_nowait(" ")
+            summaries.append(await model_executor.run(_stream_summary, model_name, window, params, on_text))
+        return " ".join(summaries)
+
+    generation = asyncio.create_task(generate())
+    generation.add_done_callback(lambda _: pieces.put_nowait(None))
+
+    async def events():
+        first = True
+        try:
+            while (text := await pieces.get()) is not None:
+                if first:
+                    TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - start)
+                    first = False
+                yield _sse("token", {"text": text})
+            # Pieces queued before the done callback are all consumed by now
+            summary = TextProcessor.clean_output(generation.result())
+        except Exception as e:
+            logger.error(f"Error streaming summary: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+            return
+        finally:
+            if not generation.done():
+                # Client went away; the window being generated finishes, the rest are skipped
+                generation.cancel()
+        if summary_cache:
+            await asyncio.to_thread(summary_cache.set, cache_key, summary)
+        REQUEST_LATENCY.labels(endpoint="summarize_stream").observe(time.perf_counter() - start)
+        yield _sse("end", {"summary": summary})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.post("/generate")
+async def generate(request: GenerateRequest):
+    return {"summary": await _summarize(request.inputs, request.parameters, "generate")}
+
+@app.get("/health")
+async def health(response: Response):
+    # Never touches the model executor, so it answers even mid-inference
+    if _load_error is not None:
+        # The default model cannot serve; let the orchestrator replace the pod
+        response.status_code = 503
+    return {
+        "status": "unhealthy" if _load_error is not None else "healthy",
+        "model_loaded": _model_ready.is_set() and _load_error is None,
+        "model_error": _load_error,
+        "gpu_available": torch.cuda.is_available(),
+        "models": registry.stats(),
+        "queue_depth": batcher.pending,
+        "cache": summary_cache.stats() if summary_cache else None,
+    }
+
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 if __name__ == '__main__':
-    port = int(os.getenv('PORT', 8006))
-    run_server(port)
\ No newline at end of file
+    port = int(os.getenv('PORT', settings.PORT))
+    uvicorn.run(app, host="0.0.0.0", port=port)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Service modules are imported as top-level packages (core, config, utils), as in the container
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
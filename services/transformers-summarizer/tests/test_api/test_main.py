@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+# Keep the module-level cache off disk; each test installs its own
+os.environ.setdefault("SUMMARY_CACHE_ENABLED", "false")
+
+import main
+from core.cache import SummaryCache
+from core.models.registry import ModelRegistry
+
+MODEL = main.settings.DEFAULT_MODEL
+
+class FakeTokenizer:
+    """One token per word; overflowing windows overlap by `stride` tokens like the fast tokenizers'."""
+    model_max_length = 64
+
+    def __call__(self, text, max_length=None, truncation=False, stride=0, return_overflowing_tokens=False):
+        ids = list(range(len(text.split())))
+        if not return_overflowing_tokens:
+            return {"input_ids": ids[:max_length]}
+        step = max_length - stride
+        return {"input_ids": [ids[i:i + max_length] for i in range(0, max(len(ids) - stride, 1), step)]}
+
+class FakeSummarizer:
+    def __init__(self):
+        self.streamed = []
+
+    def generate_batch(self, encodings, params):
+        return [f"summary of {len(e)} tokens." for e in encodings]
+
+    def stream_encoded(self, encoding, params, on_text):
+        self.streamed.append(len(encoding))
+        summary = f"summary of {len(encoding)} tokens."
+        for word in summary.split(" "):
+            on_text(word + " ", False)
+        on_text("", True)
+        return summary
+
+    def memory_footprint(self):
+        return 0
+
+    def cleanup(self):
+        pass
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeSummarizer()
+    registry = ModelRegistry([MODEL, "other"], MODEL, load_model=lambda name, tokenizer=None: model,
+                             load_tokenizer=lambda name: FakeTokenizer())
+    monkeypatch.setattr(main, "registry", registry)
+    monkeypatch.setattr(main, "summary_cache", SummaryCache())
+    main._model_ready.set()
+    return model
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://summarizer")
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+@pytest.mark.asyncio
+async def test_stream_sends_tokens_then_end_and_caches_the_summary(model):
+    text = " ".join(["word"] * 20)
+    async with _client() as client:
+        response = await client.post("/summarize/stream", json={"text": text})
+        assert response.status_code == 200
+        events = _events(response.text)
+        assert [e for e, _ in events] == ["token"] * 4 + ["end"]
+        assert "".join(d["text"] for _, d in events[:-1]).strip() == "summary of 20 tokens."
+        assert events[-1][1] == {"summary": "Summary of 20 tokens."}
+
+        # The end event wrote the cache; a repeat is replayed without generating
+        replay = _events((await client.post("/summarize/stream", json={"text": text})).text)
+    assert replay[-1] == ("end", {"summary": "Summary of 20 tokens.", "cached": True})
+    assert model.streamed == [20]
+
+@pytest.mark.asyncio
+async def test_stream_windows_inputs_past_the_model_limit(model):
+    text = " ".join(["word"] * 100)
+    async with _client() as client:
+        events = _events((await client.post("/summarize/stream", json={"text": text})).text)
+    assert model.streamed == [64, 64, 36]
+    assert events[-1] == ("end", {"summary": "Summary of 64 tokens. Summary of 64 tokens. Summary of 36 tokens."})
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    {"text": "  "},
+    {"text": "word", "model_name": "gpt-5"},
+    {"text": "word", "params": {"do_sample": "maybe"}},
+])
+async def test_stream_rejects_bad_requests_before_streaming(model, body):
+    async with _client() as client:
+        response = await client.post("/summarize/stream", json=body)
+    assert response.status_code == 400
+    assert model.streamed == []
+
+@pytest.mark.asyncio
+async def test_stream_rejects_when_queue_full(model, monkeypatch):
+    monkeypatch.setattr(main.model_executor, "max_queue", 0)
+    async with _client() as client:
+        response = await client.post("/summarize/stream", json={"text": "word"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+
+@pytest.mark.asyncio
+async def test_summarize_windows_and_caches(model):
+    text = " ".join(["word"] * 100)
+    async with _client() as client:
+        response = await client.post("/summarize", json={"text": text})
+        assert response.json() == {"summary": "Summary of 64 tokens. Summary of 64 tokens. Summary of 36 tokens."}
+        generate = await client.post("/generate", json={"inputs": text})
+    assert generate.json() == response.json()
+    assert main.summary_cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_summarize_rejects_unknown_model_and_full_queue(model, monkeypatch):
+    async with _client() as client:
+        assert (await client.post("/summarize", json={"text": "word", "model_name": "gpt-5"})).status_code == 400
+        monkeypatch.setattr(main.batcher, "max_queue", 0)
+        response = await client.post("/summarize", json={"text": "word"})
+    assert response.status_code == 503
+
+@pytest.mark.asyncio
+async def test_health_and_metrics_answer_without_the_model(model):
+    main._model_ready.clear()
+    async with _client() as client:
+        health = await client.get("/health")
+        metrics = await client.get("/metrics")
+    assert health.status_code == 200
+    assert health.json()["model_loaded"] is False
+    assert health.json()["models"]["resident"] == []
+    assert metrics.status_code == 200
+
+@pytest.mark.asyncio
+async def test_failed_default_load_is_a_503_not_a_hang(model, monkeypatch):
+    def load_model(name, tokenizer=None):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(main.registry, "load_model", load_model)
+    monkeypatch.setattr(main, "_model_ready", asyncio.Event())
+    monkeypatch.setattr(main, "_load_error", None)
+    monkeypatch.setattr(main, "_load_task", None)
+    await main.load_model()
+    await main._load_task
+
+    async with _client() as client:
+        for path in ("/summarize", "/summarize/stream"):
+            response = await asyncio.wait_for(client.post(path, json={"text": "word"}), 5)
+            assert response.status_code == 503
+        health = await client.get("/health")
+    assert health.status_code == 503
+    assert health.json()["status"] == "unhealthy"
+    assert health.json()["model_error"] == "out of memory"
+
+@pytest.mark.asyncio
+async def test_other_models_do_not_wait_for_the_default(model, monkeypatch):
+    monkeypatch.setattr(main, "_model_ready", asyncio.Event())
+    async with _client() as client:
+        response = await asyncio.wait_for(
+            client.post("/summarize", json={"text": "word", "model_name": "other"}), 5
+        )
+    assert response.json() == {"summary": "Summary of 1 tokens."}
@@ -0,0 +1,43 @@
+"""
+ROUGE parity of the CPU inference backends against the PyTorch fp32 path on a
+fixed corpus. Loads real models, so it is skipped unless the ML stack is
+installed; PARITY_MODEL selects a smaller checkpoint for quicker runs.
+"""
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.rouge import rouge_l
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from core.generation import resolve_generation_params
+from core.models.transformer_model import SummarizerService
+
+PARITY_MODEL = os.getenv("PARITY_MODEL", "facebook/bart-large-cnn")
+CORPUS = json.loads((Path(__file__).parent.parent / "fixtures" / "parity_corpus.json").read_text())
+PARAMS = resolve_generation_params({"max_length": 80, "min_length": 20})
+
+# Minimum mean ROUGE-L against the fp32 summaries
+THRESHOLDS = {"int8": 0.75, "onnx": 0.95}
+
+@pytest.fixture(scope="module")
+def reference():
+    service = SummarizerService(PARITY_MODEL, enable_gpu=False)
+    return service.summarize_batch(CORPUS, PARAMS)
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backend_matches_pytorch(backend, reference, tmp_path_factory):
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+    service = SummarizerService(PARITY_MODEL, enable_gpu=False, backend=backend,
+                                onnx_root=str(tmp_path_factory.mktemp("onnx")))
+    assert service.backend == backend
+    summaries = service.summarize_batch(CORPUS, PARAMS)
+
+    scores = [rouge_l(summary, ref) for summary, ref in zip(summaries, reference)]
+    assert all(summary.strip() for summary in summaries)
+    assert sum(scores) / len(scores) >= THRESHOLDS[backend], scores
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from core.batching import DynamicBatcher
+from core.executor import ModelExecutor
+from core.generation import generation_key, resolve_generation_params, resolve_streaming_params
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_generate_call():
+    calls = []
+
+    def batch_fn(model_name, texts, params):
+        calls.append((list(texts), params["num_beams"]))
+        return [text.upper() for text in texts]
+
+    batcher = DynamicBatcher(batch_fn, ModelExecutor(), max_batch_size=4, max_wait=0.05)
+    results = await asyncio.gather(
+        *[batcher.submit(f"text {i}", {"num_beams": 4}) for i in range(6)],
+        batcher.submit("greedy", {"num_beams": 1}),
+    )
+
+    assert results == [f"TEXT {i}" for i in range(6)] + ["GREEDY"]
+    # Six compatible requests fill one batch of four and one of two; the greedy one runs alone
+    assert sorted(len(texts) for texts, _ in calls) == [1, 2, 4]
+    assert all(beams == 1 for texts, beams in calls if texts == ["greedy"])
+    assert batcher.pending == 0
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    def batch_fn(model_name, texts, params):
+        raise RuntimeError("out of memory")
+
+    batcher = DynamicBatcher(batch_fn, ModelExecutor(), max_batch_size=2, max_wait=0.01)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+def test_generation_key_ignores_sampling_params_for_beam_search():
+    assert generation_key({}) == generation_key({"top_p": 0.5, "max_length": 130})
+    assert generation_key({}) != generation_key({"max_length": 60})
+    assert generation_key({"do_sample": True, "top_p": 0.5}) != generation_key({"do_sample": True})
+
+def test_boolean_params_are_parsed_not_truth_tested():
+    assert resolve_generation_params({"do_sample": "false"})["do_sample"] is False
+    assert resolve_generation_params({"do_sample": "True"})["do_sample"] is True
+    assert resolve_generation_params({"do_sample": 0})["do_sample"] is False
+    assert generation_key({"do_sample": "false", "top_p": 0.5}) == generation_key({})
+    assert resolve_generation_params({"max_length": "60"})["max_length"] == 60
+    with pytest.raises(ValueError, match="do_sample"):
+        resolve_generation_params({"do_sample": "maybe"})
+    with pytest.raises(ValueError, match="num_beams"):
+        resolve_generation_params({"num_beams": "four"})
+
+def test_streaming_params_never_use_beam_search():
+    assert resolve_streaming_params({"num_beams": 4, "max_length": 60}) == {
+        **resolve_streaming_params(), "max_length": 60
+    }
+    assert resolve_streaming_params()["num_beams"] == 1
+
+@pytest.mark.asyncio
+async def test_inputs_are_encoded_once_and_batched_by_length():
+    encoded, calls = [], []
+
+    def encode(model_name, text):
+        encoded.append(text)
+        return [0] * len(text.split())
+
+    def batch_fn(model_name, encodings, params):
+        calls.append([len(e) for e in encodings])
+        return [str(len(e)) for e in encodings]
+
+    batcher = DynamicBatcher(batch_fn, ModelExecutor(), max_batch_size=4, max_wait=0.05,
+                             encode_fn=encode, length_buckets=(4, 16))
+    texts = ["w " * 12, "w " * 2, "w " * 10, "w " * 3]
+    results = await asyncio.gather(*[batcher.submit(text) for text in texts])
+
+    assert results == ["12", "2", "10", "3"]
+    assert sorted(encoded) == sorted(texts)
+    # Short and long inputs never share a padded batch, and each batch is length-sorted
+    assert sorted(calls) == [[2, 3], [10, 12]]
+
+@pytest.mark.asyncio
+async def test_requests_for_different_models_never_share_a_batch():
+    calls = []
+
+    def batch_fn(model_name, texts, params):
+        calls.append((model_name, list(texts)))
+        return [f"{model_name}:{text}" for text in texts]
+
+    batcher = DynamicBatcher(batch_fn, ModelExecutor(), max_batch_size=4, max_wait=0.02)
+    results = await asyncio.gather(
+        batcher.submit("a", model_name="bart"),
+        batcher.submit("b", model_name="pegasus"),
+        batcher.submit("c", model_name="bart"),
+    )
+    assert results == ["bart:a", "pegasus:b", "bart:c"]
+    assert sorted(calls) == [("bart", ["a", "c"]), ("pegasus", ["b"])]
+
+@pytest.mark.asyncio
+async def test_pre_encoded_windows_are_not_encoded_again():
+    def encode(model_name, text):
+        raise AssertionError("already encoded")
+
+    def batch_fn(model_name, encodings, params):
+        return [str(sum(e)) for e in encodings]
+
+    batcher = DynamicBatcher(batch_fn, ModelExecutor(), max_batch_size=4, max_wait=0.01, encode_fn=encode)
+    windows = [[1, 2, 3], [3, 4]]
+    results = await asyncio.gather(*[batcher.submit("long text", encoding=w) for w in windows])
+    assert results == ["6", "7"]
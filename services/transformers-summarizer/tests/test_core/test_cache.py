@@ -0,0 +1,32 @@
+import time
+
+from core.cache import SummaryCache, summary_cache_key
+from core.generation import generation_key
+
+def test_key_ignores_whitespace_but_not_model_or_params():
+    key = summary_cache_key("Payment is due\n within  30 days.", "bart", generation_key({}))
+    assert key == summary_cache_key("Payment is due within 30 days. ", "bart", generation_key({}))
+    assert key != summary_cache_key("Payment is due within 30 days.", "pegasus", generation_key({}))
+    assert key != summary_cache_key("Payment is due within 30 days.", "bart", generation_key({"max_length": 60}))
+
+def test_memory_tier_evicts_by_size_and_disk_tier_survives(tmp_path):
+    cache = SummaryCache(max_bytes=10, cache_dir=str(tmp_path))
+    cache.set("a", "123456")
+    cache.set("b", "123456")
+    assert cache.stats()["entries"] == 1
+
+    # "a" fell out of memory but is still on disk
+    assert cache.get("a") == "123456"
+    assert cache.stats()["disk_hits"] == 1
+    assert SummaryCache(cache_dir=str(tmp_path)).get("b") == "123456"
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SummaryCache(cache_dir=str(tmp_path), ttl=60)
+    cache.set("a", "summary")
+    cache._entries["a"] = ("summary", time.time() - 120)
+    assert cache.get("a") == "summary"  # Disk copy is still fresh
+
+    stale = SummaryCache(cache_dir=str(tmp_path), ttl=0)
+    time.sleep(0.01)
+    assert stale.get("a") is None
+    assert stale.stats()["hit_ratio"] == 0.0
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from core.models.registry import ModelRegistry, UnknownModelError
+
+class FakeModel:
+    def __init__(self, name, tokenizer=None, size=100):
+        self.name = name
+        self.tokenizer = tokenizer
+        self.size = size
+        self.cleaned_up = False
+
+    def memory_footprint(self):
+        return self.size
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+def make_registry(**kwargs):
+    loads = []
+
+    def load_model(name, tokenizer=None):
+        loads.append(name)
+        return FakeModel(name, tokenizer, size=300 if name == "large" else 100)
+
+    registry = ModelRegistry(["small", "large", "other"], "small", load_model,
+                             load_tokenizer=lambda name: f"tok:{name}", **kwargs)
+    return registry, loads
+
+def test_models_load_lazily_and_are_reused():
+    registry, loads = make_registry()
+    assert registry.resident() == []
+    assert registry.get(None).name == "small"
+    assert registry.get("small").tokenizer == "tok:small"
+    assert loads == ["small"]
+    with pytest.raises(UnknownModelError):
+        registry.get("gpt-5")
+
+def test_least_recently_used_model_is_evicted_by_count():
+    registry, loads = make_registry(max_resident=2)
+    small = registry.get("small")
+    registry.get("large")
+    registry.get("small")
+    registry.get("other")
+    assert registry.resident() == ["small", "other"]
+    assert not small.cleaned_up
+
+def test_models_are_evicted_to_fit_the_memory_budget():
+    registry, loads = make_registry(max_resident=3, max_memory_bytes=350)
+    small = registry.get("small")
+    registry.get("large")
+    assert registry.resident() == ["large"]
+    assert small.cleaned_up
+    assert registry.stats()["resident_bytes"] == 300
+
+def test_tokenizer_loads_do_not_block_other_calls():
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    def load_tokenizer(name):
+        loads.append(name)
+        if name == "large":
+            started.set()
+            release.wait(5)
+        return f"tok:{name}"
+
+    registry = ModelRegistry(["small", "large"], "small", FakeModel, load_tokenizer=load_tokenizer)
+    slow = [threading.Thread(target=registry.tokenizer, args=("large",)) for _ in range(2)]
+    for thread in slow:
+        thread.start()
+    try:
+        assert started.wait(5)
+        # Both threads wait on the load of "large"; stats and other tokenizers answer meanwhile
+        assert registry.stats()["resident"] == []
+        assert registry.tokenizer("small") == "tok:small"
+        assert not registry.has_tokenizer("large")
+    finally:
+        release.set()
+        for thread in slow:
+            thread.join()
+    assert registry.tokenizer("large") == "tok:large"
+    assert loads == ["large", "small"]
@@ -0,0 +1,8 @@
+import pytest
+
+from utils.rouge import rouge_l, rouge_scores
+
+def test_rouge_scores():
+    assert rouge_scores("the cat sat", "the cat sat") == {"rouge1": 1.0, "rouge2": 1.0, "rougeL": 1.0}
+    assert rouge_l("cat the sat", "the cat sat") == pytest.approx(2 / 3)
+    assert rouge_scores("dog", "the cat sat")["rouge1"] == 0.0
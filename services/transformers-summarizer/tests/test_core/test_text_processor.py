@@ -0,0 +1,31 @@
+import pytest
+
+from core.processors.text_processor import TextProcessor
+
+transformers = pytest.importorskip("transformers")
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    return transformers.AutoTokenizer.from_pretrained("facebook/bart-large-cnn", model_max_length=64)
+
+TEXT = " ".join(f"Clause {i} requires the supplier to deliver goods on time." for i in range(40))
+
+def test_validate_text_truncates_by_tokens(tokenizer):
+    text = TextProcessor.validate_text(TEXT, max_length=20, tokenizer=tokenizer)
+    assert len(tokenizer(text, add_special_tokens=False)["input_ids"]) == 20
+    assert TEXT.startswith(text)
+
+def test_token_windows_cover_every_token_with_stride(tokenizer):
+    windows = TextProcessor.token_windows(TEXT, tokenizer, stride=8)
+    body = tokenizer(TEXT, add_special_tokens=False)["input_ids"]
+
+    assert len(windows) > 1
+    assert all(len(w) <= 64 for w in windows)
+    # Strip <s>/</s>, drop the stride overlap, and the windows rebuild the text exactly
+    inner = [w[1:-1] for w in windows]
+    rebuilt = inner[0] + [t for w in inner[1:] for t in w[8:]]
+    assert rebuilt == body
+
+def test_empty_text_is_rejected(tokenizer):
+    with pytest.raises(ValueError):
+        TextProcessor.token_windows("  ", tokenizer)
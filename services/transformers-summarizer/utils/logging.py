@@ -0,0 +1,24 @@
+# services/transformers-summarizer/utils/logging.py
+
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+def setup_logging(level: str = "INFO", log_dir: str = "logs"):
+    """Log to stderr, logs/app.log and (errors only) logs/error.log."""
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = [logging.StreamHandler()]
+    if os.path.isdir(log_dir):
+        handlers.append(RotatingFileHandler(os.path.join(log_dir, "app.log"), maxBytes=50 * 1024 * 1024, backupCount=3))
+        error_handler = RotatingFileHandler(os.path.join(log_dir, "error.log"), maxBytes=10 * 1024 * 1024, backupCount=3)
+        error_handler.setLevel(logging.ERROR)
+        handlers.append(error_handler)
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
@@ -0,0 +1,49 @@
+# services/transformers-summarizer/utils/metrics.py
+
+from prometheus_client import Counter, Gauge, Histogram
+
+REQUEST_LATENCY = Histogram(
+    "summarizer_request_seconds",
+    "End-to-end latency of summarization requests",
+    ["endpoint"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120),
+)
+QUEUE_SECONDS = Histogram(
+    "summarizer_queue_seconds",
+    "Time a request waited for the model executor",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30, 60),
+)
+INFERENCE_SECONDS = Histogram(
+    "summarizer_inference_seconds",
+    "Time spent running the model for one request",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+QUEUE_DEPTH = Gauge("summarizer_queue_depth", "Inference calls waiting for the model executor")
+REJECTED = Counter("summarizer_rejected_total", "Requests rejected because the inference queue was full")
+TOKENS_PROCESSED = Counter("summarizer_tokens_processed_total", "Input tokens summarized", ["model_name"])
+BATCH_SIZE = Histogram(
+    "summarizer_batch_size",
+    "Requests combined into one generate call",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+PADDING_EFFICIENCY = Histogram(
+    "summarizer_padding_efficiency",
+    "Share of a padded batch's input tokens that are real tokens",
+    buckets=(0.1, 0.25, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0),
+)
+CACHE_LOOKUPS = Counter("summarizer_cache_lookups_total", "Summary cache lookups", ["result"])
+TIME_TO_FIRST_TOKEN = Histogram(
+    "summarizer_time_to_first_token_seconds",
+    "Time from a streaming request to its first generated text",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+MODEL_LOADS = Counter("summarizer_model_loads_total", "Models loaded into memory", ["model_name"])
+MODEL_EVICTIONS = Counter("summarizer_model_evictions_total", "Models evicted from memory", ["model_name"])
+MODEL_LOAD_SECONDS = Histogram(
+    "summarizer_model_load_seconds",
+    "Time to load a model into memory",
+    ["model_name"],
+    buckets=(1, 2, 5, 10, 20, 30, 60, 120, 300),
+)
+RESIDENT_MODELS = Gauge("summarizer_resident_models", "Models currently loaded")
+RESIDENT_MODEL_BYTES = Gauge("summarizer_resident_model_bytes", "Memory held by loaded models")
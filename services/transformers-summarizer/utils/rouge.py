@@ -0,0 +1,40 @@
+# services/transformers-summarizer/utils/rouge.py
+
+import re
+from collections import Counter
+from typing import Dict, List
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+def _f1(overlap: int, candidate: int, reference: int) -> float:
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / candidate, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_n(candidate: str, reference: str, n: int = 1) -> float:
+    """ROUGE-N F1 over lowercased word n-grams."""
+    def ngrams(tokens):
+        return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    cand, ref = ngrams(_tokens(candidate)), ngrams(_tokens(reference))
+    return _f1(sum((cand & ref).values()), sum(cand.values()), sum(ref.values()))
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """ROUGE-L F1: longest common word subsequence."""
+    cand, ref = _tokens(candidate), _tokens(reference)
+    previous = [0] * (len(ref) + 1)
+    for token in cand:
+        current = [0]
+        for j, ref_token in enumerate(ref):
+            current.append(previous[j] + 1 if token == ref_token else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(cand), len(ref))
+
+def rouge_scores(candidate: str, reference: str) -> Dict[str, float]:
+    return {
+        "rouge1": rouge_n(candidate, reference, 1),
+        "rouge2": rouge_n(candidate, reference, 2),
+        "rougeL": rouge_l(candidate, reference),
+    }